@@ -0,0 +1,91 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from tensorforce import Agent
+
+
+# CartPole-like specification, so no environment is required
+STATES = dict(type='float', shape=(4,))
+ACTIONS = dict(type='int', shape=(), num_values=2)
+
+
+def benchmark(agent, num_episodes, num_timesteps, batched):
+    """
+    Returns the wall-time of feeding the given number of random complete episodes via
+    experience, either in batches of complete episodes or episode by episode.
+    """
+    num_values = num_episodes * num_timesteps
+    # Action mask is required, since its default only covers a single timestep
+    states = dict(
+        state=np.random.random_sample(size=((num_values,) + STATES['shape'])),
+        action_mask=np.ones(shape=(num_values, ACTIONS['num_values']), dtype=np.bool_)
+    )
+    actions = np.random.randint(ACTIONS['num_values'], size=(num_values,))
+    terminal = np.zeros(shape=(num_values,), dtype=np.int64)
+    terminal[num_timesteps - 1::num_timesteps] = 1
+    reward = np.random.random_sample(size=(num_values,))
+
+    if not batched:
+        # Chunked path, one call per episode
+        agent.experience_episodes_size = None
+
+    start = time.time()
+    agent.experience(states=states, actions=actions, terminal=terminal, reward=reward)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Wall-time of feeding complete episodes via experience in batches versus '
+                    'episode by episode'
+    )
+    parser.add_argument(
+        '-a', '--agent', type=str, default='ppo',
+        help='Agent (name, configuration JSON file, or library module), which estimates the '
+             'horizon late or not at all, otherwise both paths are chunked'
+    )
+    parser.add_argument(
+        '-b', '--batch-size', type=int, default=10, help='Number of episodes per update'
+    )
+    parser.add_argument('-n', '--episodes', type=int, default=5000, help='Number of episodes')
+    parser.add_argument(
+        '-t', '--timesteps', type=int, default=4, help='Number of timesteps per episode'
+    )
+    args = parser.parse_args()
+
+    print('path        episodes  timesteps  experience time')
+    for batched in (True, False):
+        # Memory capacity for all episodes, so they are fed in one call if batched
+        agent = Agent.create(
+            agent=args.agent, states=STATES, actions=ACTIONS, max_episode_timesteps=args.timesteps,
+            batch_size=args.batch_size, memory=(args.episodes * args.timesteps)
+        )
+        duration = benchmark(
+            agent=agent, num_episodes=args.episodes, num_timesteps=args.timesteps,
+            batched=batched
+        )
+        agent.close()
+        print('{:<10}  {:>8}  {:>9}  {:>14.2f}s'.format(
+            ('batched' if batched else 'episodes'), args.episodes, args.timesteps, duration
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import argparse
+import os
+import tempfile
+import time
+
+from tensorforce import Agent, Environment
+
+
+def benchmark(agent, states, batch_size, num_acts):
+    """
+    Returns the mean wall-time per act call of the act-only agent, for single or batched states.
+    """
+    if batch_size == 1:
+        kwargs = dict(states=states[0])
+    else:
+        kwargs = dict(states=states[:batch_size], parallel=list(range(batch_size)))
+    if len(agent.internals_spec) > 0:
+        if batch_size == 1:
+            kwargs['internals'] = agent.initial_internals()
+        else:
+            kwargs['internals'] = [agent.initial_internals() for _ in range(batch_size)]
+
+    # Warm-up
+    for _ in range(10):
+        agent.act(**kwargs)
+
+    start = time.time()
+    for _ in range(num_acts):
+        agent.act(**kwargs)
+    return (time.time() - start) / num_acts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Act latency of the act-only Protobuf model versus the optimized inference '
+                    'Protobuf model and TensorFlow Lite flatbuffer'
+    )
+    parser.add_argument(
+        '-a', '--agent', type=str, default='benchmarks/configs/ppo1.json',
+        help='Agent (name, configuration JSON file, or library module)'
+    )
+    parser.add_argument(
+        '-e', '--environment', type=str, default='gym', help='Environment (name or module)'
+    )
+    parser.add_argument('-l', '--level', type=str, default='CartPole-v1', help='Level')
+    parser.add_argument(
+        '-b', '--batch-sizes', type=str, default='1,16,256', help='Comma-separated batch sizes'
+    )
+    parser.add_argument('-n', '--acts', type=int, default=1000, help='Number of act calls')
+    args = parser.parse_args()
+
+    batch_sizes = [int(batch_size) for batch_size in args.batch_sizes.split(',')]
+
+    environment = Environment.create(environment=args.environment, level=args.level)
+    agent = Agent.create(agent=args.agent, environment=environment)
+
+    # Collect states to act on
+    states = list()
+    while len(states) < max(batch_sizes):
+        states.append(environment.reset())
+        internals = agent.initial_internals()
+        terminal = False
+        while not terminal and len(states) < max(batch_sizes):
+            actions, internals = agent.act(
+                states=states[-1], internals=internals, independent=True, deterministic=True
+            )
+            states_, terminal, _ = environment.execute(actions=actions)
+            states.append(states_)
+    environment.close()
+
+    directory = tempfile.mkdtemp()
+    agent.save(directory=directory, filename='agent', format='tensorflow')
+    agent.save(directory=directory, filename='agent', format='pb-inference')
+    agent.save(directory=directory, filename='agent', format='tflite')
+    agent.close()
+
+    print('format        nodes  ' + '  '.join(
+        '{:>10}'.format('batch ' + str(batch_size)) for batch_size in batch_sizes
+    ))
+    for format in ('pb-actonly', 'pb-inference', 'tflite'):
+        agent = Agent.load(directory=directory, filename='agent', format=format)
+        if format == 'tflite':
+            num_nodes = len(agent.interpreter.get_tensor_details())
+        else:
+            num_nodes = len(agent.session.graph.get_operations())
+        latencies = [
+            benchmark(agent=agent, states=states, batch_size=batch_size, num_acts=args.acts)
+            for batch_size in batch_sizes
+        ]
+        agent.close()
+        print('{:<12}  {:>5}  '.format(format, num_nodes) + '  '.join(
+            '{:>8.1f}us'.format(latency * 1e6) for latency in latencies
+        ))
+
+    for filename in os.listdir(directory):
+        os.remove(os.path.join(directory, filename))
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from tensorforce import Agent, Environment
+
+
+# CartPole-like specification if no environment is given
+STATES = dict(type='float', shape=(4,))
+ACTIONS = dict(type='int', shape=(), num_values=2)
+
+
+def benchmark(directory, format, num_loads):
+    """
+    Returns the mean wall-time of loading the agent, and the number of graph operations.
+    """
+    durations = list()
+    for _ in range(num_loads):
+        start = time.time()
+        agent = Agent.load(directory=directory, filename='agent', format=format)
+        durations.append(time.time() - start)
+        num_nodes = len(agent.model.graph.get_operations())
+        agent.close()
+    return sum(durations) / num_loads, num_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load time of an agent constructing its graph in Python versus importing the '
+                    'meta graph of the TensorFlow checkpoint'
+    )
+    parser.add_argument(
+        '-a', '--agent', type=str, default='benchmarks/configs/ppo1.json',
+        help='Agent (name, configuration JSON file, or library module)'
+    )
+    parser.add_argument(
+        '-e', '--environment', type=str, default=None,
+        help='Environment (name or module), otherwise CartPole-like states and actions'
+    )
+    parser.add_argument('-l', '--level', type=str, default=None, help='Level')
+    parser.add_argument('-n', '--loads', type=int, default=5, help='Number of loads per format')
+    args = parser.parse_args()
+
+    if args.environment is None:
+        agent = Agent.create(
+            agent=args.agent, states=STATES, actions=ACTIONS, max_episode_timesteps=500
+        )
+    else:
+        environment = Environment.create(environment=args.environment, level=args.level)
+        agent = Agent.create(agent=args.agent, environment=environment)
+        environment.close()
+
+    directory = tempfile.mkdtemp()
+    agent.save(directory=directory, filename='agent', format='tensorflow')
+    agent.close()
+
+    print('format        nodes  load time')
+    for format in ('tensorflow', 'meta-graph'):
+        duration, num_nodes = benchmark(directory=directory, format=format, num_loads=args.loads)
+        print('{:<12}  {:>5}  {:>8.2f}s'.format(format, num_nodes, duration))
+
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
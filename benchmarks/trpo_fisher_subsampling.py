@@ -0,0 +1,119 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from tensorforce import Agent, Environment
+
+
+def probabilities(agent, states, query):
+    _, probs = agent.act(
+        states=states, parallel=[0] * len(states), independent=True, deterministic=True,
+        query=query
+    )
+    return np.asarray(probs[0])
+
+
+def benchmark(environment, subsampling_fraction, batch_size, learning_rate, num_updates, seed):
+    """
+    Trains the TRPO agent for the given number of updates and returns the mean wall-time per
+    update, and mean and standard deviation of the ratio of the KL-divergence between the policy
+    before and after each update, measured on the update batch, to the KL-constraint given by the
+    learning rate.
+    """
+    agent = Agent.create(
+        agent='trpo', environment=environment, batch_size=batch_size,
+        learning_rate=learning_rate, subsampling_fraction=subsampling_fraction, seed=seed
+    )
+    if len(agent.actions_spec) != 1 or next(iter(agent.actions_spec.values()))['type'] != 'int':
+        raise NotImplementedError("Benchmark requires a single int action.")
+    query = [
+        name for name in agent.get_query_tensors(function='independent_act')
+        if name.endswith('-probabilities')
+    ]
+
+    update_times = list()
+    kl_ratios = list()
+    batch_states = list()
+    num_episodes = 0
+    while len(update_times) < num_updates:
+        states = environment.reset()
+        terminal = False
+        while not terminal:
+            batch_states.append(states)
+            actions = agent.act(states=states)
+            states, terminal, reward = environment.execute(actions=actions)
+
+            if terminal and (num_episodes + 1) % batch_size == 0:
+                # Last timestep of the batch triggers the update.
+                probs_before = probabilities(agent=agent, states=batch_states, query=query)
+                start = time.time()
+                updated = agent.observe(terminal=terminal, reward=reward)
+                update_times.append(time.time() - start)
+                assert updated
+                probs_after = probabilities(agent=agent, states=batch_states, query=query)
+                probs_before = np.maximum(probs_before, 1e-8)
+                probs_after = np.maximum(probs_after, 1e-8)
+                kl_divergence = np.sum(
+                    probs_before * (np.log(probs_before) - np.log(probs_after)), axis=-1
+                ).mean()
+                kl_ratios.append(kl_divergence / learning_rate)
+                batch_states = list()
+            else:
+                agent.observe(terminal=terminal, reward=reward)
+        num_episodes += 1
+
+    agent.close()
+    return np.mean(update_times), np.mean(kl_ratios), np.std(kl_ratios)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Wall-time versus KL-constraint fidelity of TRPO with subsampled '
+                    'Fisher-vector products'
+    )
+    parser.add_argument(
+        '-e', '--environment', type=str, default='gym', help='Environment (name or module)'
+    )
+    parser.add_argument('-l', '--level', type=str, default='CartPole-v1', help='Level')
+    parser.add_argument(
+        '-f', '--fractions', type=str, default='1.0,0.5,0.25,0.1',
+        help='Comma-separated Fisher-vector product subsampling fractions'
+    )
+    parser.add_argument('-b', '--batch-size', type=int, default=10, help='Episodes per update')
+    parser.add_argument('-r', '--learning-rate', type=float, default=1e-2, help='KL-constraint')
+    parser.add_argument('-u', '--updates', type=int, default=20, help='Number of updates')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    print('fraction  update-time [s]  KL / constraint')
+    for fraction in args.fractions.split(','):
+        environment = Environment.create(environment=args.environment, level=args.level)
+        update_time, kl_ratio, kl_ratio_std = benchmark(
+            environment=environment, subsampling_fraction=float(fraction),
+            batch_size=args.batch_size, learning_rate=args.learning_rate,
+            num_updates=args.updates, seed=args.seed
+        )
+        environment.close()
+        print('{:>8}  {:>15.4f}  {:>8.3f} +- {:.3f}'.format(
+            fraction, update_time, kl_ratio, kl_ratio_std
+        ))
+
+
+if __name__ == '__main__':
+    main()
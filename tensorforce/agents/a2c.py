@@ -133,6 +133,10 @@ class AdvantageActorCritic(TensorforceAgent):
             (<span style="color:#C00000"><b>required</b></span>).</li>
             <li><b>filename</b> (<i>string</i>) &ndash; model filename
             (<span style="color:#00C000"><b>default</b></span>: agent name).</li>
+            <li><b>format</b> (<i>"tensorflow" | "delta"</i>) &ndash; checkpoint format, "delta"
+            writes a full snapshot followed by the changed variables and memory entries, and
+            compacts the chain into a new snapshot after max-deltas deltas
+            (<span style="color:#00C000"><b>default</b></span>: "tensorflow").</li>
             <li><b>frequency</b> (<i>int > 0</i>) &ndash; how frequently in seconds to save the
             model (<span style="color:#00C000"><b>default</b></span>: 600 seconds).</li>
             <li><b>load</b> (<i>bool | str</i>) &ndash; whether to load the existing model, or
@@ -141,6 +145,8 @@ class AdvantageActorCritic(TensorforceAgent):
             </ul>
             <li><b>max-checkpoints</b> (<i>int > 0</i>) &ndash; maximum number of checkpoints to
             keep (<span style="color:#00C000"><b>default</b></span>: 5).</li>
+            <li><b>max-deltas</b> (<i>int >= 0</i>) &ndash; maximum number of delta checkpoints
+            before compaction (<span style="color:#00C000"><b>default</b></span>: 10).</li>
         summarizer (specification): TensorBoard summarizer configuration with the following
             attributes (<span style="color:#00C000"><b>default</b></span>: no summarizer):
             <ul>
@@ -198,6 +204,9 @@ class AdvantageActorCritic(TensorforceAgent):
             record traces (<span style="color:#00C000"><b>default</b></span>: 0).</li>
             <li><b>max-traces</b> (<i>int > 0</i>) &ndash; maximum number of traces to keep
             (<span style="color:#00C000"><b>default</b></span>: all).</li>
+            <li><b>max-pending</b> (<i>int > 0</i>) &ndash; maximum number of episode chunks
+            queued for the background trace writer before observe blocks
+            (<span style="color:#00C000"><b>default</b></span>: 64).</li>
     """
 
     def __init__(
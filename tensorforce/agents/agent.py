@@ -19,12 +19,15 @@ import os
 import random
 import time
 from collections import OrderedDict
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
 
 import numpy as np
 import tensorflow as tf
 
 import tensorforce.agents
 from tensorforce import util, TensorforceError
+from tensorforce.traces import TraceWriter
 
 
 class Agent(object):
@@ -45,7 +48,10 @@ class Agent(object):
                 on, environment-related arguments like state/action space specifications and
                 maximum episode length will be extract if given
                 (<span style="color:#00C000"><b>recommended</b></span>).
-            kwargs: Additional arguments.
+            kwargs: Additional arguments, including `inference_only=True` to only create the
+                graph required for independent act, which is short for
+                `config=dict(inference_only=True)`, and `meta_graph` to import the graph from the
+                meta graph of the given TensorFlow checkpoint instead of constructing it.
         """
         if isinstance(agent, Agent):
             if environment is not None:
@@ -84,9 +90,18 @@ class Agent(object):
                 else:
                     kwargs['max_episode_timesteps'] = environment.max_episode_timesteps()
 
+            if kwargs.pop('inference_only', False):
+                config = dict() if kwargs.get('config') is None else dict(kwargs['config'])
+                config['inference_only'] = True
+                kwargs['config'] = config
+
+            meta_graph = kwargs.pop('meta_graph', None)
             agent = agent(**kwargs)
             assert isinstance(agent, Agent)
-            return Agent.create(agent=agent, environment=environment)
+            if meta_graph is None:
+                return Agent.create(agent=agent, environment=environment)
+            agent.initialize(meta_graph=meta_graph)
+            return agent
 
         elif isinstance(agent, dict):
             # Dictionary specification
@@ -131,15 +146,24 @@ class Agent(object):
                 (<span style="color:#00C000"><b>default</b></span>: current directory ".").
             filename (str): Checkpoint filename, with or without append and extension
                 (<span style="color:#00C000"><b>default</b></span>: "agent").
-            format ("tensorflow" | "numpy" | "hdf5" | "pb-actonly"): File format, "pb-actonly" loads
-                an act-only agent based on a Protobuf model
+            format ("tensorflow" | "numpy" | "hdf5" | "delta" | "meta-graph" | "pb-actonly" |
+                "pb-inference" | "tflite" | "numpy-runtime"): File format, "delta" replays the
+                chain of delta checkpoints, "meta-graph" imports the graph from the meta graph of a
+                TensorFlow checkpoint instead of constructing it, which excludes delta checkpoints
+                and the NumPy-only runtime, "pb-actonly" loads an act-only agent based on a
+                Protobuf model, "pb-inference" based on an optimized inference Protobuf model,
+                "tflite" based on a TensorFlow Lite flatbuffer, "numpy-runtime" an act-only agent
+                based on the NumPy-only runtime
                 (<span style="color:#00C000"><b>default</b></span>: format matching directory and
                 filename, required to be unambiguous).
             environment (Environment object): Environment which the agent is supposed to be trained
                 on, environment-related arguments like state/action space specifications and
                 maximum episode length will be extract if given
-                (<span style="color:#00C000"><b>recommended</b></span> unless "pb-actonly" format).
-            kwargs: Additional arguments, invalid for "pb-actonly" format.
+                (<span style="color:#00C000"><b>recommended</b></span> unless act-only format).
+            kwargs: Additional arguments, invalid for act-only formats except for "batch_size"
+                and "num_threads" of the TensorFlow Lite act-only agent, for instance,
+                `inference_only=True` to only create and restore the graph and variables required
+                for independent act.
         """
         if directory is None:
             # default directory: current directory "."
@@ -184,6 +208,50 @@ class Agent(object):
                 initial_internals=agent.get('initial_internals')
             )
 
+        elif format == 'pb-inference':
+            assert environment is None
+            assert len(kwargs) == 0
+            agent = ActonlyAgent(
+                path=os.path.join(directory, os.path.splitext(filename)[0] + '-inference.pb'),
+                states=agent['states'], actions=agent['actions'], internals=agent.get('internals'),
+                initial_internals=agent.get('initial_internals')
+            )
+
+        elif format == 'tflite':
+            assert environment is None
+            assert all(key in ('batch_size', 'num_threads') for key in kwargs)
+            agent = TFLiteActonlyAgent(
+                path=os.path.join(directory, os.path.splitext(filename)[0] + '.tflite'),
+                states=agent['states'], actions=agent['actions'], internals=agent.get('internals'),
+                initial_internals=agent.get('initial_internals'), **kwargs
+            )
+
+        elif format == 'numpy-runtime':
+            assert environment is None
+            assert len(kwargs) == 0
+            from tensorforce.execution.numpy_runtime import NumpyActonlyAgent
+            agent = NumpyActonlyAgent(
+                path=os.path.join(directory, os.path.splitext(filename)[0] + '.runtime')
+            )
+
+        elif format == 'meta-graph':
+            agent.pop('internals', None)
+            agent.pop('initial_internals', None)
+            path = os.path.join(directory, os.path.splitext(filename)[0])
+            if not os.path.isfile(path + '.meta'):
+                path = tf.compat.v1.train.latest_checkpoint(
+                    checkpoint_dir=directory, latest_filename=None
+                )
+                if path is None:
+                    raise TensorforceError.value(
+                        name='Agent.load', argument='directory', value=directory,
+                        hint='no TensorFlow checkpoint'
+                    )
+            agent = Agent.create(agent=agent, environment=environment, meta_graph=path, **kwargs)
+            agent.restore(
+                directory=directory, filename=os.path.split(path)[1], format='tensorflow'
+            )
+
         else:
             agent.pop('internals', None)
             agent.pop('initial_internals', None)
@@ -275,10 +343,13 @@ class Agent(object):
         # Recorder
         if recorder is None:
             pass
-        elif not all(key in ('directory', 'frequency', 'max-traces', 'start') for key in recorder):
+        elif not all(
+            key in ('directory', 'frequency', 'max-traces', 'max-pending', 'start')
+            for key in recorder
+        ):
             raise TensorforceError.value(
                 name='agent', argument='recorder', value=list(recorder),
-                hint='not from {directory,frequency,max-traces,start}'
+                hint='not from {directory,frequency,max-traces,max-pending,start}'
             )
         self.recorder_spec = recorder if recorder is None else dict(recorder)
 
@@ -287,9 +358,14 @@ class Agent(object):
     def __str__(self):
         return self.__class__.__name__
 
-    def initialize(self):
+    def initialize(self, meta_graph=None):
         """
         Initializes the agent, usually done as part of Agent.create/load.
+
+        Args:
+            meta_graph (str): TensorFlow checkpoint path, the graph is imported from the
+                corresponding meta graph instead of constructed
+                (<span style="color:#00C000"><b>default</b></span>: graph constructed).
         """
         if self.is_initialized:
             raise TensorforceError(
@@ -329,14 +405,16 @@ class Agent(object):
                         shape=shape, dtype=util.np_dtype(dtype='bool')
                     )
 
-            self.num_episodes = 0
-            self.record_states = OrderedDict(((name, list()) for name in self.states_spec))
-            self.record_actions = OrderedDict(((name, list()) for name in self.actions_spec))
-            for name, spec in self.actions_spec.items():
-                if spec['type'] == 'int':
-                    self.record_states[name + '_mask'] = list()
-            self.record_terminal = list()
-            self.record_reward = list()
+            # Traces written on a background thread
+            self.recorder = TraceWriter(
+                directory=self.recorder_spec['directory'],
+                frequency=self.recorder_spec.get('frequency', 1),
+                max_traces=self.recorder_spec.get('max-traces'),
+                max_pending=self.recorder_spec.get('max-pending', 64)
+            )
+
+        else:
+            self.recorder = None
 
         # Parallel buffer indices
         self.buffer_indices = np.zeros(
@@ -346,6 +424,12 @@ class Agent(object):
             shape=(self.parallel_interactions,), dtype=util.np_dtype(dtype='bool')
         )
 
+        # Pool of parallel execution indices leased to threads, and lock for shared observe state
+        self.parallel_pool = Queue()
+        for parallel in range(self.parallel_interactions):
+            self.parallel_pool.put(parallel)
+        self.observe_lock = Lock()
+
         self.timesteps = 0
         self.episodes = 0
         self.updates = 0
@@ -354,11 +438,26 @@ class Agent(object):
         if not hasattr(self, 'model'):
             raise TensorforceError(message="Missing agent attribute model.")
 
-        self.model.initialize()
+        self.model.initialize(meta_graph=meta_graph)
 
         self.internals_spec = self.model.internals_spec
         self.auxiliaries_spec = self.model.auxiliaries_spec
 
+        # LRU cache for deterministic independent act
+        if self.model.act_cache_size > 0:
+            self.act_cache = OrderedDict()
+            self.act_cache_lock = Lock()
+            self.act_cache_updates = None
+        else:
+            self.act_cache = None
+        self.act_cache_hits = 0
+        self.act_cache_misses = 0
+
+        # Background threads of pending non-blocking saves, and their progress
+        self.save_threads = OrderedDict()
+        self.save_progress = dict()
+        self.save_exceptions = list()
+
         if self.model.saver_directory is not None:
             path = os.path.join(self.model.saver_directory, self.model.saver_filename + '.json')
             try:
@@ -386,6 +485,10 @@ class Agent(object):
         """
         Closes the agent.
         """
+        if self.is_initialized:
+            self.wait_saves()
+            if self.recorder is not None:
+                self.recorder.close()
         self.model.close()
         self.model = None
 
@@ -402,6 +505,40 @@ class Agent(object):
 
         self.timesteps, self.episodes, self.updates = self.model.reset()
 
+    def lease_parallel(self, timeout=None):
+        """
+        Leases a free parallel execution index for exclusive use by the calling thread, blocking
+        until one is available. Act/observe calls of different threads with different parallel
+        indices can be executed concurrently, since all Python-side buffers are partitioned by
+        parallel index and shared observe state is locked. The lease usually covers one or more
+        entire episodes.
+
+        Args:
+            timeout (float > 0.0): Maximum number of seconds to wait for a free index
+                (<span style="color:#00C000"><b>default</b></span>: no timeout).
+
+        Returns:
+            int: Parallel execution index.
+        """
+        try:
+            return self.parallel_pool.get(timeout=timeout)
+        except Empty:
+            raise TensorforceError(message="No parallel execution index released within timeout.")
+
+    def release_parallel(self, parallel):
+        """
+        Returns a parallel execution index leased via `lease_parallel()` to the pool.
+
+        Args:
+            parallel (int): Parallel execution index
+                (<span style="color:#C00000"><b>required</b></span>).
+        """
+        if not self.timestep_completed[parallel]:
+            raise TensorforceError(
+                message="Releasing a parallel index must be preceded by agent.observe."
+            )
+        self.parallel_pool.put(parallel)
+
     def initial_internals(self):
         """
         Returns the initial internal agent state(s), to be used at the beginning of an episode as
@@ -414,7 +551,7 @@ class Agent(object):
 
     def act(
         self, states, internals=None, parallel=0, independent=False, deterministic=False,
-        evaluation=False, query=None, **kwargs
+        evaluation=False, slot=None, reset=False, query=None, **kwargs
     ):
         """
         Returns action(s) for the given state(s), needs to be followed by `observe(...)` unless
@@ -439,6 +576,13 @@ class Agent(object):
             evaluation (bool): Whether the agent is currently evaluated, implies independent and
                 deterministic
                 (<span style="color:#00C000"><b>default</b></span>: false).
+            slot (int | iter[int]): If independent mode, internals slot index instead of
+                `internals` argument, in which case internal agent states are kept in the graph
+                and only actions are returned, requires `config=dict(internals_slots=...)`
+                (<span style="color:#00C000"><b>default</b></span>: none).
+            reset (bool | iter[bool]): Whether to reset the internals slot to the initial internal
+                agent state(s) before acting, for instance, at the beginning of an episode
+                (<span style="color:#00C000"><b>default</b></span>: false).
             query (list[str]): Names of tensors to retrieve
                 (<span style="color:#00C000"><b>default</b></span>: none).
             kwargs: Additional input values, for instance, for dynamic hyperparameters.
@@ -462,6 +606,11 @@ class Agent(object):
                 )
             deterministic = independent = True
 
+        if not independent and self.model.inference_only:
+            raise TensorforceError.required(
+                name='agent.act', argument='independent', condition='config[inference_only] = true'
+            )
+
         if not independent:
             if internals is not None:
                 raise TensorforceError.invalid(
@@ -472,7 +621,25 @@ class Agent(object):
                     name='agent.act', argument='deterministic', condition='independent = false'
                 )
 
-        if independent:
+        if slot is not None:
+            if not independent:
+                raise TensorforceError.invalid(
+                    name='agent.act', argument='slot', condition='independent = false'
+                )
+            if internals is not None:
+                raise TensorforceError.invalid(
+                    name='agent.act', argument='internals', condition='slot is not none'
+                )
+            if self.model.internals_slots_size == 0:
+                raise TensorforceError.invalid(
+                    name='agent.act', argument='slot', condition='config[internals_slots] = 0'
+                )
+        elif reset:
+            raise TensorforceError.invalid(
+                name='agent.act', argument='reset', condition='slot is none'
+            )
+
+        if independent and slot is None:
             internals_is_none = (internals is None)
             if internals_is_none:
                 if len(self.model.internals_spec) > 0:
@@ -496,7 +663,13 @@ class Agent(object):
                 ))
             else:
                 states = np.asarray(states)
-            if independent:
+            if slot is not None:
+                slot = np.asarray(list(slot))
+                if isinstance(reset, bool):
+                    reset = np.full(shape=slot.shape, fill_value=reset)
+                else:
+                    reset = np.asarray(list(reset))
+            elif independent:
                 internals = OrderedDict((
                     (name, np.asarray([internals[n][name] for n in range(len(parallel))]))
                     for name in internals[0]
@@ -507,7 +680,10 @@ class Agent(object):
                 function=(lambda x: np.asarray([x])), xs=states,
                 depth=int(isinstance(states, dict))
             )
-            if independent:
+            if slot is not None:
+                slot = np.asarray([slot])
+                reset = np.asarray([reset])
+            elif independent:
                 internals = util.fmap(function=(lambda x: np.asarray([x])), xs=internals, depth=1)
 
         if not independent and not all(self.timestep_completed[n] for n in parallel):
@@ -527,8 +703,26 @@ class Agent(object):
         )
 
         # Model.act()
-        if independent:
+        if slot is not None:
+            # Internals remain in slot variables, nothing to fetch apart from actions
             if query is None:
+                actions = self.model.slot_act(
+                    states=states, auxiliaries=auxiliaries, slot=slot, reset=reset, **kwargs
+                )
+
+            else:
+                actions, queried = self.model.slot_act(
+                    states=states, auxiliaries=auxiliaries, slot=slot, reset=reset, query=query,
+                    **kwargs
+                )
+
+        elif independent:
+            if query is None and deterministic and self.act_cache is not None and len(kwargs) == 0:
+                actions, internals = self.cached_independent_act(
+                    states=states, internals=internals, auxiliaries=auxiliaries, parallel=parallel
+                )
+
+            elif query is None:
                 actions, internals = self.model.independent_act(
                     states=states, internals=internals, auxiliaries=auxiliaries, parallel=parallel,
                     deterministic=deterministic, **kwargs
@@ -589,23 +783,248 @@ class Agent(object):
             actions = util.fmap(
                 function=(lambda x: x[0]), xs=actions, depth=int(isinstance(actions, dict))
             )
-            if independent:
+            if independent and slot is None:
                 internals = util.fmap(function=(lambda x: x[0]), xs=internals, depth=1)
 
-        if independent and not internals_is_none:
+        if independent and slot is None and not internals_is_none:
             if query is None:
                 return actions, internals
             else:
                 return actions, internals, queried
 
         else:
-            if independent and len(internals) > 0:
+            if independent and slot is None and len(internals) > 0:
                 raise TensorforceError.unexpected()
             if query is None:
                 return actions
             else:
                 return actions, queried
 
+    def act_batch(self, states, internals=None, chunk_size=1024, actions=None):
+        """
+        Returns deterministic independent actions for a large array of states, for instance, for
+        offline policy evaluation, processed in chunks of fixed size while the next chunk is
+        prefetched by a background thread.
+
+        Args:
+            states (dict[array[state]] | array[state]): Dictionary containing arrays of states,
+                possibly memory-mapped, plus optional action masks
+                (<span style="color:#C00000"><b>required</b></span>).
+            internals (dict[array[internal]]): Dictionary containing arrays of internal agent
+                states
+                (<span style="color:#00C000"><b>default</b></span>: initial internal agent states,
+                so every state is treated as first state of an episode).
+            chunk_size (int > 0): Number of states processed per session call
+                (<span style="color:#00C000"><b>default</b></span>: 1024).
+            actions (dict[array[action]] | array[action]): Preallocated, possibly memory-mapped
+                arrays the actions are written to
+                (<span style="color:#00C000"><b>default</b></span>: newly allocated arrays).
+
+        Returns:
+            dict[array[action]] | array[action]: Dictionary containing arrays of actions.
+        """
+        if actions is None:
+            actions = OrderedDict()
+        else:
+            actions = util.normalize_values(
+                value_type='action', values=actions, values_spec=self.actions_spec
+            )
+
+        actions = self.chunked_call(
+            name='agent.act_batch',
+            function=(lambda **kwargs: self.model.independent_act(**kwargs)[0]), states=states,
+            internals=internals, chunk_size=chunk_size, outputs=actions
+        )
+
+        return util.unpack_values(
+            value_type='action', values=actions, values_spec=self.actions_spec
+        )
+
+    def chunked_call(self, name, function, states, internals, chunk_size, outputs, **values):
+        if chunk_size <= 0:
+            raise TensorforceError.value(
+                name=name, argument='chunk_size', value=chunk_size, hint='<= 0'
+            )
+
+        # Auxiliaries
+        auxiliaries = OrderedDict()
+        if isinstance(states, dict):
+            states = OrderedDict(states)
+            for name, spec in self.actions_spec.items():
+                if spec['type'] == 'int' and name + '_mask' in states:
+                    auxiliaries[name + '_mask'] = states.pop(name + '_mask')
+
+        # Normalize states dictionary
+        states = util.normalize_values(
+            value_type='state', values=states, values_spec=self.states_spec
+        )
+        num_values = len(next(iter(states.values())))
+        internals_init = OrderedDict(
+            (name, np.asarray(x)) for name, x in self.model.internals_init.items()
+        )
+
+        def prefetch():
+            # Slice and convert the next chunk, reading memory-mapped arrays, while the session
+            # processes the current one
+            try:
+                for start in range(0, num_values, chunk_size):
+                    if stopped.is_set():
+                        return
+                    end = min(start + chunk_size, num_values)
+                    kwargs = dict(
+                        states=OrderedDict(
+                            (name, np.array(x[start: end])) for name, x in states.items()
+                        ),
+                        auxiliaries=OrderedDict(
+                            (name, np.array(x[start: end])) for name, x in auxiliaries.items()
+                        )
+                    )
+                    if internals is None:
+                        kwargs['internals'] = OrderedDict((
+                            (name, np.tile(A=x, reps=((end - start,) + tuple(1 for _ in x.shape))))
+                            for name, x in internals_init.items()
+                        ))
+                    else:
+                        kwargs['internals'] = OrderedDict(
+                            (name, np.array(x[start: end])) for name, x in internals.items()
+                        )
+                    for key, value in values.items():
+                        kwargs[key] = util.fmap(
+                            function=(lambda x: np.array(x[start: end])), xs=value, depth=1
+                        )
+                    if stopped.is_set():
+                        return
+                    chunks.put((start, end, kwargs))
+                if not stopped.is_set():
+                    chunks.put(None)
+            except BaseException as exc:
+                if not stopped.is_set():
+                    chunks.put(exc)
+
+        chunks = Queue(maxsize=2)
+        stopped = Event()
+        thread = Thread(target=prefetch, daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                elif isinstance(chunk, BaseException):
+                    raise chunk
+                start, end, kwargs = chunk
+                results = function(**kwargs)
+                for output, result in results.items():
+                    if output not in outputs:
+                        # Preallocated based on first chunk
+                        outputs[output] = np.empty(
+                            shape=((num_values,) + result.shape[1:]), dtype=result.dtype
+                        )
+                    outputs[output][start: end] = result
+
+        finally:
+            # Unblock and stop the prefetch thread, also if the function call failed
+            stopped.set()
+            while True:
+                try:
+                    chunks.get_nowait()
+                except Empty:
+                    break
+            thread.join()
+
+        return outputs
+
+    def cached_independent_act(self, states, internals, auxiliaries, parallel):
+        # Keyed by normalized state, internals and auxiliaries dtype and bytes per batch element
+        keys = [
+            b''.join(
+                values[name].dtype.char.encode() + values[name][n].tobytes()
+                for values in (states, internals, auxiliaries) for name in values
+            ) for n in range(parallel.shape[0])
+        ]
+
+        with self.act_cache_lock:
+            # Invalidate cache if variables changed via update
+            if self.act_cache_updates != self.updates:
+                self.act_cache.clear()
+                self.act_cache_updates = self.updates
+
+            results = [self.act_cache.get(key) for key in keys]
+            for key, result in zip(keys, results):
+                if result is not None:
+                    self.act_cache.move_to_end(key=key)
+        misses = [n for n, result in enumerate(results) if result is None]
+        self.act_cache_hits += len(keys) - len(misses)
+        self.act_cache_misses += len(misses)
+
+        if len(misses) > 0:
+            actions, next_internals = self.model.independent_act(
+                states=util.fmap(function=(lambda x: x[misses]), xs=states, depth=1),
+                internals=util.fmap(function=(lambda x: x[misses]), xs=internals, depth=1),
+                auxiliaries=util.fmap(function=(lambda x: x[misses]), xs=auxiliaries, depth=1),
+                parallel=parallel[misses], deterministic=True
+            )
+            with self.act_cache_lock:
+                for index, n in enumerate(misses):
+                    results[n] = (
+                        OrderedDict(((name, x[index]) for name, x in actions.items())),
+                        OrderedDict(((name, x[index]) for name, x in next_internals.items()))
+                    )
+                    self.act_cache[keys[n]] = results[n]
+                while len(self.act_cache) > self.model.act_cache_size:
+                    self.act_cache.popitem(last=False)
+
+        actions = OrderedDict((
+            (name, np.stack([result[0][name] for result in results])) for name in results[0][0]
+        ))
+        internals = OrderedDict((
+            (name, np.stack([result[1][name] for result in results])) for name in results[0][1]
+        ))
+        return actions, internals
+
+    def clear_act_cache(self):
+        """
+        Clears the act cache, automatically done on update, restore and `assign_variable(...)`.
+        """
+        if self.act_cache is not None:
+            with self.act_cache_lock:
+                self.act_cache.clear()
+
+    def slot_internals(self, slot):
+        """
+        Returns the internal agent state(s) currently stored in the given internals slot(s), the
+        only case in which slot internals are copied from the graph.
+
+        Args:
+            slot (int | iter[int]): Internals slot index
+                (<span style="color:#C00000"><b>required</b></span>).
+
+        Returns:
+            dict[internal] | iter[dict[internal]]: Dictionary containing internal agent state(s).
+        """
+        if self.model.internals_slots_size == 0:
+            raise TensorforceError.invalid(
+                name='agent.slot_internals', argument='slot',
+                condition='config[internals_slots] = 0'
+            )
+
+        batched = (not isinstance(slot, int))
+        if batched:
+            slot = np.asarray(list(slot))
+        else:
+            slot = np.asarray([slot])
+
+        internals = self.model.slot_internals(slot=slot)
+
+        if batched:
+            return [
+                OrderedDict(((name, internals[name][n]) for name in internals))
+                for n in range(len(slot))
+            ]
+        else:
+            return OrderedDict(((name, internals[name][0]) for name in internals))
+
     def observe(self, reward, terminal=False, parallel=0, query=None, **kwargs):
         """
         Observes reward and whether a terminal state is reached, needs to be preceded by
@@ -628,6 +1047,9 @@ class Agent(object):
         """
         assert util.reduce_all(predicate=util.not_nan_inf, xs=reward)
 
+        if self.model.inference_only:
+            raise TensorforceError(message="Agent.observe not available if inference-only.")
+
         if query is not None and self.parallel_interactions > 1:
             raise TensorforceError.invalid(
                 name='agent.observe', argument='query', condition='parallel_interactions > 1'
@@ -671,10 +1093,14 @@ class Agent(object):
 
             if terminal > 0 or index == self.buffer_observe or query is not None:
                 self.timestep_completed[parallel] = True
-                if query is None:
-                    updated = self.model_observe(parallel=parallel, **kwargs)
-                else:
-                    updated, queried = self.model_observe(parallel=parallel, query=query, **kwargs)
+                # Shared recorder state, memory and update
+                with self.observe_lock:
+                    if query is None:
+                        updated = self.model_observe(parallel=parallel, **kwargs)
+                    else:
+                        updated, queried = self.model_observe(
+                            parallel=parallel, query=query, **kwargs
+                        )
 
             else:
                 # Increment buffer index
@@ -702,66 +1128,20 @@ class Agent(object):
 
         if self.recorder_spec is not None and \
                 self.episodes >= self.recorder_spec.get('start', 0):
-            for name in self.states_spec:
-                self.record_states[name].append(
-                    np.array(self.states_buffers[name][parallel, :index])
-                )
+            # Copies of buffers, since buffers are overwritten while chunk is queued for writing
+            values = OrderedDict(
+                (name, np.array(self.states_buffers[name][parallel, :index]))
+                for name in self.states_spec
+            )
             for name, spec in self.actions_spec.items():
-                self.record_actions[name].append(
-                    np.array(self.actions_buffers[name][parallel, :index])
-                )
+                values[name] = np.array(self.actions_buffers[name][parallel, :index])
                 if spec['type'] == 'int':
-                    self.record_states[name + '_mask'].append(
-                        np.array(self.states_buffers[name + '_mask'][parallel, :index])
-                    )
-            self.record_terminal.append(np.array(terminal))
-            self.record_reward.append(np.array(reward))
-
-            if terminal[-1] > 0:
-                self.num_episodes += 1
-
-                if self.num_episodes == self.recorder_spec.get('frequency', 1):
-                    directory = self.recorder_spec['directory']
-                    if os.path.isdir(directory):
-                        files = sorted(
-                            f for f in os.listdir(directory)
-                            if os.path.isfile(os.path.join(directory, f))
-                            and f.startswith('trace-')
-                        )
-                    else:
-                        os.makedirs(directory)
-                        files = list()
-                    max_traces = self.recorder_spec.get('max-traces')
-                    if max_traces is not None and len(files) > max_traces - 1:
-                        for filename in files[:-max_traces + 1]:
-                            filename = os.path.join(directory, filename)
-                            os.remove(filename)
-
-                    filename = 'trace-{}-{}.npz'.format(
-                        self.episodes, time.strftime('%Y%m%d-%H%M%S')
-                    )
-                    filename = os.path.join(directory, filename)
-                    self.record_states = util.fmap(
-                        function=np.concatenate, xs=self.record_states, depth=1
+                    values[name + '_mask'] = np.array(
+                        self.states_buffers[name + '_mask'][parallel, :index]
                     )
-                    self.record_actions = util.fmap(
-                        function=np.concatenate, xs=self.record_actions, depth=1
-                    )
-                    self.record_terminal = np.concatenate(self.record_terminal)
-                    self.record_reward = np.concatenate(self.record_reward)
-                    np.savez_compressed(
-                        filename, **self.record_states, **self.record_actions,
-                        terminal=self.record_terminal, reward=self.record_reward
-                    )
-                    self.record_states = util.fmap(
-                        function=(lambda x: list()), xs=self.record_states, depth=1
-                    )
-                    self.record_actions = util.fmap(
-                        function=(lambda x: list()), xs=self.record_actions, depth=1
-                    )
-                    self.record_terminal = list()
-                    self.record_reward = list()
-                    self.num_episodes = 0
+            values['terminal'] = np.array(terminal)
+            values['reward'] = np.array(reward)
+            self.recorder.append(values=values)
 
         # Reset buffer index
         self.buffer_indices[parallel] = 0
@@ -771,16 +1151,30 @@ class Agent(object):
             updated, self.episodes, self.updates = self.model.observe(
                 terminal=terminal, reward=reward, parallel=[parallel], **kwargs
             )
-            return updated
 
         else:
             updated, self.episodes, self.updates, queried = self.model.observe(
                 terminal=terminal, reward=reward, parallel=[parallel], query=query,
                 **kwargs
             )
+
+        # Periodic delta checkpoint (otherwise via TensorFlow checkpoint saver hook)
+        if self.model.saver_format == 'delta' and self.model.saver_frequency is not None and \
+                time.time() - self.model.delta_saved_at >= self.model.saver_frequency:
+            self.model.save(
+                directory=self.model.saver_directory, filename=self.model.saver_filename,
+                format='delta'
+            )
+
+        if query is None:
+            return updated
+        else:
             return updated, queried
 
-    def save(self, directory=None, filename=None, format='tensorflow', append=None):
+    def save(
+        self, directory=None, filename=None, format='tensorflow', append=None, compression=None,
+        blocking=True, max_pending=2
+    ):
         """
         Saves the agent to a checkpoint.
 
@@ -791,13 +1185,33 @@ class Agent(object):
             filename (str): Checkpoint filename, without extension
                 (<span style="color:#00C000"><b>default</b></span>: filename specified for
                 TensorFlow saver, otherwise name of agent).
-            format ("tensorflow" | "numpy" | "hdf5"): File format, "tensorflow" uses TensorFlow
-                saver to store variables, graph meta information and an optimized Protobuf model
-                with an act-only graph, whereas the others only store variables as NumPy/HDF5 file
+            format ("tensorflow" | "numpy" | "hdf5" | "delta" | "pb-inference" | "tflite" |
+                "numpy-runtime"): File format, "tensorflow" uses TensorFlow saver to store
+                variables, graph meta information and an optimized Protobuf model with an act-only
+                graph, "delta" appends the variables changed and memory entries written since the
+                previous delta checkpoint to a chain of files listed in "[filename]-delta.json",
+                starting with a full snapshot, "pb-inference" stores only a Protobuf model with
+                the deterministic act graph pruned of assertions and parameters and simplified via
+                Grappler as "[filename]-inference.pb", "tflite" converts this graph to a
+                TensorFlow Lite flatbuffer with dynamic batch dimension, "numpy-runtime" stores
+                the deterministic act computation of the policy for the NumPy-only runtime
+                together with a copy of the runtime module "numpy_runtime.py", whereas the others
+                only store variables as NumPy/HDF5 file
                 (<span style="color:#00C000"><b>default</b></span>: TensorFlow format).
             append ("timesteps" | "episodes" | "updates"): Append current timestep/episode/update to
                 checkpoint filename
                 (<span style="color:#00C000"><b>default</b></span>: none).
+            compression ("gzip" | "lzf"): Compression of the chunked datasets, only supported for
+                "hdf5" format
+                (<span style="color:#00C000"><b>default</b></span>: no compression).
+            blocking (bool): Whether to write the checkpoint before returning, otherwise a
+                consistent in-memory snapshot of the variables is taken and written on a background
+                thread, with the file synced to disk and atomically renamed once complete, only
+                supported for "numpy" and "hdf5" format
+                (<span style="color:#00C000"><b>default</b></span>: true).
+            max_pending (int > 0): Maximum number of pending non-blocking saves, blocks until the
+                oldest one is complete otherwise
+                (<span style="color:#00C000"><b>default</b></span>: 2).
 
         Returns:
             str: Checkpoint path.
@@ -805,9 +1219,10 @@ class Agent(object):
         # TODO: Messes with required parallel disentangling, better to remove unfinished episodes
         # from memory, but currently entire episode buffered anyway...
         # Empty buffers before saving
-        for parallel in range(self.parallel_interactions):
-            if self.buffer_indices[parallel] > 0:
-                self.model_observe(parallel=parallel)
+        with self.observe_lock:
+            for parallel in range(self.parallel_interactions):
+                if self.buffer_indices[parallel] > 0:
+                    self.model_observe(parallel=parallel)
 
         if directory is None:
             # default directory: saver if given, otherwise current directory "."
@@ -820,7 +1235,54 @@ class Agent(object):
             # default filename: saver which defaults to agent name
             filename = self.model.saver_filename
 
-        path = self.model.save(directory=directory, filename=filename, format=format, append=append)
+        if append is not None and format == 'delta':
+            raise TensorforceError.invalid(
+                name='agent.save', argument='append', condition='format = delta'
+            )
+        if compression is not None and format != 'hdf5':
+            raise TensorforceError.invalid(
+                name='agent.save', argument='compression', condition='format != hdf5'
+            )
+
+        if blocking:
+            path = self.model.save(
+                directory=directory, filename=filename, format=format, append=append,
+                compression=compression
+            )
+
+        else:
+            if format not in ('numpy', 'hdf5'):
+                raise TensorforceError.value(
+                    name='agent.save', argument='format', value=format, condition='not blocking'
+                )
+            if not isinstance(max_pending, int) or max_pending <= 0:
+                raise TensorforceError.value(
+                    name='agent.save', argument='max_pending', value=max_pending
+                )
+            self.wait_saves(max_pending=(max_pending - 1))
+
+            os.makedirs(directory, exist_ok=True)
+            path, variables = self.model.save_snapshot(
+                directory=directory, filename=filename, format=format, append=append
+            )
+            if path in self.save_threads:
+                self.wait_saves(path=path)
+
+            def progress(fraction):
+                self.save_progress[path] = fraction
+
+            def write():
+                try:
+                    self.model.write_snapshot(
+                        path=path, format=format, variables=variables, compression=compression,
+                        progress=progress
+                    )
+                except BaseException as exc:
+                    self.save_exceptions.append(exc)
+
+            self.save_progress[path] = 0.0
+            self.save_threads[path] = Thread(target=write, name=('save-' + path))
+            self.save_threads[path].start()
 
         spec_path = os.path.join(directory, filename + '.json')
         try:
@@ -843,6 +1305,52 @@ class Agent(object):
 
         return path
 
+    def pending_saves(self):
+        """
+        Returns the progress of pending non-blocking saves.
+
+        Returns:
+            OrderedDict[str, float]: Fraction of variables written per checkpoint path, in order of
+            saving.
+        """
+        return OrderedDict(
+            (path, self.save_progress[path]) for path, thread in self.save_threads.items()
+            if thread.is_alive()
+        )
+
+    def wait_saves(self, max_pending=0, path=None):
+        """
+        Blocks until pending non-blocking saves are complete, and raises the exception of a failed
+        save.
+
+        Args:
+            max_pending (int >= 0): Wait for the oldest saves until at most this number is pending
+                (<span style="color:#00C000"><b>default</b></span>: wait for all saves).
+            path (str): Only wait for the save to the given checkpoint path
+                (<span style="color:#00C000"><b>default</b></span>: none).
+        """
+        if path is None:
+            while len(self.save_threads) > max_pending:
+                path, thread = self.save_threads.popitem(last=False)
+                thread.join()
+                self.save_progress.pop(path)
+            # Remove completed saves
+            completed = [
+                path for path, thread in self.save_threads.items() if not thread.is_alive()
+            ]
+            for path in completed:
+                self.save_threads.pop(path)
+                self.save_progress.pop(path)
+
+        elif path in self.save_threads:
+            self.save_threads.pop(path).join()
+            self.save_progress.pop(path)
+
+        if len(self.save_exceptions) > 0:
+            exception = self.save_exceptions.pop(0)
+            self.save_exceptions.clear()
+            raise exception
+
     def restore(self, directory=None, filename=None, format=None):
         """
         Restores the agent from a checkpoint.
@@ -854,7 +1362,8 @@ class Agent(object):
             filename (str): Checkpoint filename, with or without append and extension
                 (<span style="color:#00C000"><b>default</b></span>: filename specified for
                 TensorFlow saver, otherwise name of agent or latest checkpoint in directory).
-            format ("tensorflow" | "numpy" | "hdf5"): File format
+            format ("tensorflow" | "numpy" | "hdf5" | "delta"): File format, "delta" replays
+                the chain of delta checkpoints listed in "[filename]-delta.json"
                 (<span style="color:#00C000"><b>default</b></span>: format matching directory and
                 filename, required to be unambiguous).
         """
@@ -876,7 +1385,11 @@ class Agent(object):
             filename = self.model.saver_filename
 
         # format implicitly given if file exists
-        if format is None and os.path.isfile(os.path.join(directory, filename)):
+        if format == 'delta' or (
+            format is None and os.path.isfile(os.path.join(directory, filename + '-delta.json'))
+        ):
+            format = 'delta'
+        elif format is None and os.path.isfile(os.path.join(directory, filename)):
             if '.data-' in filename:
                 filename = filename[:filename.index('.data-')]
                 format = 'tensorflow'
@@ -950,6 +1463,41 @@ class Agent(object):
         self.timesteps, self.episodes, self.updates = self.model.restore(
             directory=directory, filename=filename, format=format
         )
+        self.clear_act_cache()
+
+    def save_memory(self, directory):
+        """
+        Saves the memory and reward estimator buffers, including buffer indices and episode
+        counts, as one raw NumPy file per variable, for instance, to warm-start training after a
+        restart.
+
+        Args:
+            directory (str): Memory directory
+                (<span style="color:#C00000"><b>required</b></span>).
+        """
+        # Empty buffers before saving
+        with self.observe_lock:
+            for parallel in range(self.parallel_interactions):
+                if self.buffer_indices[parallel] > 0:
+                    self.model_observe(parallel=parallel)
+
+            self.model.save_memory(directory=directory)
+
+    def load_memory(self, directory, mmap=True):
+        """
+        Loads the memory and reward estimator buffers saved via `save_memory(...)`, which requires
+        the same memory and estimator configuration.
+
+        Args:
+            directory (str): Memory directory
+                (<span style="color:#C00000"><b>required</b></span>).
+            mmap (bool): Whether to memory-map the files instead of reading them into memory first
+                (<span style="color:#00C000"><b>default</b></span>: true).
+        """
+        if not self.is_initialized:
+            self.initialize()
+
+        self.model.load_memory(directory=directory, mmap=mmap)
 
     def get_variables(self):
         """
@@ -975,6 +1523,30 @@ class Agent(object):
         """
         return self.model.get_variable(variable=variable)
 
+    def get_variables_values(self, variables=None):
+        """
+        Returns the values of the given variables, retrieved in one call.
+
+        Args:
+            variables (list[string]): Variable names
+                (<span style="color:#00C000"><b>default</b></span>: all saved variables).
+
+        Returns:
+            OrderedDict[str, numpy-array]: Variable values.
+        """
+        return self.model.get_variables_values(variables=variables)
+
+    def assign_variables(self, values):
+        """
+        Assigns the given values to the saved variables with the given names, in one call.
+
+        Args:
+            values (dict[string, variable-compatible value]): Values to assign to variables
+                (<span style="color:#C00000"><b>required</b></span>).
+        """
+        self.model.assign_variables(values=values)
+        self.clear_act_cache()
+
     def assign_variable(self, variable, value):
         """
         Assigns the given value to the variable with the given name.
@@ -986,6 +1558,7 @@ class Agent(object):
                 (<span style="color:#C00000"><b>required</b></span>).
         """
         self.model.assign_variable(variable=variable, value=value)
+        self.clear_act_cache()
 
     def summarize(self, summary, value, step=None):
         """
@@ -1061,6 +1634,9 @@ class ActonlyAgent(object):
             self.internals_spec = internals
             self._initial_internals = initial_internals
 
+        self.load_model(path=path)
+
+    def load_model(self, path):
         with tf.io.gfile.GFile(name=path, mode='rb') as filehandle:
             graph_def = tf.compat.v1.GraphDef()
             graph_def.ParseFromString(filehandle.read())
@@ -1082,9 +1658,9 @@ class ActonlyAgent(object):
         self, states, internals=None, parallel=0, independent=True, deterministic=True,
         evaluation=True, query=None, **kwargs
     ):
-        # Invalid arguments
-        assert parallel == 0 and independent and deterministic and evaluation and \
-            query is None and len(kwargs) == 0
+        # Invalid arguments, batched act via list of parallel indices (only used for batch size)
+        assert (not isinstance(parallel, int) or parallel == 0) and independent and \
+            deterministic and evaluation and query is None and len(kwargs) == 0
 
         assert util.reduce_all(predicate=util.not_nan_inf, xs=states)
         internals_is_none = (internals is None)
@@ -1094,9 +1670,12 @@ class ActonlyAgent(object):
             internals = OrderedDict()
 
         # Batch states
-        name = next(iter(self.states_spec))
-        batched = (np.asarray(states[name]).ndim > len(self.states_spec[name]['shape']))
+        batched = (not isinstance(parallel, int))
         if batched:
+            if len(parallel) == 0:
+                raise TensorforceError.value(
+                    name='agent.act', argument='parallel', value=parallel, hint='zero-length'
+                )
             if isinstance(states[0], dict):
                 states = OrderedDict((
                     (name, np.asarray([states[n][name] for n in range(len(parallel))]))
@@ -1104,10 +1683,11 @@ class ActonlyAgent(object):
                 ))
             else:
                 states = np.asarray(states)
-            internals = OrderedDict((
-                (name, np.asarray([internals[n][name] for n in range(len(parallel))]))
-                for name in internals[0]
-            ))
+            if not internals_is_none:
+                internals = OrderedDict((
+                    (name, np.asarray([internals[n][name] for n in range(len(parallel))]))
+                    for name in internals[0]
+                ))
         else:
             states = util.fmap(
                 function=(lambda x: np.asarray([x])), xs=states,
@@ -1129,26 +1709,10 @@ class ActonlyAgent(object):
         )
 
         # Model.act()
-        fetches = (
-            {
-                name: util.join_scopes('agent.independent_act', name + '-output:0')
-                for name in self.actions_spec
-            }, {
-                name: util.join_scopes('agent.independent_act', name + '-output:0')
-                for name in self.internals_spec
-            }
+        actions, internals = self.graph_act(
+            states=states, auxiliaries=auxiliaries, internals=internals
         )
 
-        feed_dict = dict()
-        for name, state in states.items():
-            feed_dict[util.join_scopes('agent', name + '-input:0')] = state
-        for name, auxiliary in auxiliaries.items():
-            feed_dict[util.join_scopes('agent', name + '-input:0')] = auxiliary
-        for name, internal in internals.items():
-            feed_dict[util.join_scopes('agent', name + '-input:0')] = internal
-
-        actions, internals = self.session.run(fetches=fetches, feed_dict=feed_dict)
-
         # Reverse normalized actions dictionary
         actions = util.unpack_values(
             value_type='action', values=actions, values_spec=self.actions_spec
@@ -1174,6 +1738,140 @@ class ActonlyAgent(object):
         else:
             return actions, internals
 
+    def graph_act(self, states, auxiliaries, internals):
+        fetches = (
+            {
+                name: util.join_scopes('agent.independent_act', name + '-output:0')
+                for name in self.actions_spec
+            }, {
+                name: util.join_scopes('agent.independent_act', name + '-output:0')
+                for name in self.internals_spec
+            }
+        )
+
+        feed_dict = dict()
+        for name, state in states.items():
+            feed_dict[util.join_scopes('agent', name + '-input:0')] = state
+        for name, auxiliary in auxiliaries.items():
+            feed_dict[util.join_scopes('agent', name + '-input:0')] = auxiliary
+        for name, internal in internals.items():
+            feed_dict[util.join_scopes('agent', name + '-input:0')] = internal
+
+        return self.session.run(fetches=fetches, feed_dict=feed_dict)
+
+
+class TFLiteActonlyAgent(ActonlyAgent):
+    """
+    Act-only agent based on a TensorFlow Lite flatbuffer as stored by
+    `Agent.save(format="tflite")`, compatible with the Protobuf-based act-only agent.
+
+    Args:
+        path (str): TensorFlow Lite flatbuffer path
+            (<span style="color:#C00000"><b>required</b></span>).
+        states (specification): States specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        actions (specification): Actions specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        internals (specification): Internals specification
+            (<span style="color:#00C000"><b>default</b></span>: no internals).
+        initial_internals (dict[array]): Initial internals
+            (<span style="color:#00C000"><b>default</b></span>: no internals).
+        batch_size (int > 0): Fixed batch size, tensors are allocated once and smaller batches are
+            padded, otherwise tensors are re-allocated whenever the batch size changes
+            (<span style="color:#00C000"><b>default</b></span>: dynamic batch size).
+        num_threads (int > 0): Number of interpreter threads
+            (<span style="color:#00C000"><b>default</b></span>: TensorFlow Lite default).
+    """
+
+    def __init__(
+        self, path, states, actions, internals=None, initial_internals=None, batch_size=None,
+        num_threads=None
+    ):
+        if batch_size is not None and (not isinstance(batch_size, int) or batch_size <= 0):
+            raise TensorforceError.value(
+                name='TFLiteActonlyAgent', argument='batch_size', value=batch_size,
+                hint='<= 0'
+            )
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+
+        super().__init__(
+            path=path, states=states, actions=actions, internals=internals,
+            initial_internals=initial_internals
+        )
+
+    def load_model(self, path):
+        self.interpreter = tf.lite.Interpreter(model_path=path, num_threads=self.num_threads)
+        self.inputs = OrderedDict(
+            (details['name'], details) for details in self.interpreter.get_input_details()
+        )
+        self.outputs = OrderedDict(
+            (details['name'], details) for details in self.interpreter.get_output_details()
+        )
+        if self.batch_size is None:
+            self.allocated_batch_size = 1
+        else:
+            self.allocate(batch_size=self.batch_size)
+        self.interpreter.allocate_tensors()
+
+    def close(self):
+        self.interpreter = None
+
+    def allocate(self, batch_size):
+        for details in self.inputs.values():
+            self.interpreter.resize_tensor_input(
+                input_index=details['index'],
+                tensor_size=([batch_size] + list(details['shape_signature'][1:]))
+            )
+        self.allocated_batch_size = batch_size
+
+    def graph_act(self, states, auxiliaries, internals):
+        batch_size = next(iter(states.values())).shape[0]
+
+        if self.batch_size is None:
+            if batch_size != self.allocated_batch_size:
+                self.allocate(batch_size=batch_size)
+                self.interpreter.allocate_tensors()
+        elif batch_size > self.batch_size:
+            raise TensorforceError.value(
+                name='agent.act', argument='batch size', value=batch_size,
+                hint='> fixed batch_size'
+            )
+
+        inputs = dict()
+        for name, state in states.items():
+            inputs[util.join_scopes('agent', name + '-input')] = state
+        for name, auxiliary in auxiliaries.items():
+            inputs[util.join_scopes('agent', name + '-input')] = auxiliary
+        for name, internal in internals.items():
+            inputs[util.join_scopes('agent', name + '-input')] = internal
+
+        for name, details in self.inputs.items():
+            if name in inputs:
+                x = np.asarray(inputs[name], dtype=details['dtype'])
+            else:
+                # Action mask defaults to all actions allowed
+                x = np.ones(
+                    shape=((batch_size,) + tuple(details['shape_signature'][1:])),
+                    dtype=details['dtype']
+                )
+            if batch_size < self.allocated_batch_size:
+                # Pad fixed batch by repeating the last entry
+                x = np.concatenate(
+                    [x, np.repeat(x[-1:], self.allocated_batch_size - batch_size, axis=0)], axis=0
+                )
+            self.interpreter.set_tensor(tensor_index=details['index'], value=x)
+
+        self.interpreter.invoke()
+
+        def output(name):
+            details = self.outputs[util.join_scopes('agent.independent_act', name + '-output')]
+            return self.interpreter.get_tensor(tensor_index=details['index'])[:batch_size]
+
+        actions = OrderedDict((name, output(name=name)) for name in self.actions_spec)
+        internals = OrderedDict((name, output(name=name)) for name in self.internals_spec)
+        return actions, internals
+
 
 class TensorforceJSONEncoder(json.JSONEncoder):
     """
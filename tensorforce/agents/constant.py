@@ -101,6 +101,9 @@ class ConstantAgent(Agent):
             record traces (<span style="color:#00C000"><b>default</b></span>: 0).</li>
             <li><b>max-traces</b> (<i>int > 0</i>) &ndash; maximum number of traces to keep
             (<span style="color:#00C000"><b>default</b></span>: all).</li>
+            <li><b>max-pending</b> (<i>int > 0</i>) &ndash; maximum number of episode chunks
+            queued for the background trace writer before observe blocks
+            (<span style="color:#00C000"><b>default</b></span>: 64).</li>
     """
 
     def __init__(
@@ -22,6 +22,7 @@ import numpy as np
 from tensorforce import TensorforceError, util
 from tensorforce.agents import Agent
 from tensorforce.core.models import TensorforceModel
+from tensorforce.traces import read_index, TraceDataset
 
 
 class TensorforceAgent(Agent):
@@ -173,6 +174,10 @@ class TensorforceAgent(Agent):
             (<span style="color:#C00000"><b>required</b></span>).</li>
             <li><b>filename</b> (<i>string</i>) &ndash; model filename
             (<span style="color:#00C000"><b>default</b></span>: agent name).</li>
+            <li><b>format</b> (<i>"tensorflow" | "delta"</i>) &ndash; checkpoint format, "delta"
+            writes a full snapshot followed by the changed variables and memory entries, and
+            compacts the chain into a new snapshot after max-deltas deltas
+            (<span style="color:#00C000"><b>default</b></span>: "tensorflow").</li>
             <li><b>frequency</b> (<i>int > 0</i>) &ndash; how frequently in seconds to save the
             model (<span style="color:#00C000"><b>default</b></span>: 600 seconds).</li>
             <li><b>load</b> (<i>bool | str</i>) &ndash; whether to load the existing model, or
@@ -181,6 +186,8 @@ class TensorforceAgent(Agent):
             </ul>
             <li><b>max-checkpoints</b> (<i>int > 0</i>) &ndash; maximum number of checkpoints to
             keep (<span style="color:#00C000"><b>default</b></span>: 5).</li>
+            <li><b>max-deltas</b> (<i>int >= 0</i>) &ndash; maximum number of delta checkpoints
+            before compaction (<span style="color:#00C000"><b>default</b></span>: 10).</li>
         summarizer (specification): TensorBoard summarizer configuration with the following
             attributes (<span style="color:#00C000"><b>default</b></span>: no summarizer):
             <ul>
@@ -238,6 +245,25 @@ class TensorforceAgent(Agent):
             record traces (<span style="color:#00C000"><b>default</b></span>: 0).</li>
             <li><b>max-traces</b> (<i>int > 0</i>) &ndash; maximum number of traces to keep
             (<span style="color:#00C000"><b>default</b></span>: all).</li>
+            <li><b>max-pending</b> (<i>int > 0</i>) &ndash; maximum number of episode chunks
+            queued for the background trace writer before observe blocks
+            (<span style="color:#00C000"><b>default</b></span>: 64).</li>
+        config (specification): Additional internal configuration with the following attributes
+            (<span style="color:#00C000"><b>default</b></span>: none):
+            <ul>
+            <li><b>internals_slots</b> (<i>int > 0</i>) &ndash; number of internals slots which
+            keep internal states in the graph for independent act via `act(..., slot=...)`
+            (<span style="color:#00C000"><b>default</b></span>: none).</li>
+            <li><b>inference_only</b> (<i>bool</i>) &ndash; whether to only create the graph and
+            variables required for independent act, so no memory, reward estimator, optimizer and
+            act/observe/experience/update functions
+            (<span style="color:#00C000"><b>default</b></span>: false).</li>
+            <li><b>act_cache_size</b> (<i>int > 0</i>) &ndash; size of least-recently-used cache
+            for deterministic independent act, keyed by states and internals, invalidated by
+            update, restore and `assign_variable(...)`, not compatible with states preprocessing
+            and final exploration/variable noise > 0.0
+            (<span style="color:#00C000"><b>default</b></span>: none).</li>
+            </ul>
     """
 
     def __init__(
@@ -323,29 +349,69 @@ class TensorforceAgent(Agent):
             max_episode_timesteps=max_episode_timesteps
         )
 
-        self.experience_size = self.model.estimator.capacity
+        if self.model.inference_only:
+            self.experience_size = None
+            self.experience_episodes_size = None
+        else:
+            self.experience_size = self.model.estimator.capacity
+            if self.model.estimator.estimate_horizon == 'early':
+                self.experience_episodes_size = None
+            else:
+                self.experience_episodes_size = self.model.memory.capacity
+        # Whether the last episode fed via experience is incomplete
+        self.experience_incomplete = False
 
     def experience(
-        self, states, actions, terminal, reward, internals=None, query=None, **kwargs
+        self, states=None, actions=None, terminal=None, reward=None, internals=None, query=None,
+        batches=None, **kwargs
     ):
         """
-        Feed experience traces.
+        Feed experience traces. Complete episodes are fed in one call per batch of at most memory
+        capacity timesteps, unless tensors are queried or the reward is estimated early, whereas
+        incomplete episodes are fed in chunks of at most estimator capacity timesteps.
 
         Args:
             states (dict[array[state]]): Dictionary containing arrays of states
-                (<span style="color:#C00000"><b>required</b></span>).
+                (<span style="color:#C00000"><b>required</b></span>, unless batches).
             actions (dict[array[action]]): Dictionary containing arrays of actions
-                (<span style="color:#C00000"><b>required</b></span>).
+                (<span style="color:#C00000"><b>required</b></span>, unless batches).
             terminal (array[bool]): Array of terminals
-                (<span style="color:#C00000"><b>required</b></span>).
+                (<span style="color:#C00000"><b>required</b></span>, unless batches).
             reward (array[float]): Array of rewards
-                (<span style="color:#C00000"><b>required</b></span>).
+                (<span style="color:#C00000"><b>required</b></span>, unless batches).
             internals (dict[state]): Dictionary containing arrays of internal agent states
                 (<span style="color:#00C000"><b>default</b></span>: no internal states).
             query (list[str]): Names of tensors to retrieve
                 (<span style="color:#00C000"><b>default</b></span>: none).
+            batches (iter[dict]): Iterable of dictionaries with keys "states", "actions",
+                "terminal", "reward" and optionally "internals", which are fed one after the
+                other, for instance, a generator streaming a large dataset with bounded memory
+                (<span style="color:#00C000"><b>default</b></span>: none).
             kwargs: Additional input values, for instance, for dynamic hyperparameters.
         """
+        if self.model.inference_only:
+            raise TensorforceError(message="Agent.experience not available if inference-only.")
+
+        if batches is not None:
+            for name, value in (
+                ('states', states), ('actions', actions), ('terminal', terminal),
+                ('reward', reward), ('internals', internals)
+            ):
+                if value is not None:
+                    raise TensorforceError.invalid(
+                        name='agent.experience', argument=name, condition='batches'
+                    )
+            queried = None
+            for batch in batches:
+                queried = self.experience(query=query, **batch, **kwargs)
+            return queried
+
+        for name, value in (
+            ('states', states), ('actions', actions), ('terminal', terminal), ('reward', reward)
+        ):
+            if value is None:
+                raise TensorforceError.required(name='agent.experience', argument=name)
+
         assert (self.buffer_indices == 0).all()
         assert util.reduce_all(predicate=util.not_nan_inf, xs=states)
         assert internals is None or util.reduce_all(predicate=util.not_nan_inf, xs=internals)
@@ -393,44 +459,120 @@ class TensorforceAgent(Agent):
             terminal = np.asarray([int(x) if isinstance(x, bool) else x for x in terminal])
         reward = np.asarray(reward)
 
-        # Batch experiences split into episodes and at most size buffer_observe
+        # Batch experiences split into batches of complete episodes, or otherwise episodes in
+        # chunks of at most estimator capacity
+        ends = np.flatnonzero(terminal) + 1
         last = 0
-        for index in range(1, len(terminal) + 1):
-            if terminal[index - 1] == 0 and index - last < self.experience_size:
-                continue
-
-            # Include terminal in batch if possible
-            if index < len(terminal) and terminal[index - 1] == 0 and terminal[index] > 0 and \
-                    index - last < self.experience_size:
-                index += 1
-
-            function = (lambda x: x[last: index])
-            states_batch = util.fmap(function=function, xs=states, depth=1)
-            internals_batch = util.fmap(function=function, xs=internals, depth=1)
-            auxiliaries_batch = util.fmap(function=function, xs=auxiliaries, depth=1)
-            actions_batch = util.fmap(function=function, xs=actions, depth=1)
-            terminal_batch = terminal[last: index]
-            reward_batch = reward[last: index]
-            last = index
-
-            # Model.experience()
-            if query is None:
-                self.timesteps, self.episodes, self.updates = self.model.experience(
-                    states=states_batch, internals=internals_batch,
-                    auxiliaries=auxiliaries_batch, actions=actions_batch, terminal=terminal_batch,
-                    reward=reward_batch, **kwargs
-                )
-
+        while last < len(terminal):
+            if query is None and self.experience_episodes_size is not None and \
+                    not self.experience_incomplete:
+                # Complete episodes with at most memory capacity timesteps
+                num_ends = np.searchsorted(ends, last + self.experience_episodes_size, side='right')
+                if num_ends > 0 and ends[num_ends - 1] > last:
+                    index = ends[num_ends - 1]
+                    function = (lambda x: x[last: index])
+                    self.timesteps, self.episodes, self.updates = self.model.experience_episodes(
+                        states=util.fmap(function=function, xs=states, depth=1),
+                        internals=util.fmap(function=function, xs=internals, depth=1),
+                        auxiliaries=util.fmap(function=function, xs=auxiliaries, depth=1),
+                        actions=util.fmap(function=function, xs=actions, depth=1),
+                        terminal=terminal[last: index], reward=reward[last: index], **kwargs
+                    )
+                    last = index
+                    continue
+
+            # Next (remainder of an) episode
+            num_ends = np.searchsorted(ends, last, side='right')
+            if num_ends < len(ends):
+                end = ends[num_ends]
             else:
-                self.timesteps, self.episodes, self.updates, queried = self.model.experience(
-                    states=states_batch, internals=internals_batch,
-                    auxiliaries=auxiliaries_batch, actions=actions_batch, terminal=terminal_batch,
-                    reward=reward_batch, query=query, **kwargs
-                )
+                end = len(terminal)
+
+            for start in range(last, end, self.experience_size):
+                index = min(start + self.experience_size, end)
+                function = (lambda x: x[start: index])
+                states_batch = util.fmap(function=function, xs=states, depth=1)
+                internals_batch = util.fmap(function=function, xs=internals, depth=1)
+                auxiliaries_batch = util.fmap(function=function, xs=auxiliaries, depth=1)
+                actions_batch = util.fmap(function=function, xs=actions, depth=1)
+                terminal_batch = terminal[start: index]
+                reward_batch = reward[start: index]
+
+                # Model.experience()
+                if query is None:
+                    self.timesteps, self.episodes, self.updates = self.model.experience(
+                        states=states_batch, internals=internals_batch,
+                        auxiliaries=auxiliaries_batch, actions=actions_batch,
+                        terminal=terminal_batch, reward=reward_batch, **kwargs
+                    )
+
+                else:
+                    self.timesteps, self.episodes, self.updates, queried = self.model.experience(
+                        states=states_batch, internals=internals_batch,
+                        auxiliaries=auxiliaries_batch, actions=actions_batch,
+                        terminal=terminal_batch, reward=reward_batch, query=query, **kwargs
+                    )
+
+            self.experience_incomplete = (terminal[end - 1] == 0)
+            last = end
 
         if query is not None:
             return queried
 
+    def values_batch(self, states, actions=None, internals=None, chunk_size=1024, values=None):
+        """
+        Returns the policy state values or, if actions are given, action values for a large array
+        of states, analogous to `act_batch(...)` processed in chunks of fixed size while the next
+        chunk is prefetched by a background thread.
+
+        Args:
+            states (dict[array[state]] | array[state]): Dictionary containing arrays of states,
+                possibly memory-mapped, plus optional action masks
+                (<span style="color:#C00000"><b>required</b></span>).
+            actions (dict[array[action]] | array[action]): Dictionary containing arrays of actions
+                (<span style="color:#00C000"><b>default</b></span>: state values).
+            internals (dict[array[internal]]): Dictionary containing arrays of internal agent
+                states
+                (<span style="color:#00C000"><b>default</b></span>: initial internal agent states,
+                so every state is treated as first state of an episode).
+            chunk_size (int > 0): Number of states processed per session call
+                (<span style="color:#00C000"><b>default</b></span>: 1024).
+            values (dict[array[float]] | array[float]): Preallocated, possibly memory-mapped
+                arrays the values are written to
+                (<span style="color:#00C000"><b>default</b></span>: newly allocated arrays).
+
+        Returns:
+            dict[array[float]] | array[float]: Dictionary containing arrays of values per action.
+        """
+        if not self.model.has_values:
+            raise TensorforceError(
+                message="Agent.values_batch requires all action distributions to provide values."
+            )
+
+        if values is None:
+            values = OrderedDict()
+        else:
+            values = util.normalize_values(
+                value_type='action', values=values, values_spec=self.actions_spec
+            )
+
+        if actions is None:
+            values = self.chunked_call(
+                name='agent.values_batch', function=self.model.states_values, states=states,
+                internals=internals, chunk_size=chunk_size, outputs=values
+            )
+
+        else:
+            actions = util.normalize_values(
+                value_type='action', values=actions, values_spec=self.actions_spec
+            )
+            values = self.chunked_call(
+                name='agent.values_batch', function=self.model.actions_values, states=states,
+                internals=internals, chunk_size=chunk_size, outputs=values, actions=actions
+            )
+
+        return util.unpack_values(value_type='action', values=values, values_spec=self.actions_spec)
+
     def update(self, query=None, **kwargs):
         """
         Perform an update.
@@ -440,6 +582,9 @@ class TensorforceAgent(Agent):
                 (<span style="color:#00C000"><b>default</b></span>: none).
             kwargs: Additional input values, for instance, for dynamic hyperparameters.
         """
+        if self.model.inference_only:
+            raise TensorforceError(message="Agent.update not available if inference-only.")
+
         # Model.update()
         if query is None:
             self.timesteps, self.episodes, self.updates = self.model.update(**kwargs)
@@ -461,8 +606,9 @@ class TensorforceAgent(Agent):
             num_iterations (int > 0): Number of iterations consisting of loading new traces and
                 performing multiple updates
                 (<span style="color:#C00000"><b>required</b></span>).
-            num_traces (int > 0): Number of traces to load per iteration; has to at least satisfy
-                the update batch size
+            num_traces (int > 0): Number of traces to load per iteration, or number of episodes
+                to sample per iteration for traces indexed by "traces.json"; has to at least
+                satisfy the update batch size
                 (<span style="color:#00C000"><b>default</b></span>: 1).
             num_updates (int > 0): Number of updates per iteration
                 (<span style="color:#00C000"><b>default</b></span>: 1).
@@ -471,41 +617,44 @@ class TensorforceAgent(Agent):
             raise TensorforceError.value(
                 name='agent.pretrain', argument='directory', value=directory
             )
-        files = sorted(
-            os.path.join(directory, f) for f in os.listdir(directory)
-            if os.path.isfile(os.path.join(directory, f)) and f.startswith('trace-')
-        )
-        indices = list(range(len(files)))
-
-        for _ in range(num_iterations):
-            shuffle(indices)
-            if num_traces is None:
-                selection = indices
-            else:
-                selection = indices[:num_traces]
+        if read_index(directory=directory) is not None:
+            # Episodes sampled from memory-mapped segments, next batch prepared during updates
+            dataset = TraceDataset(directory=directory)
+            batches = dataset.prefetch(num_batches=num_iterations, num_episodes=num_traces)
 
-            states = OrderedDict(((name, list()) for name in self.states_spec))
+        else:
+            # Compressed trace archives of previous recorder versions
+            files = sorted(
+                os.path.join(directory, f) for f in os.listdir(directory)
+                if os.path.isfile(os.path.join(directory, f)) and f.startswith('trace-')
+            )
+            indices = list(range(len(files)))
+
+            def load_archives():
+                for _ in range(num_iterations):
+                    shuffle(indices)
+                    if num_traces is None:
+                        selection = indices
+                    else:
+                        selection = indices[:num_traces]
+                    traces = [np.load(files[index]) for index in selection]
+                    yield OrderedDict(
+                        (name, np.concatenate([trace[name] for trace in traces]))
+                        for name in traces[0].files
+                    )
+
+            batches = load_archives()
+
+        for batch in batches:
+            states = OrderedDict(((name, batch[name]) for name in self.states_spec))
             for name, spec in self.actions_spec.items():
                 if spec['type'] == 'int':
-                    states[name + '_mask'] = list()
-            actions = OrderedDict(((name, list()) for name in self.actions_spec))
-            terminal = list()
-            reward = list()
-            for index in selection:
-                trace = np.load(files[index])
-                for name in states:
-                    states[name].append(trace[name])
-                for name in actions:
-                    actions[name].append(trace[name])
-                terminal.append(trace['terminal'])
-                reward.append(trace['reward'])
-
-            states = util.fmap(function=np.concatenate, xs=states, depth=1)
-            actions = util.fmap(function=np.concatenate, xs=actions, depth=1)
-            terminal = np.concatenate(terminal)
-            reward = np.concatenate(reward)
-
-            self.experience(states=states, actions=actions, terminal=terminal, reward=reward)
+                    states[name + '_mask'] = batch[name + '_mask']
+            actions = OrderedDict(((name, batch[name]) for name in self.actions_spec))
+
+            self.experience(
+                states=states, actions=actions, terminal=batch['terminal'], reward=batch['reward']
+            )
             for _ in range(num_updates):
                 self.update()
             # TODO: self.obliviate()
@@ -73,6 +73,12 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             (<span style="color:#00C000"><b>default</b></span>: batch_size).
         learning_rate (parameter, float > 0.0): Optimizer learning rate
             (<span style="color:#00C000"><b>default</b></span>: 1e-3).
+        subsampling_fraction (parameter, 0.0 < float <= 1.0): Fraction of batch timesteps to
+            subsample for the Fisher-vector products of the natural-gradient step
+            (<span style="color:#00C000"><b>default</b></span>: 1.0).
+        parallel_line_search (bool): Whether to evaluate all line search step sizes in a single
+            pass instead of one after another
+            (<span style="color:#00C000"><b>default</b></span>: false).
 
         discount (parameter, 0.0 <= float <= 1.0): Discount factor for future rewards of
             discounted-sum reward estimation
@@ -128,6 +134,10 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             (<span style="color:#C00000"><b>required</b></span>).</li>
             <li><b>filename</b> (<i>string</i>) &ndash; model filename
             (<span style="color:#00C000"><b>default</b></span>: agent name).</li>
+            <li><b>format</b> (<i>"tensorflow" | "delta"</i>) &ndash; checkpoint format, "delta"
+            writes a full snapshot followed by the changed variables and memory entries, and
+            compacts the chain into a new snapshot after max-deltas deltas
+            (<span style="color:#00C000"><b>default</b></span>: "tensorflow").</li>
             <li><b>frequency</b> (<i>int > 0</i>) &ndash; how frequently in seconds to save the
             model (<span style="color:#00C000"><b>default</b></span>: 600 seconds).</li>
             <li><b>load</b> (<i>bool | str</i>) &ndash; whether to load the existing model, or
@@ -136,6 +146,8 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             </ul>
             <li><b>max-checkpoints</b> (<i>int > 0</i>) &ndash; maximum number of checkpoints to
             keep (<span style="color:#00C000"><b>default</b></span>: 5).</li>
+            <li><b>max-deltas</b> (<i>int >= 0</i>) &ndash; maximum number of delta checkpoints
+            before compaction (<span style="color:#00C000"><b>default</b></span>: 10).</li>
         summarizer (specification): TensorBoard summarizer configuration with the following
             attributes (<span style="color:#00C000"><b>default</b></span>: no summarizer):
             <ul>
@@ -193,6 +205,9 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             record traces (<span style="color:#00C000"><b>default</b></span>: 0).</li>
             <li><b>max-traces</b> (<i>int > 0</i>) &ndash; maximum number of traces to keep
             (<span style="color:#00C000"><b>default</b></span>: all).</li>
+            <li><b>max-pending</b> (<i>int > 0</i>) &ndash; maximum number of episode chunks
+            queued for the background trace writer before observe blocks
+            (<span style="color:#00C000"><b>default</b></span>: 64).</li>
     """
 
     def __init__(
@@ -203,7 +218,8 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
         # Memory
         memory=None,
         # Optimization
-        update_frequency=None, learning_rate=1e-3,
+        update_frequency=None, learning_rate=1e-3, subsampling_fraction=1.0,
+        parallel_line_search=False,
         # Reward estimation
         discount=0.99, estimate_terminal=False,
         # Critic
@@ -225,6 +241,8 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             network=network,
             memory=memory,
             update_frequency=update_frequency, learning_rate=learning_rate,
+                subsampling_fraction=subsampling_fraction,
+                parallel_line_search=parallel_line_search,
             discount=discount, estimate_terminal=estimate_terminal,
             critic_network=critic_network, critic_optimizer=critic_optimizer,
             preprocessing=preprocessing,
@@ -246,11 +264,12 @@ class TrustRegionPolicyOptimization(TensorforceAgent):
             update = dict(unit='episodes', batch_size=batch_size, frequency=update_frequency)
         optimizer = dict(
             type='natural_gradient', learning_rate=learning_rate, cg_max_iterations=10,
-            cg_damping=1e-3
+            cg_damping=1e-3, subsampling_fraction=subsampling_fraction
         )
         optimizer = dict(
             type='optimizing_step', optimizer=optimizer, ls_max_iterations=10, ls_accept_ratio=0.9,
-            ls_mode='exponential', ls_parameter=0.5  # !!!!!!!!!!!!!
+            ls_mode='exponential', ls_parameter=0.5,  # !!!!!!!!!!!!!
+            ls_parallel=parallel_line_search
         )
         objective = dict(type='policy_gradient', ratio_based=True)
         if critic_network is None:
@@ -518,6 +518,56 @@ class Estimator(Module):
             )
             return any_overwritten, overwritten_values
 
+    def tf_episodes_reward(self, terminal, reward):
+        # Discounted-sum reward of complete episodes, equivalent to enqueue and reset per episode
+        # if the horizon is not estimated early
+        assert self.estimate_horizon != 'early'
+
+        # Constants and parameters
+        zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='long'))
+        one = tf.constant(value=1, dtype=util.tf_dtype(dtype='long'))
+        horizon = self.horizon.value()
+        discount = self.discount.value()
+
+        if util.tf_dtype(dtype='long') in (tf.int32, tf.int64):
+            num_values = tf.shape(input=terminal, out_type=util.tf_dtype(dtype='long'))[0]
+        else:
+            num_values = tf.dtypes.cast(
+                x=tf.shape(input=terminal)[0], dtype=util.tf_dtype(dtype='long')
+            )
+
+        # Episode index per timestep, rewards beyond last terminal with invalid episode index
+        is_terminal = tf.dtypes.cast(
+            x=tf.math.greater(x=terminal, y=zero), dtype=util.tf_dtype(dtype='long')
+        )
+        episodes = tf.math.cumsum(x=is_terminal, exclusive=True)
+        beyond_terminal = -tf.ones(shape=(horizon,), dtype=util.tf_dtype(dtype='long'))
+        episodes = tf.concat(values=(episodes, beyond_terminal), axis=0)
+        terminal_zeros = tf.zeros(shape=(horizon,), dtype=util.tf_dtype(dtype='float'))
+        rewards = tf.concat(values=(reward, terminal_zeros), axis=0)
+
+        # Calculate discounted sum within episodes
+        def cond(discounted_sum, horizon):
+            return tf.math.greater_equal(x=horizon, y=zero)
+
+        def body(discounted_sum, horizon):
+            is_episode = tf.math.equal(
+                x=episodes[horizon: horizon + num_values], y=episodes[:num_values]
+            )
+            discounted_sum = discount * discounted_sum
+            discounted_sum = discounted_sum + tf.where(
+                condition=is_episode, x=rewards[horizon: horizon + num_values],
+                y=tf.zeros_like(input=reward)
+            )
+            return discounted_sum, horizon - one
+
+        discounted_sum = tf.zeros(shape=(num_values,), dtype=util.tf_dtype(dtype='float'))
+        discounted_sum, _ = self.while_loop(
+            cond=cond, body=body, loop_vars=(discounted_sum, horizon), back_prop=False
+        )
+
+        return discounted_sum
+
     def tf_complete(self, baseline, memory, indices, reward):
         if self.estimate_horizon == 'late':
             assert baseline is not None
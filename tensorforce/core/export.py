@@ -0,0 +1,477 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from collections import OrderedDict
+import json
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.core.protobuf import config_pb2, rewriter_config_pb2
+
+from tensorforce import TensorforceError, util
+from tensorforce.core.distributions import Bernoulli, Beta, Categorical, Gaussian
+from tensorforce.core.layers import Activation, Conv1d, Conv2d, Dense, Dropout, Embedding, \
+    Flatten, InternalRnn, Linear, Pooling, Pool1d, Pool2d, Register, Reshape, Retrieve, \
+    TransformationBase
+from tensorforce.core.networks import AutoNetwork, LayeredNetwork
+from tensorforce.core.parameters import Constant
+from tensorforce.core.policies import ParametrizedDistributions
+
+
+def optimize_inference_graph(graph_def, input_names, output_names):
+    """
+    Prunes a frozen act graph to the minimal deterministic inference subgraph and optimizes it via
+    Grappler: non-input placeholders with default, like temperature parameters, are folded into
+    their default value, assertions and control dependencies are removed, and constant folding,
+    arithmetic simplification, layout and remapping optimizations are applied.
+
+    Args:
+        graph_def (GraphDef): Frozen act graph
+            (<span style="color:#C00000"><b>required</b></span>).
+        input_names (list[str]): Input placeholder node names, retained as inputs
+            (<span style="color:#C00000"><b>required</b></span>).
+        output_names (list[str]): Output node names
+            (<span style="color:#C00000"><b>required</b></span>).
+
+    Returns:
+        GraphDef: Optimized inference graph.
+    """
+    input_names = set(input_names)
+    input_nodes = [node for node in graph_def.node if node.name in input_names]
+
+    def prune(graph_def):
+        constants = {
+            node.name: tf.make_ndarray(node.attr['value'].tensor)
+            for node in graph_def.node if node.op == 'Const'
+        }
+
+        # Static shapes, to only fold where broadcasting does not change the shape
+        graph = tf.Graph()
+        with graph.as_default():
+            tf.graph_util.import_graph_def(graph_def=graph_def, name='')
+
+        def static_shape(name):
+            name = name if ':' in name else name + ':0'
+            return graph.get_tensor_by_name(name=name).shape
+
+        def selected_branch(node):
+            # Branch selected by constant condition, unless broadcast to another shape (SelectV2)
+            condition = constants.get(node.input[0])
+            if condition is None or condition.size != 1:
+                return None
+            branch = node.input[1] if condition.item() else node.input[2]
+            shape = static_shape(name=branch)
+            if shape.rank is None or shape.as_list() != static_shape(name=node.name).as_list():
+                return None
+            return branch
+
+        def zero_product_operand(node):
+            # Non-constant operand multiplied with zero, if the zero constant is scalar or
+            # broadcasts to the static shape of the operand
+            x, y = (name for name in node.input if not name.startswith('^'))
+            for zero, operand in ((x, y), (y, x)):
+                if zero not in constants or not (constants[zero] == 0).all():
+                    continue
+                value = constants[zero]
+                shape = static_shape(name=operand)
+                if value.ndim == 0:
+                    return operand
+                elif shape.rank is None or value.ndim > shape.rank:
+                    continue
+                dims = shape.as_list()[shape.rank - value.ndim:]
+                if all(n == 1 or n == m for n, m in zip(value.shape, dims)):
+                    return operand
+            return None
+
+        pruned = tf.compat.v1.GraphDef()
+        pruned.library.CopyFrom(graph_def.library)
+        pruned.versions.CopyFrom(graph_def.versions)
+        for node in graph_def.node:
+            if node.op == 'Assert':
+                continue
+            folded = pruned.node.add()
+            folded.name = node.name
+            if node.op == 'PlaceholderWithDefault' and node.name not in input_names:
+                # Fold parameter into its default value
+                folded.op = 'Identity'
+                folded.input.append(node.input[0])
+                folded.attr['T'].CopyFrom(node.attr['dtype'])
+            elif node.op in ('Select', 'SelectV2') and selected_branch(node=node) is not None:
+                # Constant condition, for instance deterministic or temperature zero
+                folded.op = 'Identity'
+                folded.input.append(selected_branch(node=node))
+                folded.attr['T'].CopyFrom(node.attr['T'])
+            elif node.op == 'Mul' and zero_product_operand(node=node) is not None:
+                # Multiplication with zero, for instance temperature-scaled noise
+                folded.op = 'ZerosLike'
+                folded.input.append(zero_product_operand(node=node))
+                folded.attr['T'].CopyFrom(node.attr['T'])
+            else:
+                folded.CopyFrom(node)
+                del folded.input[:]
+                folded.input.extend(x for x in node.input if not x.startswith('^'))
+        return tf.compat.v1.graph_util.extract_sub_graph(
+            graph_def=pruned, dest_nodes=output_names
+        )
+
+    def optimize(graph_def):
+        from tensorflow.python.grappler import tf_optimizer
+
+        graph = tf.Graph()
+        with graph.as_default():
+            tf.graph_util.import_graph_def(graph_def=graph_def, name='')
+            # Grappler only keeps nodes required for fetch nodes in "train_op" collection
+            for name in output_names:
+                graph.add_to_collection(name='train_op', value=graph.get_operation_by_name(name))
+            meta_graph = tf.compat.v1.train.export_meta_graph(graph=graph)
+
+        config = config_pb2.ConfigProto()
+        rewrite_options = config.graph_options.rewrite_options
+        rewrite_options.optimizers.extend(
+            ['constfold', 'arithmetic', 'layout', 'dependency', 'remap', 'pruning']
+        )
+        rewrite_options.meta_optimizer_iterations = rewriter_config_pb2.RewriterConfig.TWO
+        return tf_optimizer.OptimizeGraph(config, meta_graph)
+
+    # Grappler turns folded parameters into constants, which enables further folding, and may
+    # re-introduce control dependencies, for instance on now unused random ops
+    graph_def = prune(graph_def=graph_def)
+    graph_def = prune(graph_def=optimize(graph_def=graph_def))
+    graph_def = prune(graph_def=optimize(graph_def=graph_def))
+
+    # Retain inputs which became irrelevant, so the graph accepts the same feeds
+    remaining = {node.name for node in graph_def.node}
+    for node in input_nodes:
+        if node.name not in remaining:
+            placeholder = graph_def.node.add()
+            placeholder.name = node.name
+            placeholder.op = 'Placeholder'
+            placeholder.attr['dtype'].CopyFrom(node.attr['dtype'])
+            placeholder.attr['shape'].CopyFrom(node.attr['shape'])
+
+    return graph_def
+
+
+def convert_tflite(graph_def, input_names, output_names):
+    """
+    Converts an inference graph to a TensorFlow Lite flatbuffer, with dynamic batch dimension.
+
+    Args:
+        graph_def (GraphDef): Inference graph, as returned by `optimize_inference_graph`
+            (<span style="color:#C00000"><b>required</b></span>).
+        input_names (list[str]): Input placeholder node names
+            (<span style="color:#C00000"><b>required</b></span>).
+        output_names (list[str]): Output node names
+            (<span style="color:#C00000"><b>required</b></span>).
+
+    Returns:
+        bytes: TensorFlow Lite flatbuffer.
+    """
+    graph = tf.Graph()
+    with graph.as_default():
+        tf.graph_util.import_graph_def(graph_def=graph_def, name='')
+        with tf.compat.v1.Session(graph=graph) as session:
+            converter = tf.compat.v1.lite.TFLiteConverter.from_session(
+                sess=session,
+                input_tensors=[graph.get_tensor_by_name(name + ':0') for name in input_names],
+                output_tensors=[graph.get_tensor_by_name(name + ':0') for name in output_names]
+            )
+            return converter.convert()
+
+
+class NumpyRuntimeExporter(object):
+    """
+    Converts the deterministic act computation of a model into a list of NumPy runtime
+    operations plus weight arrays, as interpreted by
+    `tensorforce.execution.numpy_runtime.NumpyActonlyAgent`.
+
+    Args:
+        model (TensorforceModel): Initialized model
+            (<span style="color:#C00000"><b>required</b></span>).
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.operations = list()
+        self.variables = OrderedDict()
+        self.tensors = dict()
+        self.num_temporaries = 0
+
+    def export(self):
+        """
+        Returns:
+            dict[array]: Weight arrays, including the JSON-encoded runtime graph as "graph".
+        """
+        model = self.model
+
+        if not hasattr(model, 'policy'):
+            raise TensorforceError.value(
+                name='numpy-runtime export', argument='model', value=model.__class__.__name__,
+                hint='no policy'
+            )
+        if len(model.preprocessing) > 0:
+            raise TensorforceError.value(
+                name='numpy-runtime export', argument='preprocessing',
+                value=list(model.preprocessing), hint='not supported'
+            )
+
+        for name in model.states_spec:
+            self.tensors[name] = 'states/' + name
+
+        self.policy(policy=model.policy, is_baseline=False)
+        if model.baseline_policy is not model.policy:
+            # Baseline policy only contributes next internals
+            self.policy(policy=model.baseline_policy, is_baseline=True)
+
+        for name in model.internals_spec:
+            if not any(
+                operation.get('next_state') == 'next-internals/' + name
+                for operation in self.operations
+            ):
+                raise TensorforceError.unexpected()
+
+        arrays = model.monitored_session.run(fetches=self.variables)
+        arrays = OrderedDict(
+            (name, np.asarray(value, dtype=util.np_dtype(dtype='float')))
+            for name, value in arrays.items()
+        )
+        for name, internal_init in model.internals_init.items():
+            arrays['internals/' + name] = np.asarray(
+                internal_init, dtype=util.np_dtype(dtype='float')
+            )
+
+        graph = OrderedDict(
+            states=model.states_spec, actions=model.actions_spec,
+            internals=model.internals_spec, operations=self.operations
+        )
+
+        def default(obj):
+            if isinstance(obj, np.ndarray):
+                return obj.tolist()
+            else:
+                return obj.item()
+
+        arrays['graph'] = np.asarray(json.dumps(obj=graph, default=default))
+
+        return arrays
+
+    def temporary(self):
+        self.num_temporaries += 1
+        return '#{}'.format(self.num_temporaries)
+
+    def variable(self, variable):
+        name = variable.name[len(self.model.name) + 1: -2]
+        self.variables[name] = variable
+        return name
+
+    def operation(self, type, x, **kwargs):
+        y = self.temporary()
+        self.operations.append(OrderedDict(type=type, x=x, y=y, **kwargs))
+        return y
+
+    def unsupported(self, module):
+        return TensorforceError.value(
+            name='numpy-runtime export', argument=module.name, value=module.__class__.__name__,
+            hint='not supported'
+        )
+
+    def policy(self, policy, is_baseline):
+        if not isinstance(policy, ParametrizedDistributions):
+            raise self.unsupported(module=policy)
+
+        embedding = self.network(network=policy.network)
+        if is_baseline:
+            return
+
+        for name, distribution in policy.distributions.items():
+            self.distribution(name=name, distribution=distribution, x=embedding)
+
+    def network(self, network):
+        if isinstance(network, AutoNetwork):
+            for layers in network.state_specific_layers.values():
+                x = None
+                for layer in layers:
+                    x = self.layer(layer=layer, x=x)
+            for layer in network.final_layers:
+                x = self.layer(layer=layer, x=x)
+            if network.internal_rnn is not None:
+                x = self.layer(
+                    layer=network.internal_rnn, x=x, internals=(network.name + '-{}')
+                )
+
+        elif isinstance(network, LayeredNetwork):
+            x = self.tensors[next(iter(network.inputs_spec))]
+            for layer in network.modules.values():
+                x = self.layer(
+                    layer=layer, x=x, internals=('{}-{}-{{}}'.format(network.name, layer.name))
+                )
+
+        else:
+            raise self.unsupported(module=network)
+
+        return x
+
+    def layer(self, layer, x, internals=None):
+        if isinstance(layer, Retrieve):
+            xs = [x if tensor == '*' else self.tensors[tensor] for tensor in layer.tensors]
+            if len(xs) == 1:
+                return xs[0]
+            y = self.temporary()
+            self.operations.append(OrderedDict(
+                type='retrieve', xs=xs, y=y, aggregation=layer.aggregation, axis=layer.axis,
+                rank=(len(layer.output_spec['shape']) + 1)
+            ))
+            return y
+
+        elif isinstance(layer, Register):
+            self.tensors[layer.tensor] = x
+            return x
+
+        elif isinstance(layer, Linear):
+            return self.layer(layer=layer.linear, x=x)
+
+        elif isinstance(layer, Dense):
+            x = self.operation(type='dense', x=x, weights=self.variable(variable=layer.weights))
+
+        elif isinstance(layer, Conv1d):
+            x = self.operation(
+                type='conv1d', x=x, weights=self.variable(variable=layer.weights),
+                stride=layer.stride, padding=layer.padding, dilation=layer.dilation
+            )
+
+        elif isinstance(layer, Conv2d):
+            x = self.operation(
+                type='conv2d', x=x, weights=self.variable(variable=layer.weights),
+                stride=layer.stride[1:3], padding=layer.padding, dilation=layer.dilation[1:3]
+            )
+
+        elif isinstance(layer, Embedding):
+            x = self.operation(
+                type='embedding', x=x, weights=self.variable(variable=layer.weights),
+                max_norm=layer.max_norm
+            )
+
+        elif isinstance(layer, InternalRnn):
+            cell = layer.cell
+            kwargs = OrderedDict(
+                state=('internals/' + internals.format('state')),
+                next_state=('next-internals/' + internals.format('state')),
+                kernel=self.variable(variable=cell.kernel),
+                recurrent_kernel=self.variable(variable=cell.recurrent_kernel),
+                bias=(None if cell.bias is None else self.variable(variable=cell.bias)),
+                activation_type=self.keras_activation(layer=layer, function=cell.activation),
+                recurrent_activation=self.keras_activation(
+                    layer=layer, function=cell.recurrent_activation
+                )
+            )
+            if layer.cell_type == 'gru':
+                x = self.operation(type='gru', x=x, reset_after=cell.reset_after, **kwargs)
+            else:
+                x = self.operation(type='lstm', x=x, **kwargs)
+
+        elif isinstance(layer, Activation):
+            return self.operation(type='activation', x=x, nonlinearity=layer.nonlinearity)
+
+        elif isinstance(layer, Dropout):
+            # Only dropout which is never applied is supported
+            if not isinstance(layer.rate, Constant) or layer.rate.constant_value != 0.0:
+                raise self.unsupported(module=layer)
+            return x
+
+        elif isinstance(layer, Flatten):
+            return self.operation(type='flatten', x=x)
+
+        elif isinstance(layer, Pooling):
+            return self.operation(type='pooling', x=x, reduction=layer.reduction)
+
+        elif isinstance(layer, Pool1d):
+            return self.operation(
+                type='pool1d', x=x, reduction=layer.reduction, window=layer.window[2],
+                stride=layer.stride[2], padding=layer.padding
+            )
+
+        elif isinstance(layer, Pool2d):
+            return self.operation(
+                type='pool2d', x=x, reduction=layer.reduction, window=layer.window[1:3],
+                stride=layer.stride[1:3], padding=layer.padding
+            )
+
+        elif isinstance(layer, Reshape):
+            return self.operation(type='reshape', x=x, shape=layer.shape)
+
+        else:
+            raise self.unsupported(module=layer)
+
+        # TransformationBase: bias, squeeze, activation, dropout
+        assert isinstance(layer, TransformationBase)
+        if layer.bias is not None:
+            x = self.operation(type='bias_add', x=x, bias=self.variable(variable=layer.bias))
+        if layer.squeeze:
+            x = self.operation(type='squeeze', x=x)
+        if layer.activation is not None:
+            x = self.layer(layer=layer.activation, x=x)
+        if layer.dropout is not None:
+            x = self.layer(layer=layer.dropout, x=x)
+
+        return x
+
+    def keras_activation(self, layer, function):
+        name = function.__name__
+        if name not in ('linear', 'relu', 'sigmoid', 'tanh'):
+            raise TensorforceError.value(
+                name='numpy-runtime export', argument=layer.name, value=name,
+                hint='activation not supported'
+            )
+        return name
+
+    def distribution(self, name, distribution, x):
+        spec = distribution.action_spec
+        y = 'actions/' + name
+        if len(distribution.embedding_shape) == 1:
+            shape = list(spec['shape'])
+        else:
+            shape = None
+
+        if isinstance(distribution, Categorical):
+            self.operations.append(OrderedDict(
+                type='categorical', action_values=self.layer(layer=distribution.action_values, x=x),
+                states_value=(
+                    None if distribution.state_value is None else
+                    self.layer(layer=distribution.state_value, x=x)
+                ), mask=('auxiliaries/' + name + '_mask'), y=y, shape=list(spec['shape']),
+                num_values=spec['num_values']
+            ))
+
+        elif isinstance(distribution, Gaussian):
+            self.operations.append(OrderedDict(
+                type='gaussian', mean=self.layer(layer=distribution.mean, x=x), y=y, shape=shape,
+                min_value=spec.get('min_value'), max_value=spec.get('max_value')
+            ))
+
+        elif isinstance(distribution, Beta):
+            self.operations.append(OrderedDict(
+                type='beta', alpha=self.layer(layer=distribution.alpha, x=x),
+                beta=self.layer(layer=distribution.beta, x=x), y=y, shape=shape,
+                min_value=spec['min_value'], max_value=spec['max_value']
+            ))
+
+        elif isinstance(distribution, Bernoulli):
+            self.operations.append(OrderedDict(
+                type='bernoulli', logit=self.layer(layer=distribution.logit, x=x), y=y,
+                shape=shape
+            ))
+
+        else:
+            raise self.unsupported(module=distribution)
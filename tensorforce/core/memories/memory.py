@@ -45,7 +45,9 @@ class Memory(Module):
 
         self.values_spec = values_spec
 
-    def tf_enqueue(self, states, internals, actions, terminal, reward):
+    def tf_enqueue(
+        self, states, internals, auxiliaries, actions, terminal, reward, complete_episodes=False
+    ):
         raise NotImplementedError
 
     def tf_retrieve(self, indices, values=None):
@@ -115,7 +115,9 @@ class Queue(Memory):
             name='episode-count', dtype='long', shape=(), is_trainable=False, initializer='zeros'
         )
 
-    def tf_enqueue(self, states, internals, auxiliaries, actions, terminal, reward):
+    def tf_enqueue(
+        self, states, internals, auxiliaries, actions, terminal, reward, complete_episodes=False
+    ):
         zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='long'))
         one = tf.constant(value=1, dtype=util.tf_dtype(dtype='long'))
         three = tf.constant(value=3, dtype=util.tf_dtype(dtype='long'))
@@ -149,17 +151,6 @@ class Queue(Memory):
                 tf.debugging.assert_less_equal(
                     x=num_timesteps, y=capacity, message="Memory does not have enough capacity."
                 ),
-                # at most one terminal
-                tf.debugging.assert_less_equal(
-                    x=tf.math.count_nonzero(input=terminal, dtype=util.tf_dtype(dtype='long')),
-                    y=one, message="Timesteps contain more than one terminal."
-                ),
-                # if terminal, last timestep in batch
-                tf.debugging.assert_equal(
-                    x=tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero)),
-                    y=tf.math.greater(x=terminal[-1], y=zero),
-                    message="Terminal is not the last timestep."
-                ),
                 # general check: all terminal indices true
                 tf.debugging.assert_equal(
                     x=tf.reduce_all(
@@ -179,6 +170,23 @@ class Queue(Memory):
                     y=(self.episode_count + one), message="Memory consistency check."
                 )
             ]
+            if complete_episodes:
+                # last timestep is terminal
+                assertions.append(tf.debugging.assert_greater(
+                    x=terminal[-1], y=zero, message="Terminal is not the last timestep."
+                ))
+            else:
+                # at most one terminal
+                assertions.append(tf.debugging.assert_less_equal(
+                    x=tf.math.count_nonzero(input=terminal, dtype=util.tf_dtype(dtype='long')),
+                    y=one, message="Timesteps contain more than one terminal."
+                ))
+                # if terminal, last timestep in batch
+                assertions.append(tf.debugging.assert_equal(
+                    x=tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero)),
+                    y=tf.math.greater(x=terminal[-1], y=zero),
+                    message="Terminal is not the last timestep."
+                ))
 
         # Buffer indices to overwrite
         with tf.control_dependencies(control_inputs=assertions):
@@ -15,7 +15,12 @@
 
 from collections import OrderedDict
 from copy import deepcopy
+import hashlib
+import json
 import os
+import shutil
+import time
+import zipfile
 
 import h5py
 import numpy as np
@@ -23,6 +28,10 @@ import tensorflow as tf
 
 from tensorforce import TensorforceError, util
 from tensorforce.core import Module, parameter_modules
+from tensorforce.core.export import convert_tflite, NumpyRuntimeExporter, \
+    optimize_inference_graph
+from tensorforce.core.estimators import Estimator
+from tensorforce.core.memories import Queue
 from tensorforce.core.networks import Preprocessor
 
 
@@ -94,15 +103,29 @@ class Model(Module):
         if saver is None:
             self.saver_spec = None
         elif not all(
-            key in ('directory', 'filename', 'frequency', 'load', 'max-checkpoints')
-            for key in saver
+            key in (
+                'directory', 'filename', 'format', 'frequency', 'load', 'max-checkpoints',
+                'max-deltas'
+            ) for key in saver
         ):
             raise TensorforceError.value(
                 name='agent', argument='saver', value=list(saver),
-                hint='not from {directory,filename,frequency,load,max-checkpoints}'
+                hint=(
+                    'not from {directory,filename,format,frequency,load,max-checkpoints,'
+                    'max-deltas}'
+                )
             )
         elif saver.get('directory') is None:
             self.saver_spec = None
+        elif saver.get('format', 'tensorflow') not in ('tensorflow', 'delta'):
+            raise TensorforceError.value(
+                name='agent', argument='saver[format]', value=saver['format'],
+                hint='not from {tensorflow,delta}'
+            )
+        elif not isinstance(saver.get('max-deltas', 10), int) or saver.get('max-deltas', 10) < 0:
+            raise TensorforceError.value(
+                name='agent', argument='saver[max-deltas]', value=saver['max-deltas']
+            )
         else:
             self.saver_spec = dict(saver)
 
@@ -123,6 +146,18 @@ class Model(Module):
             self.summarizer_spec = dict(summarizer)
 
         self.config = None if config is None else dict(config)
+        # Checkpoint path if graph is imported from meta graph
+        self.meta_graph = None
+        self.inference_only = self.config is not None and self.config.get('inference_only', False)
+        if self.config is None or self.config.get('internals_slots') is None:
+            self.internals_slots_size = 0
+        else:
+            self.internals_slots_size = self.config['internals_slots']
+            if not isinstance(self.internals_slots_size, int) or self.internals_slots_size <= 0:
+                raise TensorforceError.value(
+                    name='agent', argument='config[internals_slots]',
+                    value=self.internals_slots_size, hint='<= 0'
+                )
 
         # States/internals/actions specifications
         self.states_spec = OrderedDict(states)
@@ -236,6 +271,33 @@ class Model(Module):
             is_trainable=False, dtype='float', min_value=0.0
         )
 
+        # Act cache for deterministic independent act, requires stateless states processing and
+        # no exploration or variable noise in independent act
+        if self.config is None or self.config.get('act_cache_size') is None:
+            self.act_cache_size = 0
+        else:
+            self.act_cache_size = self.config['act_cache_size']
+            if not isinstance(self.act_cache_size, int) or self.act_cache_size <= 0:
+                raise TensorforceError.value(
+                    name='agent', argument='config[act_cache_size]', value=self.act_cache_size,
+                    hint='<= 0'
+                )
+            if any(name in self.preprocessing for name in self.states_spec):
+                raise TensorforceError.invalid(
+                    name='agent', argument='config[act_cache_size]',
+                    condition='states preprocessing'
+                )
+            if isinstance(self.exploration, dict):
+                explorations = list(self.exploration.values())
+            else:
+                explorations = [self.exploration]
+            if any(exploration.final_value() > 0.0 for exploration in explorations) or \
+                    self.variable_noise.final_value() > 0.0:
+                raise TensorforceError.invalid(
+                    name='agent', argument='config[act_cache_size]',
+                    condition='exploration/variable_noise > 0.0'
+                )
+
         # Register global tensors
         for name, spec in self.states_spec.items():
             Module.register_tensor(name=name, spec=spec, batched=True)
@@ -253,10 +315,14 @@ class Model(Module):
         Module.register_tensor(name='episode', spec=dict(type='long', shape=()), batched=False)
         Module.register_tensor(name='update', spec=dict(type='long', shape=()), batched=False)
 
-    def initialize(self):
+    def initialize(self, meta_graph=None):
         """
         Sets up the TensorFlow model graph, starts the servers (distributed mode), creates summarizers
         and savers, initializes (and enters) the TensorFlow session.
+
+        Args:
+            meta_graph (str): TensorFlow checkpoint path, the graph is imported from the
+                corresponding meta graph instead of constructed.
         """
         tf.compat.v1.reset_default_graph()
 
@@ -284,6 +350,18 @@ class Model(Module):
                 # This is unreachable?
                 quit()
 
+        if meta_graph is not None:
+            # Import graph, rebind functions and tensors via names, variables restored by agent
+            self.import_meta_graph(path=meta_graph)
+            hooks = self.setup_hooks()
+            self.setup_session(self.server, hooks, graph_default_context)
+            if self.saver_directory is not None:
+                self.save(
+                    directory=self.saver_directory, filename=self.saver_filename,
+                    format='tensorflow', append='timesteps', no_act_pb=True
+                )
+            return
+
         super().initialize()
 
         # If we are a global model -> return here.
@@ -299,6 +377,62 @@ class Model(Module):
         else:
             saved_variables = self.global_model.get_variables(only_saved=True)
 
+        # Per-variable assignment placeholders and operations, for bulk assignment of saved
+        # variables and memory/estimator buffers in one session call
+        self.saved_variable_names = [
+            variable.name[len(self.name) + 1: -2] for variable in saved_variables
+        ]
+        assigned_variables = list(saved_variables) + [
+            variable for name, variable in self.memory_variables().items()
+            if name not in self.saved_variable_names
+        ]
+        self.bulk_assignment_input = OrderedDict()
+        self.bulk_assignments = OrderedDict()
+        with tf.name_scope(name='bulk-assignment'):
+            for variable in assigned_variables:
+                name = variable.name[len(self.name) + 1: -2]
+                self.bulk_assignment_input[name] = tf.compat.v1.placeholder(
+                    dtype=variable.dtype.base_dtype, shape=variable.shape
+                )
+                self.bulk_assignments[name] = variable.assign(
+                    value=self.bulk_assignment_input[name], read_value=False
+                )
+
+        # Memory buffer rows written since the previous delta checkpoint, given the buffer index
+        # at the time (buffer index is not taken modulo capacity), and valid terminal indices
+        self.delta_memories = OrderedDict()
+        modules = list(self.modules.values())
+        while len(modules) > 0:
+            module = modules.pop(0)
+            modules.extend(module.modules.values())
+            if not isinstance(module, Queue):
+                continue
+            with tf.name_scope(name='delta-checkpoint'):
+                previous = tf.compat.v1.placeholder(dtype=util.tf_dtype(dtype='long'), shape=())
+                capacity = tf.constant(value=module.capacity, dtype=util.tf_dtype(dtype='long'))
+                buffer_index = tf.identity(input=module.buffer_index)
+                num_rows = tf.minimum(x=(buffer_index - previous), y=capacity)
+                indices = tf.range(start=(buffer_index - num_rows), limit=buffer_index)
+                indices = tf.math.mod(x=indices, y=capacity)
+                rows = OrderedDict()
+                buffers = list(module.buffers.values())
+                while len(buffers) > 0:
+                    buffer = buffers.pop(0)
+                    if isinstance(buffer, OrderedDict):
+                        buffers.extend(buffer.values())
+                    else:
+                        name = buffer.name[len(self.name) + 1: -2]
+                        rows[name] = tf.gather(params=buffer, indices=indices)
+                terminal_indices = module.terminal_indices[:module.episode_count + 1]
+            self.delta_memories[module.buffer_index.name[len(self.name) + 1: -2]] = dict(
+                previous=previous, buffer_index=buffer_index,
+                start=tf.math.mod(x=(buffer_index - num_rows), y=capacity), rows=rows,
+                terminal_indices=(
+                    module.terminal_indices.name[len(self.name) + 1: -2], terminal_indices
+                )
+            )
+        self.delta_state = None
+
         # global_variables += [self.global_episode, self.global_timestep]
 
         # for c in self.get_savable_components():
@@ -330,6 +464,33 @@ class Model(Module):
             filename=None
         )
 
+        # Names of API function fetches and further tensors/operations, exported as part of the
+        # meta graph of TensorFlow checkpoints
+        record = OrderedDict(
+            function_fetches=self.function_fetches, output_tensors=self.output_tensors,
+            query_tensors=self.query_tensors,
+            available_summaries=sorted(self.available_summaries),
+            global_tensors=tuple(
+                util.join_scopes(self.name, name + '-output:0')
+                for name in ('global-timestep', 'global-episode', 'global-update')
+            ),
+            auxiliaries=OrderedDict(
+                (name, placeholder.name) for name, placeholder in self.auxiliaries_input.items()
+            ),
+            variables=[variable.name for variable in self.get_variables()],
+            saved_variables=self.saved_variable_names,
+            memory_variables=list(self.memory_variables()),
+            bulk_assignments=OrderedDict(
+                (name, (self.bulk_assignment_input[name].name, self.bulk_assignments[name].name))
+                for name in self.bulk_assignments
+            )
+        )
+        if self.summarizer_spec is not None:
+            record['summarizer'] = (
+                self.summarizer_init.name, self.summarizer_flush.name, self.summarizer_close.name
+            )
+        self.graph.add_to_collection(name='tensorforce', value=json.dumps(obj=record))
+
         self.setup_scaffold()
 
         # Create necessary hooks for the upcoming session.
@@ -338,12 +499,117 @@ class Model(Module):
         # We are done constructing: Finalize our graph, create and enter the session.
         self.setup_session(self.server, hooks, graph_default_context)
 
-        if self.saver_directory is not None:
+        if self.saver_directory is not None and self.saver_format == 'delta':
+            if self.saver_spec.get('load', True) and os.path.isfile(
+                os.path.join(self.saver_directory, self.saver_filename + '-delta.json')
+            ):
+                self.restore(
+                    directory=self.saver_directory, filename=self.saver_filename, format='delta'
+                )
+            self.save(directory=self.saver_directory, filename=self.saver_filename, format='delta')
+        elif self.saver_directory is not None:
             self.save(
                 directory=self.saver_directory, filename=self.saver_filename, format='tensorflow',
                 append='timesteps', no_act_pb=True
             )
 
+    def import_meta_graph(self, path):
+        """
+        Imports the meta graph of the given TensorFlow checkpoint and rebinds API functions,
+        variables and further tensors via their names, and creates the scaffold.
+
+        Args:
+            path (str): TensorFlow checkpoint path.
+        """
+        if self.saver_spec is not None and self.saver_spec.get('format') == 'delta':
+            raise TensorforceError.invalid(
+                name='Agent.load', argument='saver[format]', condition='format is meta-graph'
+            )
+
+        meta_graph_def = tf.compat.v1.MetaGraphDef()
+        with tf.io.gfile.GFile(name=(path + '.meta'), mode='rb') as filehandle:
+            meta_graph_def.ParseFromString(filehandle.read())
+        # Summary and control flow collections are not required, and not importable in some cases
+        for key in list(meta_graph_def.collection_def):
+            if key not in (
+                'tensorforce', tf.compat.v1.GraphKeys.GLOBAL_VARIABLES,
+                tf.compat.v1.GraphKeys.TRAINABLE_VARIABLES, tf.compat.v1.GraphKeys.GLOBAL_STEP
+            ):
+                del meta_graph_def.collection_def[key]
+        self.saver = tf.compat.v1.train.import_meta_graph(
+            meta_graph_or_file=meta_graph_def, clear_devices=True
+        )
+        records = self.graph.get_collection(name='tensorforce')
+        if len(records) != 1:
+            raise TensorforceError.value(
+                name='Agent.load', argument='meta_graph', value=(path + '.meta'),
+                hint='no Tensorforce record'
+            )
+        record = json.loads(records[0], object_pairs_hook=OrderedDict)
+        if (self.summarizer_spec is None) != ('summarizer' not in record):
+            raise TensorforceError.value(
+                name='Agent.load', argument='summarizer', value=self.summarizer_spec,
+                hint='inconsistent with meta graph'
+            )
+
+        self.is_initialized = True
+        self.meta_graph = path
+
+        # API functions, with tuple fetches stored as JSON lists
+        def to_tuples(xs):
+            if isinstance(xs, list):
+                return tuple(to_tuples(xs=x) for x in xs)
+            elif isinstance(xs, OrderedDict):
+                return OrderedDict((name, to_tuples(xs=x)) for name, x in xs.items())
+            else:
+                return xs
+
+        self.function_fetches = dict()
+        for function_name, fetches in record['function_fetches'].items():
+            self.function_fetches[function_name] = to_tuples(xs=fetches)
+            function = self.create_api_call(
+                name='{}.{}'.format(self.name, function_name),
+                fetches=self.function_fetches[function_name]
+            )
+            setattr(self, function_name, function)
+        self.output_tensors = dict(record['output_tensors'])
+        self.query_tensors = dict(record['query_tensors'])
+        self.available_summaries = set(record['available_summaries'])
+
+        # Tensors and operations fetched/fed by name
+        self.global_timestep, self.global_episode, self.global_update = record['global_tensors']
+        self.auxiliaries_input = record['auxiliaries']
+        if self.summarizer_spec is not None:
+            self.summarizer_init, self.summarizer_flush, self.summarizer_close = \
+                record['summarizer']
+
+        # Variables, and bulk assignment placeholders and operations
+        variables = self.graph.get_collection(name=tf.compat.v1.GraphKeys.GLOBAL_VARIABLES)
+        imported_variables = {variable.name: variable for variable in variables}
+        self.imported_variables = OrderedDict(
+            (name[len(self.name) + 1: -2], imported_variables[name]) for name in record['variables']
+        )
+        self.saved_variable_names = record['saved_variables']
+        self.imported_memory_variables = record['memory_variables']
+        self.bulk_assignment_input = OrderedDict(
+            (name, names[0]) for name, names in record['bulk_assignments'].items()
+        )
+        self.bulk_assignments = OrderedDict(
+            (name, names[1]) for name, names in record['bulk_assignments'].items()
+        )
+        self.delta_memories = None
+        self.delta_state = None
+
+        # Variables are initialized and subsequently restored from the checkpoint
+        init_op = tf.compat.v1.variables_initializer(var_list=variables)
+        if self.summarizer_spec is not None:
+            init_op = tf.group(init_op, self.graph.as_graph_element(self.summarizer_init))
+        self.scaffold = tf.compat.v1.train.Scaffold(
+            init_op=init_op,
+            ready_op=tf.compat.v1.report_uninitialized_variables(var_list=variables),
+            saver=self.saver
+        )
+
     def setup_graph(self):
         """
         Creates our Graph and figures out, which shared/global model to hook up to.
@@ -472,7 +738,8 @@ class Model(Module):
                 )
 
         def init_fn(scaffold, session):
-            if self.saver_spec is not None and self.saver_spec.get('load', True):
+            if self.saver_spec is not None and self.saver_spec.get('load', True) and \
+                    self.saver_spec.get('format', 'tensorflow') == 'tensorflow':
                 directory = self.saver_spec['directory']
                 load = self.saver_spec.get('load')
                 if isinstance(load, str):
@@ -512,8 +779,13 @@ class Model(Module):
         if self.saver_spec is not None:  # and (self.execution_type == 'single' or self.distributed_spec['task_index'] == 0):
             self.saver_directory = self.saver_spec['directory']
             self.saver_filename = self.saver_spec.get('filename', self.name)
+            self.saver_format = self.saver_spec.get('format', 'tensorflow')
             frequency = self.saver_spec.get('frequency', 600)
-            if frequency is not None:
+            self.saver_frequency = frequency
+            if self.saver_format == 'delta':
+                # Delta checkpoints triggered by agent observe
+                self.delta_saved_at = time.time()
+            elif frequency is not None:
                 hooks.append(tf.compat.v1.train.CheckpointSaverHook(
                     checkpoint_dir=self.saver_directory, save_secs=frequency, save_steps=None,
                     saver=None,  # None since given via 'scaffold' argument.
@@ -522,6 +794,8 @@ class Model(Module):
         else:
             self.saver_directory = None
             self.saver_filename = self.name
+            self.saver_format = None
+            self.saver_frequency = None
 
         # Stop at step hook
         # hooks.append(tf.compat.v1.train.StopAtStepHook(
@@ -604,7 +878,9 @@ class Model(Module):
     def close(self):
         if self.summarizer_spec is not None:
             self.monitored_session.run(fetches=self.summarizer_close)
-        if self.saver_directory is not None:
+        if self.saver_directory is not None and self.saver_format == 'delta':
+            self.save(directory=self.saver_directory, filename=self.saver_filename, format='delta')
+        elif self.saver_directory is not None:
             self.save(
                 directory=self.saver_directory, filename=self.saver_filename, format='tensorflow',
                 append='timesteps', no_act_pb=True
@@ -682,6 +958,16 @@ class Model(Module):
             default=tf.constant(value=0, dtype=util.tf_dtype(dtype='long'), shape=(1,))
         )
 
+        # Internals slots: slot index and reset flag
+        if self.internals_slots_size > 0:
+            self.slot_input = self.add_placeholder(
+                name='slot', dtype='long', shape=(), batched=True
+            )
+            self.reset_input = self.add_placeholder(
+                name='reset', dtype='bool', shape=(), batched=True,
+                default=tf.zeros_like(input=self.slot_input, dtype=util.tf_dtype(dtype='bool'))
+            )
+
         # Local timestep
         self.timestep = self.add_variable(
             name='timestep', dtype='long', shape=(self.parallel_interactions,),
@@ -700,43 +986,56 @@ class Model(Module):
             initializer='zeros', is_trainable=False
         )
 
-        # States buffer variable
-        self.states_buffer = OrderedDict()
-        for name, spec in self.states_spec.items():
-            self.states_buffer[name] = self.add_variable(
-                name=(name + '-buffer'), dtype=spec['type'],
-                shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
-                is_trainable=False, is_saved=False
-            )
+        # Internals slots variable
+        self.internals_slots = OrderedDict()
+        if self.internals_slots_size > 0:
+            for name, spec in self.internals_spec.items():
+                shape = (self.internals_slots_size,) + spec['shape']
+                initializer = np.zeros(shape=shape, dtype=util.np_dtype(dtype=spec['type']))
+                initializer[:] = self.internals_init[name]
+                self.internals_slots[name] = self.add_variable(
+                    name=(name + '-slots'), dtype=spec['type'], shape=shape, is_trainable=False,
+                    initializer=initializer, is_saved=False
+                )
 
-        # Internals buffer variable
-        self.internals_buffer = OrderedDict()
-        for name, spec in self.internals_spec.items():
-            shape = ((self.parallel_interactions, self.buffer_observe + 1) + spec['shape'])
-            initializer = np.zeros(shape=shape, dtype=util.np_dtype(dtype=spec['type']))
-            initializer[:, 0] = self.internals_init[name]
-            self.internals_buffer[name] = self.add_variable(
-                name=(name + '-buffer'), dtype=spec['type'], shape=shape, is_trainable=False,
-                initializer=initializer, is_saved=False
-            )
+        # Buffer variables, not required for inference-only independent act
+        if not self.inference_only:
+            self.states_buffer = OrderedDict()
+            for name, spec in self.states_spec.items():
+                self.states_buffer[name] = self.add_variable(
+                    name=(name + '-buffer'), dtype=spec['type'],
+                    shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
+                    is_trainable=False, is_saved=False
+                )
 
-        # Auxiliaries buffer variable
-        self.auxiliaries_buffer = OrderedDict()
-        for name, spec in self.auxiliaries_spec.items():
-            self.auxiliaries_buffer[name] = self.add_variable(
-                name=(name + '-buffer'), dtype=spec['type'],
-                shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
-                is_trainable=False, is_saved=False
-            )
+            # Internals buffer variable
+            self.internals_buffer = OrderedDict()
+            for name, spec in self.internals_spec.items():
+                shape = ((self.parallel_interactions, self.buffer_observe + 1) + spec['shape'])
+                initializer = np.zeros(shape=shape, dtype=util.np_dtype(dtype=spec['type']))
+                initializer[:, 0] = self.internals_init[name]
+                self.internals_buffer[name] = self.add_variable(
+                    name=(name + '-buffer'), dtype=spec['type'], shape=shape, is_trainable=False,
+                    initializer=initializer, is_saved=False
+                )
 
-        # Actions buffer variable
-        self.actions_buffer = OrderedDict()
-        for name, spec in self.actions_spec.items():
-            self.actions_buffer[name] = self.add_variable(
-                name=(name + '-buffer'), dtype=spec['type'],
-                shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
-                is_trainable=False, is_saved=False
-            )
+            # Auxiliaries buffer variable
+            self.auxiliaries_buffer = OrderedDict()
+            for name, spec in self.auxiliaries_spec.items():
+                self.auxiliaries_buffer[name] = self.add_variable(
+                    name=(name + '-buffer'), dtype=spec['type'],
+                    shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
+                    is_trainable=False, is_saved=False
+                )
+
+            # Actions buffer variable
+            self.actions_buffer = OrderedDict()
+            for name, spec in self.actions_spec.items():
+                self.actions_buffer[name] = self.add_variable(
+                    name=(name + '-buffer'), dtype=spec['type'],
+                    shape=((self.parallel_interactions, self.buffer_observe) + spec['shape']),
+                    is_trainable=False, is_saved=False
+                )
 
         # Buffer index
         self.buffer_index = self.add_variable(
@@ -771,6 +1070,73 @@ class Model(Module):
         internals = OrderedDict(self.internals_input)
         auxiliaries = OrderedDict(self.auxiliaries_input)
 
+        actions, internals = self.independent_core_act(
+            states=states, internals=internals, auxiliaries=auxiliaries
+        )
+
+        # Function-level identity operation for retrieval
+        for name, spec in self.actions_spec.items():
+            actions[name] = util.identity_operation(
+                x=actions[name], operation_name=(name + '-output')
+            )
+        for name, spec in self.internals_spec.items():
+            internals[name] = util.identity_operation(
+                x=internals[name], operation_name=(name + '-output')
+            )
+
+        return actions, internals
+
+    def api_slot_act(self):
+        # Inputs
+        states = OrderedDict(self.states_input)
+        auxiliaries = OrderedDict(self.auxiliaries_input)
+        slot = self.slot_input
+        reset = self.reset_input
+
+        # Retrieve internals from slots, or initial internals if reset
+        internals = OrderedDict()
+        for name, spec in self.internals_spec.items():
+            internal = tf.gather(params=self.internals_slots[name], indices=slot)
+            internal_init = tf.constant(
+                value=self.internals_init[name], dtype=util.tf_dtype(dtype=spec['type'])
+            )
+            condition = tf.reshape(tensor=reset, shape=((-1,) + tuple(1 for _ in spec['shape'])))
+            internals[name] = tf.where(condition=condition, x=internal_init, y=internal)
+
+        actions, internals = self.independent_core_act(
+            states=states, internals=internals, auxiliaries=auxiliaries
+        )
+
+        # Store next internals in slots
+        assignments = list()
+        indices = tf.expand_dims(input=slot, axis=1)
+        for name in self.internals_spec:
+            assignments.append(self.internals_slots[name].scatter_nd_update(
+                indices=indices, updates=internals[name]
+            ))
+
+        # Function-level identity operation for retrieval (plus enforce dependency)
+        with tf.control_dependencies(control_inputs=assignments):
+            for name, spec in self.actions_spec.items():
+                actions[name] = util.identity_operation(
+                    x=actions[name], operation_name=(name + '-output')
+                )
+
+        return actions
+
+    def api_slot_internals(self):
+        slot = self.slot_input
+
+        internals = OrderedDict()
+        for name in self.internals_spec:
+            internals[name] = util.identity_operation(
+                x=tf.gather(params=self.internals_slots[name], indices=slot),
+                operation_name=(name + '-output')
+            )
+
+        return internals
+
+    def independent_core_act(self, states, internals, auxiliaries):
         true = tf.constant(value=True, dtype=util.tf_dtype(dtype='bool'))
         zero_float = tf.constant(value=0.0, dtype=util.tf_dtype(dtype='float'))
 
@@ -926,17 +1292,10 @@ class Model(Module):
                 for variable, noise in zip(variables, variable_noise_tensors):
                     dependencies.append(variable.assign_sub(delta=noise, read_value=False))
 
-        # Return values
+        # Return values (plus enforce dependency)
         with tf.control_dependencies(control_inputs=dependencies):
-            # Function-level identity operation for retrieval (plus enforce dependency)
-            for name, spec in self.actions_spec.items():
-                actions[name] = util.identity_operation(
-                    x=actions[name], operation_name=(name + '-output')
-                )
-            for name, spec in self.internals_spec.items():
-                internals[name] = util.identity_operation(
-                    x=internals[name], operation_name=(name + '-output')
-                )
+            actions = util.fmap(function=util.identity_operation, xs=actions)
+            internals = util.fmap(function=util.identity_operation, xs=internals)
 
         return actions, internals
 
@@ -1450,21 +1809,62 @@ class Model(Module):
     def tf_regularize(self, states, internals, auxiliaries):
         return super().tf_regularize()
 
+    def get_variables(self, only_trainable=False, only_saved=False):
+        if self.meta_graph is None:
+            return super().get_variables(only_trainable=only_trainable, only_saved=only_saved)
+        elif only_saved:
+            return [self.imported_variables[name] for name in self.saved_variable_names]
+        elif only_trainable:
+            return [variable for variable in self.imported_variables.values() if variable.trainable]
+        else:
+            return list(self.imported_variables.values())
+
     def get_variable(self, variable):
         if not variable.startswith(self.name):
             variable = util.join_scopes(self.name, variable)
         fetches = variable + '-output:0'
         return self.monitored_session.run(fetches=fetches)
 
+    def get_variables_values(self, variables=None):
+        # Values of all saved variables, or the given variables, in one session call
+        if variables is None:
+            variables = list(self.saved_variable_names)
+        fetches = list()
+        for variable in variables:
+            if not variable.startswith(self.name):
+                variable = util.join_scopes(self.name, variable)
+            fetches.append(variable + '-output:0')
+        values = self.monitored_session.run(fetches=fetches)
+        return OrderedDict(zip(variables, values))
+
+    def assign_variables(self, values):
+        # Assigns values to the given saved variables or buffers in one session call
+        fetches = list()
+        feed_dict = dict()
+        for variable, value in values.items():
+            if variable.startswith(self.name + '/'):
+                variable = variable[len(self.name) + 1:]
+            if variable not in self.bulk_assignments:
+                raise TensorforceError.value(
+                    name='agent.assign_variables', argument='variable', value=variable,
+                    hint='not saved variable or buffer'
+                )
+            fetches.append(self.bulk_assignments[variable])
+            feed_dict[self.bulk_assignment_input[variable]] = value
+        self.monitored_session.run(fetches=fetches, feed_dict=feed_dict)
+
     def assign_variable(self, variable, value):
         if variable.startswith(self.name + '/'):
             variable = variable[len(self.name) + 1:]
-        module = self
-        scope = variable.split('/')
-        for _ in range(len(scope) - 1):
-            module = module.modules[scope.pop(0)]
+        if self.meta_graph is None:
+            module = self
+            scope = variable.split('/')
+            for _ in range(len(scope) - 1):
+                module = module.modules[scope.pop(0)]
+            dtype = util.dtype(x=module.variables[scope[0]])
+        else:
+            dtype = util.dtype(x=self.imported_variables[variable])
         fetches = util.join_scopes(self.name, variable) + '-assign'
-        dtype = util.dtype(x=module.variables[scope[0]])
         feed_dict = {util.join_scopes(self.name, 'assignment-') + dtype + '-input:0': value}
         self.monitored_session.run(fetches=fetches, feed_dict=feed_dict)
 
@@ -1475,7 +1875,49 @@ class Model(Module):
             feed_dict[util.join_scopes(self.name, 'summarize-step-input:0')] = step
         self.monitored_session.run(fetches=fetches, feed_dict=feed_dict)
 
-    def save(self, directory, filename, format, append=None, no_act_pb=False):
+    def act_input_names(self):
+        input_names = [
+            util.join_scopes(self.name, name + '-input') for name in self.states_spec
+        ]
+        input_names.extend(
+            util.join_scopes(self.name, name + '-input') for name in self.auxiliaries_input
+        )
+        input_names.extend(
+            util.join_scopes(self.name, name + '-input') for name in self.internals_spec
+        )
+        return input_names
+
+    def act_output_names(self):
+        return [
+            self.name + '.independent_act/' + name + '-output'
+            for name in self.output_tensors['independent_act']
+        ]
+
+    def act_graph_def(self):
+        graph_def = self.graph.as_graph_def()
+
+        # freeze_graph clear_devices option
+        for node in graph_def.node:
+            node.device = ''
+
+        library = graph_def.library
+        versions = graph_def.versions
+        graph_def = tf.compat.v1.graph_util.remove_training_nodes(input_graph=graph_def)
+        # remove_training_nodes drops function library, required by control flow like RNN loops
+        graph_def.library.CopyFrom(library)
+        graph_def.versions.CopyFrom(versions)
+        # implies tf.compat.v1.graph_util.extract_sub_graph
+        return tf.compat.v1.graph_util.convert_variables_to_constants(
+            sess=self.monitored_session, input_graph_def=graph_def,
+            output_node_names=self.act_output_names()
+        )
+
+    def save(self, directory, filename, format, append=None, no_act_pb=False, compression=None):
+        # Delta checkpoints and NumPy-only runtime require the Python graph construction
+        if self.meta_graph is not None and format in ('delta', 'numpy-runtime'):
+            raise TensorforceError.invalid(
+                name='agent.save', argument='format', condition='agent loaded from meta graph'
+            )
         path = os.path.join(directory, filename)
 
         if append == 'timesteps':
@@ -1499,22 +1941,7 @@ class Model(Module):
             path = saver_path
 
             if not no_act_pb:
-                graph_def = self.graph.as_graph_def()
-
-                # freeze_graph clear_devices option
-                for node in graph_def.node:
-                    node.device = ''
-
-                graph_def = tf.compat.v1.graph_util.remove_training_nodes(input_graph=graph_def)
-                output_node_names = [
-                    self.name + '.independent_act/' + name + '-output'
-                    for name in self.output_tensors['independent_act']
-                ]
-                # implies tf.compat.v1.graph_util.extract_sub_graph
-                graph_def = tf.compat.v1.graph_util.convert_variables_to_constants(
-                    sess=self.monitored_session, input_graph_def=graph_def,
-                    output_node_names=output_node_names
-                )
+                graph_def = self.act_graph_def()
                 graph_path = tf.io.write_graph(
                     graph_or_graph_def=graph_def, logdir=directory,
                     name=(os.path.split(path)[1] + '.pb'), as_text=False
@@ -1526,38 +1953,332 @@ class Model(Module):
                 append = self.monitored_session.run(fetches=append)
                 path += '-' + str(append)
             path += '.npz'
-            variables = dict()
-            for variable in self.get_variables(only_saved=True):
-                name = variable.name[len(self.name) + 1: -2]
-                variables[name] = self.get_variable(variable=name)
-            np.savez(file=path, **variables)
+            os.makedirs(directory, exist_ok=True)
+            np.savez(file=path, **self.get_variables_values())
 
         elif format == 'hdf5':
             if append is not None:
                 append = self.monitored_session.run(fetches=append)
                 path += '-' + str(append)
             path += '.hdf5'
+            os.makedirs(directory, exist_ok=True)
             with h5py.File(name=path, mode='w') as filehandle:
-                for variable in self.get_variables(only_saved=True):
-                    name = variable.name[len(self.name) + 1: -2]
-                    filehandle.create_dataset(name=name, data=self.get_variable(variable=name))
+                for name, value in self.get_variables_values().items():
+                    Model.create_hdf5_dataset(
+                        filehandle=filehandle, name=name, value=value, compression=compression
+                    )
+
+        elif format == 'delta':
+            assert append is None
+            path = self.save_delta(directory=directory, filename=filename)
+
+        elif format == 'pb-inference':
+            if append is not None:
+                append = self.monitored_session.run(fetches=append)
+                path += '-' + str(append)
+            path += '-inference.pb'
+            graph_def = optimize_inference_graph(
+                graph_def=self.act_graph_def(), input_names=self.act_input_names(),
+                output_names=self.act_output_names()
+            )
+            graph_path = tf.io.write_graph(
+                graph_or_graph_def=graph_def, logdir=directory, name=os.path.split(path)[1],
+                as_text=False
+            )
+            assert graph_path == path
+
+        elif format == 'tflite':
+            if append is not None:
+                append = self.monitored_session.run(fetches=append)
+                path += '-' + str(append)
+            path += '.tflite'
+            input_names = self.act_input_names()
+            output_names = self.act_output_names()
+            graph_def = optimize_inference_graph(
+                graph_def=self.act_graph_def(), input_names=input_names, output_names=output_names
+            )
+            flatbuffer = convert_tflite(
+                graph_def=graph_def, input_names=input_names, output_names=output_names
+            )
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'wb') as filehandle:
+                filehandle.write(flatbuffer)
+
+        elif format == 'numpy-runtime':
+            if append is not None:
+                append = self.monitored_session.run(fetches=append)
+                path += '-' + str(append)
+            path += '.runtime'
+            arrays = NumpyRuntimeExporter(model=self).export()
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'wb') as filehandle:
+                np.savez(filehandle, **arrays)
+            # NumPy-only runtime module, importable without TensorFlow/Tensorforce
+            shutil.copyfile(
+                src=os.path.join(os.path.dirname(util.__file__), 'execution', 'numpy_runtime.py'),
+                dst=os.path.join(directory, 'numpy_runtime.py')
+            )
 
         else:
             assert False
 
         return path
 
+    def save_delta(self, directory, filename):
+        # Chain of a full base snapshot followed by deltas, listed in "[filename]-delta.json"
+        manifest_path = os.path.join(directory, filename + '-delta.json')
+        if self.saver_spec is None:
+            max_deltas = 10
+        else:
+            max_deltas = self.saver_spec.get('max-deltas', 10)
+        state = self.delta_state
+        is_base = (
+            state is None or state['directory'] != directory or state['filename'] != filename or
+            len(state['deltas']) >= max_deltas
+        )
+        number = 0 if state is None else state['number'] + 1
+        path = os.path.join(directory, '{}-delta-{}.delta'.format(filename, number))
+
+        if is_base:
+            variables = self.get_variables_values()
+            self.write_snapshot(path=path, format='numpy', variables=variables)
+            previous = state
+            state = self.delta_chain_state(variables=variables)
+            state.update(directory=directory, filename=filename, base=os.path.split(path)[1])
+
+        else:
+            # Changed variables and memory rows, in one session call
+            names = list(state['hashes'])
+            fetches = dict(
+                variables=[util.join_scopes(self.name, name) + '-output:0' for name in names],
+                memories=OrderedDict((name, (
+                    memory['buffer_index'], memory['start'], memory['rows'],
+                    memory['terminal_indices'][1]
+                )) for name, memory in self.delta_memories.items())
+            )
+            feed_dict = {
+                memory['previous']: state['buffer_indices'][name]
+                for name, memory in self.delta_memories.items()
+            }
+            fetched = self.monitored_session.run(fetches=fetches, feed_dict=feed_dict)
+
+            variables = OrderedDict()
+            for name, value in zip(names, fetched['variables']):
+                digest = Model.delta_digest(value=value)
+                if digest != state['hashes'][name]:
+                    variables[name] = value
+                    state['hashes'][name] = digest
+            for name, (buffer_index, start, rows, terminal_indices) in fetched['memories'].items():
+                memory = self.delta_memories[name]
+                if buffer_index > state['buffer_indices'][name]:
+                    for buffer_name, buffer_rows in rows.items():
+                        variables[buffer_name + ':rows'] = buffer_rows
+                        variables[buffer_name + ':start'] = start
+                variables[memory['terminal_indices'][0] + ':prefix'] = terminal_indices
+                state['buffer_indices'][name] = int(buffer_index)
+            self.write_snapshot(path=path, format='numpy', variables=variables)
+            state['deltas'].append(os.path.split(path)[1])
+            previous = None
+
+        state['number'] = number
+        manifest = OrderedDict(base=state['base'], deltas=state['deltas'])
+        temp_path = os.path.join(directory, '.' + filename + '-delta.json.tmp')
+        with open(temp_path, 'w') as filehandle:
+            json.dump(obj=manifest, fp=filehandle)
+            filehandle.flush()
+            os.fsync(filehandle.fileno())
+        os.replace(temp_path, manifest_path)
+        self.delta_state = state
+        self.delta_saved_at = time.time()
+
+        # Remove compacted chain
+        if previous is not None and previous['directory'] == directory and \
+                previous['filename'] == filename:
+            for chain_filename in [previous['base']] + previous['deltas']:
+                os.remove(os.path.join(directory, chain_filename))
+
+        return path
+
+    def restore_delta(self, directory, filename):
+        # Replays the chain of deltas on the base snapshot, then assigns all variables at once
+        with open(os.path.join(directory, filename + '-delta.json'), 'r') as filehandle:
+            manifest = json.load(fp=filehandle)
+
+        with np.load(file=os.path.join(directory, manifest['base'])) as base:
+            variables = OrderedDict((name, base[name]) for name in self.saved_variable_names)
+        for delta_filename in manifest['deltas']:
+            with np.load(file=os.path.join(directory, delta_filename)) as delta:
+                for key in delta.files:
+                    if key.endswith(':rows'):
+                        name = key[:-5]
+                        rows = delta[key]
+                        capacity = variables[name].shape[0]
+                        indices = int(delta[name + ':start']) + np.arange(rows.shape[0])
+                        indices = np.mod(indices, capacity)
+                        variables[name][indices] = rows
+                    elif key.endswith(':prefix'):
+                        name = key[:-7]
+                        prefix = delta[key]
+                        variables[name][:prefix.shape[0]] = prefix
+                    elif not key.endswith(':start'):
+                        variables[key] = delta[key]
+        self.assign_variables(values=variables)
+
+        # Continue chain, compacted by next delta checkpoint if too long
+        state = self.delta_chain_state(variables=variables)
+        state.update(
+            directory=directory, filename=filename, base=manifest['base'],
+            deltas=list(manifest['deltas']),
+            number=max(
+                int(chain_filename[len(filename) + 7: -6])
+                for chain_filename in [manifest['base']] + manifest['deltas']
+            )
+        )
+        self.delta_state = state
+
+    def delta_chain_state(self, variables):
+        # Digests of regular variables and buffer indices of memories at the time of the snapshot
+        memory_variables = set()
+        buffer_indices = OrderedDict()
+        for name, memory in self.delta_memories.items():
+            memory_variables.update(memory['rows'])
+            memory_variables.add(memory['terminal_indices'][0])
+            buffer_indices[name] = int(variables[name])
+        hashes = OrderedDict(
+            (name, Model.delta_digest(value=value)) for name, value in variables.items()
+            if name not in memory_variables
+        )
+        return dict(hashes=hashes, buffer_indices=buffer_indices, deltas=list())
+
+    @staticmethod
+    def delta_digest(value):
+        return hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).digest()
+
+    def save_snapshot(self, directory, filename, format, append=None):
+        # Consistent in-memory copy of saved variables (and append value) in one session call
+        assert format in ('numpy', 'hdf5')
+        path = os.path.join(directory, filename)
+
+        if append == 'timesteps':
+            append = self.global_timestep
+        elif append == 'episodes':
+            append = self.global_episode
+        elif append == 'updates':
+            append = self.global_update
+        else:
+            assert append is None
+
+        names = list()
+        fetches = dict(variables=list())
+        for variable in self.get_variables(only_saved=True):
+            names.append(variable.name[len(self.name) + 1: -2])
+            fetches['variables'].append(variable)
+        if append is not None:
+            fetches['append'] = append
+        fetched = self.monitored_session.run(fetches=fetches)
+
+        if append is not None:
+            path += '-' + str(fetched['append'])
+        if format == 'numpy':
+            path += '.npz'
+        else:
+            path += '.hdf5'
+
+        return path, OrderedDict(zip(names, fetched['variables']))
+
+    @staticmethod
+    def write_snapshot(path, format, variables, compression=None, progress=None):
+        # Written to temporary file, synced to disk and atomically renamed to avoid partial
+        # checkpoints
+        directory, filename = os.path.split(path)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, '.' + filename + '.tmp')
+
+        try:
+            with open(temp_path, 'wb') as filehandle:
+                if format == 'numpy':
+                    # Equivalent to np.savez, but written variable by variable
+                    with zipfile.ZipFile(
+                        file=filehandle, mode='w', compression=zipfile.ZIP_STORED,
+                        allowZip64=True
+                    ) as archive:
+                        for n, (name, value) in enumerate(variables.items()):
+                            with archive.open(
+                                name=(name + '.npy'), mode='w', force_zip64=True
+                            ) as npy:
+                                np.lib.format.write_array(fp=npy, array=value)
+                            if progress is not None:
+                                progress((n + 1) / len(variables))
+
+                elif format == 'hdf5':
+                    with h5py.File(name=filehandle, mode='w') as h5file:
+                        for n, (name, value) in enumerate(variables.items()):
+                            Model.create_hdf5_dataset(
+                                filehandle=h5file, name=name, value=value,
+                                compression=compression
+                            )
+                            if progress is not None:
+                                progress((n + 1) / len(variables))
+
+                else:
+                    assert False
+
+                filehandle.flush()
+                os.fsync(filehandle.fileno())
+
+            os.replace(temp_path, path)
+
+        except BaseException:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # Persist rename
+        Model.sync_directory(directory=directory)
+
+    @staticmethod
+    def sync_directory(directory):
+        # Persists renames within the directory, where supported
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def create_hdf5_dataset(filehandle, name, value, compression=None):
+        # Chunked and optionally compressed, except for scalars which cannot be chunked
+        value = np.asarray(value)
+        if value.ndim == 0:
+            filehandle.create_dataset(name=name, data=value)
+        else:
+            filehandle.create_dataset(
+                name=name, data=value, chunks=True, compression=compression, shuffle=(
+                    compression is not None and value.dtype.kind in 'iuf'
+                )
+            )
+
     def restore(self, directory, filename, format):
+        if self.meta_graph is not None and format == 'delta':
+            raise TensorforceError.invalid(
+                name='agent.restore', argument='format', condition='agent loaded from meta graph'
+            )
         path = os.path.join(directory, filename)
 
         if format == 'tensorflow':
             self.saver.restore(sess=self.session, save_path=path)
 
         elif format == 'numpy':
-            variables = np.load(file=(path + '.npz'))
-            for variable in self.get_variables(only_saved=True):
-                name = variable.name[len(self.name) + 1: -2]
-                self.assign_variable(variable=name, value=variables[name])
+            with np.load(file=(path + '.npz')) as variables:
+                self.assign_variables(
+                    values=OrderedDict(
+                        (name, variables[name]) for name in self.saved_variable_names
+                    )
+                )
+
+        elif format == 'delta':
+            self.restore_delta(directory=directory, filename=filename)
 
         elif format == 'hdf5':
             if os.path.isfile(path + '.hdf5'):
@@ -1565,12 +2286,87 @@ class Model(Module):
             else:
                 path = path + '.h5'
             with h5py.File(name=path, mode='r') as filehandle:
-                for variable in self.get_variables(only_saved=True):
-                    name = variable.name[len(self.name) + 1: -2]
-                    self.assign_variable(variable=name, value=filehandle[name])
+                self.assign_variables(values=OrderedDict(
+                    (name, filehandle[name][()]) for name in self.saved_variable_names
+                ))
 
         else:
             assert False
 
         fetches = (self.global_timestep, self.global_episode, self.global_update)
         return self.monitored_session.run(fetches=fetches)
+
+    def memory_variables(self):
+        # Buffer variables of memories and reward estimators, including indices and counts
+        if self.meta_graph is not None:
+            return OrderedDict(
+                (name, self.imported_variables[name]) for name in self.imported_memory_variables
+            )
+        variables = OrderedDict()
+        modules = list(self.modules.values())
+        while len(modules) > 0:
+            module = modules.pop(0)
+            modules.extend(module.modules.values())
+            if isinstance(module, (Estimator, Queue)):
+                for variable in module.variables.values():
+                    variables[variable.name[len(self.name) + 1: -2]] = variable
+        return variables
+
+    def save_memory(self, directory):
+        # One raw .npy file per variable, listed in "memory.json"
+        variables = self.memory_variables()
+        if len(variables) == 0:
+            raise TensorforceError(message="Agent.save_memory requires memory.")
+        values = self.monitored_session.run(fetches=list(variables.values()))
+
+        os.makedirs(directory, exist_ok=True)
+        spec = OrderedDict()
+        for name, value in zip(variables, values):
+            filename = name.replace('/', '.') + '.npy'
+            temp_path = os.path.join(directory, '.' + filename + '.tmp')
+            with open(temp_path, 'wb') as filehandle:
+                np.lib.format.write_array(
+                    fp=filehandle, array=np.require(value, requirements='C'), allow_pickle=False
+                )
+                filehandle.flush()
+                os.fsync(filehandle.fileno())
+            os.replace(temp_path, os.path.join(directory, filename))
+            spec[name] = OrderedDict(
+                filename=filename, dtype=value.dtype.str, shape=list(value.shape)
+            )
+
+        temp_path = os.path.join(directory, '.memory.json.tmp')
+        with open(temp_path, 'w') as filehandle:
+            json.dump(obj=spec, fp=filehandle)
+            filehandle.flush()
+            os.fsync(filehandle.fileno())
+        os.replace(temp_path, os.path.join(directory, 'memory.json'))
+        Model.sync_directory(directory=directory)
+
+    def load_memory(self, directory, mmap=True):
+        with open(os.path.join(directory, 'memory.json'), 'r') as filehandle:
+            spec = json.load(fp=filehandle)
+
+        variables = self.memory_variables()
+        if list(spec) != list(variables):
+            raise TensorforceError.value(
+                name='agent.load_memory', argument='variables', value=list(spec),
+                hint='incompatible with agent memory'
+            )
+
+        # Memory-mapped arrays are read directly by the assignment in one session call
+        values = OrderedDict()
+        for name, variable in variables.items():
+            # Scalars not memory-mapped
+            value = np.load(
+                file=os.path.join(directory, spec[name]['filename']),
+                mmap_mode=('r' if mmap and len(spec[name]['shape']) > 0 else None),
+                allow_pickle=False
+            )
+            if value.shape != tuple(variable.shape.as_list()):
+                raise TensorforceError.value(
+                    name='agent.load_memory', argument=name, value=value.shape,
+                    hint='incompatible shape'
+                )
+            values[name] = value
+        self.assign_variables(values=values)
@@ -19,6 +19,7 @@ import tensorflow as tf
 
 from tensorforce import TensorforceError, util
 from tensorforce.core import memory_modules, Module, optimizer_modules, parameter_modules
+from tensorforce.core.distributions import Distribution
 from tensorforce.core.estimators import Estimator
 from tensorforce.core.models import Model
 from tensorforce.core.networks import Preprocessor
@@ -103,6 +104,12 @@ class TensorforceModel(Model):
             name='policy', module=policy, modules=policy_modules, states_spec=self.states_spec,
             actions_spec=self.actions_spec
         )
+        # States/actions values functions only if supported by all action distributions
+        self.has_values = hasattr(self.policy, 'distributions') and all(
+            type(distribution).tf_states_value is not Distribution.tf_states_value and
+            type(distribution).tf_action_value is not Distribution.tf_action_value
+            for distribution in self.policy.distributions.values()
+        )
 
         # Update mode
         if not all(key in ('batch_size', 'frequency', 'start', 'unit') for key in update):
@@ -140,10 +147,13 @@ class TensorforceModel(Model):
                 is_trainable=False, dtype='long', min_value=0
             )
 
-        # Optimizer
-        self.optimizer = self.add_module(
-            name='optimizer', module=optimizer, modules=optimizer_modules, is_trainable=False
-        )
+        # Optimizer (not required if inference-only)
+        if self.inference_only:
+            self.optimizer = None
+        else:
+            self.optimizer = self.add_module(
+                name='optimizer', module=optimizer, modules=optimizer_modules, is_trainable=False
+            )
 
         # Objective
         self.objective = self.add_module(
@@ -233,38 +243,44 @@ class TensorforceModel(Model):
             estimate_advantage = True
         else:
             estimate_advantage = False
-        self.estimator = self.add_module(
-            name='estimator', module=Estimator, is_trainable=False, is_saved=False,
-            values_spec=self.values_spec, horizon=reward_estimation['horizon'],
-            discount=reward_estimation.get('discount', 1.0),
-            estimate_horizon=reward_estimation.get('estimate_horizon', estimate_horizon),
-            estimate_actions=reward_estimation.get('estimate_actions', False),
-            estimate_terminal=reward_estimation.get('estimate_terminal', False),
-            estimate_advantage=reward_estimation.get('estimate_advantage', estimate_advantage),
-            # capacity=reward_estimation['capacity']
-            min_capacity=self.buffer_observe,
-            max_past_horizon=self.baseline_policy.max_past_horizon(is_optimization=False)
-        )
+        if self.inference_only:
+            # Estimator and memory not required if inference-only
+            self.estimator = None
+            self.memory = None
 
-        # Memory
-        if self.update_unit == 'timesteps':
-            policy_horizon = self.policy.max_past_horizon(is_optimization=True)
-            baseline_horizon = self.baseline_policy.max_past_horizon(is_optimization=True) - \
-                self.estimator.min_future_horizon()
-            min_capacity = self.update_batch_size.max_value() + 1 + \
-                self.estimator.max_future_horizon() + max(policy_horizon, baseline_horizon)
-        elif self.update_unit == 'episodes':
-            if max_episode_timesteps is None:
-                min_capacity = 0
-            else:
-                min_capacity = (self.update_batch_size.max_value() + 1) * max_episode_timesteps
         else:
-            assert False
+            self.estimator = self.add_module(
+                name='estimator', module=Estimator, is_trainable=False, is_saved=False,
+                values_spec=self.values_spec, horizon=reward_estimation['horizon'],
+                discount=reward_estimation.get('discount', 1.0),
+                estimate_horizon=reward_estimation.get('estimate_horizon', estimate_horizon),
+                estimate_actions=reward_estimation.get('estimate_actions', False),
+                estimate_terminal=reward_estimation.get('estimate_terminal', False),
+                estimate_advantage=reward_estimation.get('estimate_advantage', estimate_advantage),
+                # capacity=reward_estimation['capacity']
+                min_capacity=self.buffer_observe,
+                max_past_horizon=self.baseline_policy.max_past_horizon(is_optimization=False)
+            )
 
-        self.memory = self.add_module(
-            name='memory', module=memory, modules=memory_modules, is_trainable=False,
-            values_spec=self.values_spec, min_capacity=min_capacity
-        )
+            # Memory
+            if self.update_unit == 'timesteps':
+                policy_horizon = self.policy.max_past_horizon(is_optimization=True)
+                baseline_horizon = self.baseline_policy.max_past_horizon(is_optimization=True) - \
+                    self.estimator.min_future_horizon()
+                min_capacity = self.update_batch_size.max_value() + 1 + \
+                    self.estimator.max_future_horizon() + max(policy_horizon, baseline_horizon)
+            elif self.update_unit == 'episodes':
+                if max_episode_timesteps is None:
+                    min_capacity = 0
+                else:
+                    min_capacity = (self.update_batch_size.max_value() + 1) * max_episode_timesteps
+            else:
+                assert False
+
+            self.memory = self.add_module(
+                name='memory', module=memory, modules=memory_modules, is_trainable=False,
+                values_spec=self.values_spec, min_capacity=min_capacity
+            )
 
         # Entropy regularization
         entropy_regularization = 0.0 if entropy_regularization is None else entropy_regularization
@@ -304,6 +320,12 @@ class TensorforceModel(Model):
         )
 
     def api_experience(self):
+        return self.experience_function(complete_episodes=False)
+
+    def api_experience_episodes(self):
+        return self.experience_function(complete_episodes=True)
+
+    def experience_function(self, complete_episodes):
         # Inputs
         states = OrderedDict(self.states_input)
         internals = OrderedDict(self.internals_input)
@@ -345,18 +367,30 @@ class TensorforceModel(Model):
             y=tf.constant(value=0, dtype=util.tf_dtype(dtype='long')),
             message="Agent.experience: cannot be called mid-episode."
         ))
-        # at most one terminal
-        assertions.append(tf.debugging.assert_less_equal(
-            x=tf.math.count_nonzero(input=terminal, dtype=util.tf_dtype(dtype='long')),
-            y=tf.constant(value=1, dtype=util.tf_dtype(dtype='long')),
-            message="Agent.experience: input contains more than one terminal."
-        ))
-        # if terminal, last timestep in batch
-        assertions.append(tf.debugging.assert_equal(
-            x=tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero)),
-            y=tf.math.greater(x=terminal[-1], y=zero),
-            message="Agent.experience: terminal is not the last input timestep."
-        ))
+        if complete_episodes:
+            # estimator buffer index is zero
+            assertions.append(tf.debugging.assert_equal(
+                x=self.estimator.buffer_index, y=zero,
+                message="Agent.experience: cannot be called mid-episode."
+            ))
+            # last timestep in batch is terminal
+            assertions.append(tf.debugging.assert_greater(
+                x=terminal[-1], y=zero,
+                message="Agent.experience: terminal is not the last input timestep."
+            ))
+        else:
+            # at most one terminal
+            assertions.append(tf.debugging.assert_less_equal(
+                x=tf.math.count_nonzero(input=terminal, dtype=util.tf_dtype(dtype='long')),
+                y=tf.constant(value=1, dtype=util.tf_dtype(dtype='long')),
+                message="Agent.experience: input contains more than one terminal."
+            ))
+            # if terminal, last timestep in batch
+            assertions.append(tf.debugging.assert_equal(
+                x=tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero)),
+                y=tf.math.greater(x=terminal[-1], y=zero),
+                message="Agent.experience: terminal is not the last input timestep."
+            ))
         # states: type and shape
         for name, spec in self.states_spec.items():
             spec = self.unprocessed_state_spec.get(name, spec)
@@ -451,10 +485,16 @@ class TensorforceModel(Model):
                 reward = self.preprocessing['reward'].apply(x=reward)
 
             # Core experience: retrieve experience operation
-            experienced = self.core_experience(
-                states=states, internals=internals, auxiliaries=auxiliaries, actions=actions,
-                terminal=terminal, reward=reward
-            )
+            if complete_episodes:
+                experienced = self.core_experience_episodes(
+                    states=states, internals=internals, auxiliaries=auxiliaries, actions=actions,
+                    terminal=terminal, reward=reward
+                )
+            else:
+                experienced = self.core_experience(
+                    states=states, internals=internals, auxiliaries=auxiliaries, actions=actions,
+                    terminal=terminal, reward=reward
+                )
 
         with tf.control_dependencies(control_inputs=(experienced,)):
             # Function-level identity operation for retrieval (plus enforce dependency)
@@ -495,6 +535,77 @@ class TensorforceModel(Model):
 
         return timestep, episode, update
 
+    def api_states_values(self):
+        # Inputs
+        states = OrderedDict(self.states_input)
+        internals = OrderedDict(self.internals_input)
+        auxiliaries = OrderedDict(self.auxiliaries_input)
+
+        states_values = self.core_values(
+            states=states, internals=internals, auxiliaries=auxiliaries
+        )
+
+        # Function-level identity operation for retrieval
+        for name in self.actions_spec:
+            states_values[name] = util.identity_operation(
+                x=states_values[name], operation_name=(name + '-output')
+            )
+
+        return states_values
+
+    def api_actions_values(self):
+        # Inputs
+        states = OrderedDict(self.states_input)
+        internals = OrderedDict(self.internals_input)
+        auxiliaries = OrderedDict(self.auxiliaries_input)
+        actions = OrderedDict(self.actions_input)
+
+        actions_values = self.core_values(
+            states=states, internals=internals, auxiliaries=auxiliaries, actions=actions
+        )
+
+        # Function-level identity operation for retrieval
+        for name in self.actions_spec:
+            actions_values[name] = util.identity_operation(
+                x=actions_values[name], operation_name=(name + '-output')
+            )
+
+        return actions_values
+
+    def tf_core_values(self, states, internals, auxiliaries, actions=None):
+        # Set global tensors
+        Module.update_tensors(
+            independent=tf.constant(value=True, dtype=util.tf_dtype(dtype='bool')),
+            deterministic=tf.constant(value=True, dtype=util.tf_dtype(dtype='bool')),
+            timestep=self.global_timestep, episode=self.global_episode, update=self.global_update
+        )
+
+        # Preprocessing states
+        for name in self.states_spec:
+            if name in self.preprocessing:
+                states[name] = self.preprocessing[name].apply(x=states[name])
+
+        # Every state is its own dependency sequence, as for act
+        some_state = next(iter(states.values()))
+        if util.tf_dtype(dtype='long') in (tf.int32, tf.int64):
+            batch_size = tf.shape(input=some_state, out_type=util.tf_dtype(dtype='long'))[0]
+        else:
+            batch_size = tf.dtypes.cast(
+                x=tf.shape(input=some_state)[0], dtype=util.tf_dtype(dtype='long')
+            )
+        starts = tf.range(start=batch_size, dtype=util.tf_dtype(dtype='long'))
+        lengths = tf.ones(shape=(batch_size,), dtype=util.tf_dtype(dtype='long'))
+        Module.update_tensors(dependency_starts=starts, dependency_lengths=lengths)
+
+        if actions is None:
+            return self.policy.states_values(
+                states=states, internals=internals, auxiliaries=auxiliaries
+            )
+        else:
+            return self.policy.actions_values(
+                states=states, internals=internals, auxiliaries=auxiliaries, actions=actions
+            )
+
     def tf_core_act(self, states, internals, auxiliaries):
         zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='long'))
 
@@ -637,6 +748,17 @@ class TensorforceModel(Model):
 
         return stored
 
+    def tf_core_experience_episodes(
+        self, states, internals, auxiliaries, actions, terminal, reward
+    ):
+        # Discounted-sum reward of all episodes, and one memory enqueue
+        reward = self.estimator.episodes_reward(terminal=terminal, reward=reward)
+
+        return self.memory.enqueue(
+            states=states, internals=internals, auxiliaries=auxiliaries, actions=actions,
+            terminal=terminal, reward=reward, complete_episodes=True
+        )
+
     def tf_core_update(self):
         Module.update_tensor(name='update', tensor=self.global_update)
 
@@ -738,15 +860,31 @@ class TensorforceModel(Model):
         fn_loss = self.total_loss
 
         def fn_kl_divergence(states, internals, auxiliaries, actions, reward, other=None):
+            if self.baseline_optimizer is None and self.baseline_objective is not None:
+                if other is None:
+                    other, baseline_other = None, None
+                else:
+                    other, baseline_other = other
             kl_divergence = self.policy.kl_divergence(
                 states=states, internals=internals, auxiliaries=auxiliaries, other=other
             )
             if self.baseline_optimizer is None and self.baseline_objective is not None:
                 kl_divergence += self.baseline_policy.kl_divergence(
-                    states=states, internals=internals, auxiliaries=auxiliaries, other=other
+                    states=states, internals=internals, auxiliaries=auxiliaries,
+                    other=baseline_other
                 )
             return kl_divergence
 
+        def fn_kldiv_reference(states, internals, auxiliaries, actions, reward):
+            kldiv_reference = self.policy.kldiv_reference(
+                states=states, internals=internals, auxiliaries=auxiliaries
+            )
+            if self.baseline_optimizer is None and self.baseline_objective is not None:
+                kldiv_reference = (kldiv_reference, self.baseline_policy.kldiv_reference(
+                    states=states, internals=internals, auxiliaries=auxiliaries
+                ))
+            return kldiv_reference
+
         if self.global_model is None:
             global_variables = None
         else:
@@ -777,7 +915,8 @@ class TensorforceModel(Model):
         with tf.control_dependencies(control_inputs=dependencies):
             optimized = self.optimizer.minimize(
                 variables=variables, arguments=arguments, fn_loss=fn_loss,
-                fn_kl_divergence=fn_kl_divergence, global_variables=global_variables, **kwargs
+                fn_kl_divergence=fn_kl_divergence, fn_kldiv_reference=fn_kldiv_reference,
+                global_variables=global_variables, **kwargs
             )
 
         with tf.control_dependencies(control_inputs=(optimized,)):
@@ -992,6 +1131,11 @@ class TensorforceModel(Model):
                 states=states, internals=internals, auxiliaries=auxiliaries, other=other
             )
 
+        def fn_kldiv_reference(states, internals, auxiliaries, actions, reward):
+            return self.baseline_policy.kldiv_reference(
+                states=states, internals=internals, auxiliaries=auxiliaries
+            )
+
         source_variables = self.policy.get_variables(only_trainable=True)
 
         if self.global_model is None:
@@ -1007,8 +1151,8 @@ class TensorforceModel(Model):
         # Optimization
         optimized = self.baseline_optimizer.minimize(
             variables=variables, arguments=arguments, fn_loss=fn_loss,
-            fn_kl_divergence=fn_kl_divergence, source_variables=source_variables,
-            global_variables=global_variables, **kwargs
+            fn_kl_divergence=fn_kl_divergence, fn_kldiv_reference=fn_kldiv_reference,
+            source_variables=source_variables, global_variables=global_variables, **kwargs
         )
 
         with tf.control_dependencies(control_inputs=(optimized,)):
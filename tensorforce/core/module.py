@@ -166,8 +166,10 @@ class Module(object):
         self.variables = None
         self.trainable_variables = None
         self.saved_variables = None
+        self.substituted_variables = None
         self.output_tensors = None
         self.query_tensors = None
+        self.function_fetches = None
         self.available_summaries = None
 
         # name
@@ -255,6 +257,7 @@ class Module(object):
         self.saved_variables = OrderedDict()
         self.output_tensors = dict()
         self.query_tensors = dict()
+        self.function_fetches = dict()
         self.available_summaries = set()
 
         if self.parent is None:
@@ -469,13 +472,27 @@ class Module(object):
             if attribute.startswith('api_'):
                 function_name = attribute[4:]
                 assert hasattr(self, 'config')
-                if self.config is not None and 'api_functions' in self.config and \
-                        function_name not in self.config['api_functions']:
+                # Bulk experience of complete episodes is part of experience
+                if self.config is not None and 'api_functions' in self.config and (
+                    function_name if function_name != 'experience_episodes' else 'experience'
+                ) not in self.config['api_functions']:
+                    continue
+                if function_name in ('slot_act', 'slot_internals') and \
+                        self.internals_slots_size == 0:
+                    continue
+                if function_name in ('states_values', 'actions_values') and not self.has_values:
+                    continue
+                if function_name in (
+                    'act', 'observe', 'experience', 'experience_episodes', 'update'
+                ) and self.inference_only:
+                    continue
+                if function_name == 'experience_episodes' and \
+                        self.estimator.estimate_horizon == 'early':
                     continue
 
                 if function_name in ('act', 'independent_act'):
                     Module.global_summary_step = 'timestep'
-                elif function_name in ('observe', 'experience'):
+                elif function_name in ('observe', 'experience', 'experience_episodes'):
                     Module.global_summary_step = 'episode'
                 elif function_name == 'update':
                     Module.global_summary_step = 'update'
@@ -503,7 +520,7 @@ class Module(object):
                     elif function_name in self.summarizer_spec['frequency']:
                         if function_name in ('act', 'independent_act'):
                             step = self.global_timestep
-                        elif function_name in ('observe', 'experience'):
+                        elif function_name in ('observe', 'experience', 'experience_episodes'):
                             step = self.global_episode
                         elif function_name == 'update':
                             step = self.global_update
@@ -599,6 +616,9 @@ class Module(object):
         self.output_tensors[name[name.index('.') + 1:]] = [
             x.name[len(name) + 1: -9] for x in util.flatten(xs=results)
         ]
+        # Names of fetched tensors, structured like the results
+        fetches = util.fmap(function=(lambda x: x.name), xs=results)
+        self.function_fetches[name[name.index('.') + 1:]] = fetches
 
         # Function-level identity operation for retrieval
         query_tensors = set()
@@ -623,6 +643,10 @@ class Module(object):
         Module.global_tensors = None
         Module.queryable_tensors = None
 
+        return self.create_api_call(name=name, fetches=fetches)
+
+    def create_api_call(self, name, fetches):
+        # Call API function via the names of input placeholders and fetched tensors
         def fn(query=None, **kwargs):
             # Feed_dict dictionary
             feed_dict = dict()
@@ -636,30 +660,30 @@ class Module(object):
                 else:
                     feed_dict[util.join_scopes(self.name, key) + '-input:0'] = arg
             if not all(isinstance(x, str) and x.endswith('-input:0') for x in feed_dict):
-                raise TensorforceError.value(
-                    name=api_function, argument='inputs', value=list(feed_dict)
-                )
+                raise TensorforceError.value(name=name, argument='inputs', value=list(feed_dict))
 
             # Fetches value/tuple
-            fetches = util.fmap(function=(lambda x: x.name), xs=results)
-            if query is not None:
+            if query is None:
+                run_fetches = fetches
+            else:
                 # If additional tensors are to be fetched
                 query = util.fmap(
                     function=(lambda x: util.join_scopes(name, x) + '-query:0'), xs=query
                 )
                 if util.is_iterable(x=fetches):
-                    fetches = tuple(fetches) + (query,)
+                    run_fetches = tuple(fetches) + (query,)
                 else:
-                    fetches = (fetches, query)
+                    run_fetches = (fetches, query)
             if not util.reduce_all(
-                predicate=(lambda x: x.endswith('-output:0') or x.endswith('-query:0')), xs=fetches
+                predicate=(lambda x: x.endswith('-output:0') or x.endswith('-query:0')),
+                xs=run_fetches
             ):
                 raise TensorforceError.value(
-                    name=api_function, argument='outputs', value=list(fetches)
+                    name=name, argument='outputs', value=list(run_fetches)
                 )
 
             # TensorFlow session call
-            fetched = self.monitored_session.run(fetches=fetches, feed_dict=feed_dict)
+            fetched = self.monitored_session.run(fetches=run_fetches, feed_dict=feed_dict)
 
             return fetched
 
@@ -1247,6 +1271,54 @@ class Module(object):
 
         return variables
 
+    def substitute_variables(self, substitutes=None):
+        """
+        Substitutes trainable variables of this module and its submodules by the given tensors,
+        for instance to evaluate a loss for perturbed variables without assigning them, or reverts
+        the previous substitution if no substitutes are given. Only variables which are accessed as
+        module attribute can be substituted.
+
+        Args:
+            substitutes (dict[tensor]): Substitute tensors keyed by variable name, or None to
+                revert the previous substitution.
+
+        Returns:
+            Set of names of the substituted or reverted variables.
+        """
+        substituted = set()
+
+        if substitutes is None:
+            if self.substituted_variables is not None:
+                for name, (variable, substitute) in self.substituted_variables.items():
+                    for attribute, value in list(self.__dict__.items()):
+                        if value is substitute:
+                            setattr(self, attribute, variable)
+                    self.trainable_variables[name] = variable
+                    substituted.add(variable.name)
+                self.substituted_variables = None
+
+        else:
+            self.substituted_variables = OrderedDict()
+            for name, variable in self.trainable_variables.items():
+                if variable.name not in substitutes:
+                    continue
+                substitute = substitutes[variable.name]
+                attributes = [
+                    attribute for attribute, value in self.__dict__.items() if value is variable
+                ]
+                if len(attributes) == 0:
+                    continue
+                for attribute in attributes:
+                    setattr(self, attribute, substitute)
+                self.trainable_variables[name] = substitute
+                self.substituted_variables[name] = (variable, substitute)
+                substituted.add(variable.name)
+
+        for module in self.modules.values():
+            substituted.update(module.substitute_variables(substitutes=substitutes))
+
+        return substituted
+
     def get_available_summaries(self):
         summaries = set(self.available_summaries)
         for module in self.modules.values():
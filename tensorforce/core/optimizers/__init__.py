@@ -23,6 +23,7 @@ from tensorforce.core.optimizers.clipping_step import ClippingStep
 from tensorforce.core.optimizers.evolutionary import Evolutionary
 from tensorforce.core.optimizers.global_optimizer import GlobalOptimizer
 from tensorforce.core.optimizers.meta_optimizer_wrapper import MetaOptimizerWrapper
+from tensorforce.core.optimizers.minibatch_epochs import MinibatchEpochs
 from tensorforce.core.optimizers.multi_step import MultiStep
 from tensorforce.core.optimizers.natural_gradient import NaturalGradient
 from tensorforce.core.optimizers.optimizing_step import OptimizingStep
@@ -35,9 +36,9 @@ from tensorforce.core.optimizers.tf_optimizer import TFOptimizer, tensorflow_opt
 optimizer_modules = dict(
     clipping_step=ClippingStep, default=MetaOptimizerWrapper, evolutionary=Evolutionary,
     global_optimizer=GlobalOptimizer, meta_optimizer_wrapper=MetaOptimizerWrapper,
-    multi_step=MultiStep, natural_gradient=NaturalGradient, optimizing_step=OptimizingStep,
-    plus=Plus, subsampling_step=SubsamplingStep, synchronization=Synchronization,
-    tf_optimizer=TFOptimizer
+    minibatch_epochs=MinibatchEpochs, multi_step=MultiStep, natural_gradient=NaturalGradient,
+    optimizing_step=OptimizingStep, plus=Plus, subsampling_step=SubsamplingStep,
+    synchronization=Synchronization, tf_optimizer=TFOptimizer
 )
 
 
@@ -48,6 +49,6 @@ for name, optimizer in tensorflow_optimizers.items():
 
 __all__ = [
     'ClippingStep', 'Evolutionary', 'GlobalOptimizer', 'MetaOptimizer', 'MetaOptimizerWrapper',
-    'MultiStep', 'NaturalGradient', 'OptimizingStep', 'Optimizer', 'optimizer_modules', 'Plus',
-    'SubsamplingStep', 'Synchronization', 'TFOptimizer'
+    'MinibatchEpochs', 'MultiStep', 'NaturalGradient', 'OptimizingStep', 'Optimizer',
+    'optimizer_modules', 'Plus', 'SubsamplingStep', 'Synchronization', 'TFOptimizer'
 ]
@@ -13,9 +13,11 @@
 # limitations under the License.
 # ==============================================================================
 
+from collections import OrderedDict
+
 import tensorflow as tf
 
-from tensorforce import util
+from tensorforce import TensorforceError, util
 from tensorforce.core import parameter_modules
 from tensorforce.core.optimizers import Optimizer
 
@@ -33,14 +35,29 @@ class Evolutionary(Optimizer):
             (<span style="color:#C00000"><b>required</b></span>).
         num_samples (parameter, int >= 0): Number of sampled perturbations
             (<span style="color:#00C000"><b>default</b></span>: 1).
+        antithetic (bool): Whether to evaluate each sampled perturbation as antithetic pair of
+            positive and negative perturbation, which compares the two perturbed losses directly
+            instead of relative to the unperturbed loss
+            (<span style="color:#00C000"><b>default</b></span>: false).
+        batched (bool): Whether to evaluate all perturbations in one pass by substituting the
+            perturbed variables instead of assigning them one after another, which requires a
+            constant number of at most 16 samples and falls back to assignments if some variables
+            cannot be substituted, like RNN cell weights. Note that the graph contains a copy of
+            the loss computation per perturbation, so graph size and construction time grow
+            linearly with the number of samples, twice as fast if antithetic
+            (<span style="color:#00C000"><b>default</b></span>: false).
         unroll_loop (bool): Whether to unroll the sampling loop
             (<span style="color:#00C000"><b>default</b></span>: false).
         summary_labels ('all' | iter[string]): Labels of summaries to record
             (<span style="color:#00C000"><b>default</b></span>: inherit value of parent module).
     """
 
+    # Maximum number of samples if batched, since each perturbation adds a loss graph copy
+    MAX_BATCHED_SAMPLES = 16
+
     def __init__(
-        self, name, learning_rate, num_samples=1, unroll_loop=False, summary_labels=None
+        self, name, learning_rate, num_samples=1, antithetic=False, batched=False,
+        unroll_loop=False, summary_labels=None
     ):
         super().__init__(name=name, summary_labels=summary_labels)
 
@@ -49,10 +66,28 @@ class Evolutionary(Optimizer):
             min_value=0.0
         )
 
+        assert isinstance(antithetic, bool)
+        self.antithetic = antithetic
+
+        assert isinstance(batched, bool)
+        self.batched = batched
+
         assert isinstance(unroll_loop, bool)
         self.unroll_loop = unroll_loop
 
-        if self.unroll_loop:
+        if self.unroll_loop or self.batched:
+            if self.batched and not isinstance(num_samples, int):
+                raise TensorforceError.value(
+                    name='evolutionary', argument='num_samples', value=num_samples,
+                    condition='batched'
+                )
+            if self.batched and num_samples > self.__class__.MAX_BATCHED_SAMPLES:
+                raise TensorforceError.value(
+                    name='evolutionary', argument='num_samples', value=num_samples,
+                    condition='batched', hint='> {} (one loss graph copy per perturbation)'.format(
+                        self.__class__.MAX_BATCHED_SAMPLES
+                    )
+                )
             self.num_samples = num_samples
         else:
             self.num_samples = self.add_module(
@@ -62,71 +97,168 @@ class Evolutionary(Optimizer):
 
     def tf_step(self, variables, arguments, fn_loss, **kwargs):
         learning_rate = self.learning_rate.value()
-        unperturbed_loss = fn_loss(**arguments)
+        if not self.antithetic:
+            unperturbed_loss = fn_loss(**arguments)
 
-        deltas = [tf.zeros_like(input=variable) for variable in variables]
-        previous_perturbations = [tf.zeros_like(input=variable) for variable in variables]
+        # Perturbations are drawn with stateless seeds derived from one seed per step and the
+        # sample index, so they are the same independent of the evaluation mode.
+        step_seed = tf.random.uniform(
+            shape=(), maxval=util.tf_dtype(dtype='long').max, dtype=util.tf_dtype(dtype='long')
+        )
 
-        if self.unroll_loop:
-            # Unrolled for loop
-            for sample in range(self.num_samples):
-                with tf.control_dependencies(control_inputs=deltas):
-                    perturbations = [
-                        tf.random.normal(shape=util.shape(variable)) * learning_rate
-                        for variable in variables
-                    ]
-                    perturbation_deltas = [
-                        pert - prev_pert
-                        for pert, prev_pert in zip(perturbations, previous_perturbations)
-                    ]
-                    applied = self.apply_step(variables=variables, deltas=perturbation_deltas)
-                    previous_perturbations = perturbations
+        def sample_perturbations(sample):
+            sample = tf.dtypes.cast(x=sample, dtype=util.tf_dtype(dtype='long'))
+            perturbations = list()
+            for n, variable in enumerate(variables):
+                index = sample * len(variables) + n
+                perturbations.append(learning_rate * tf.random.stateless_normal(
+                    shape=util.shape(x=variable), seed=tf.stack(values=(step_seed, index)),
+                    dtype=util.tf_dtype(dtype='float')
+                ))
+            return perturbations
 
-                with tf.control_dependencies(control_inputs=(applied,)):
-                    perturbed_loss = fn_loss(**arguments)
-                    direction = tf.sign(x=(unperturbed_loss - perturbed_loss))
-                    deltas = [
-                        delta + direction * perturbation
-                        for delta, perturbation in zip(deltas, perturbations)
-                    ]
+        if self.batched:
+            deltas = self.batched_deltas(
+                variables=variables, arguments=arguments, fn_loss=fn_loss,
+                sample_perturbations=sample_perturbations,
+                unperturbed_loss=(None if self.antithetic else unperturbed_loss)
+            )
+            if deltas is not None:
+                return deltas
 
-        else:
-            # TensorFlow while loop
-            def body(deltas, previous_perturbations):
-                with tf.control_dependencies(control_inputs=deltas):
-                    perturbations = [
-                        learning_rate * tf.random.normal(
-                            shape=util.shape(x=variable), dtype=util.tf_dtype(dtype='float')
-                        ) for variable in variables
-                    ]
-                    perturbation_deltas = [
-                        pert - prev_pert
-                        for pert, prev_pert in zip(perturbations, previous_perturbations)
-                    ]
+        # Variables are perturbed relative to the previous perturbation, so each evaluated loss
+        # requires only one assignment, and the final update reverts the last perturbation.
+        def sample(deltas, previous_perturbations, n):
+            with tf.control_dependencies(control_inputs=deltas):
+                perturbations = sample_perturbations(sample=n)
+                perturbation_deltas = [
+                    pert - prev_pert
+                    for pert, prev_pert in zip(perturbations, previous_perturbations)
+                ]
+                applied = self.apply_step(variables=variables, deltas=perturbation_deltas)
+
+            with tf.control_dependencies(control_inputs=(applied,)):
+                perturbed_loss = fn_loss(**arguments)
+
+            if self.antithetic:
+                with tf.control_dependencies(control_inputs=(perturbed_loss,)):
+                    two = tf.constant(value=2.0, dtype=util.tf_dtype(dtype='float'))
+                    perturbation_deltas = [-two * pert for pert in perturbations]
                     applied = self.apply_step(variables=variables, deltas=perturbation_deltas)
 
                 with tf.control_dependencies(control_inputs=(applied,)):
-                    perturbed_loss = fn_loss(**arguments)
-                    direction = tf.sign(x=(unperturbed_loss - perturbed_loss))
-                    deltas = [
-                        delta + direction * perturbation
-                        for delta, perturbation in zip(deltas, perturbations)
-                    ]
+                    reference_loss = fn_loss(**arguments)
+                    previous_perturbations = [-pert for pert in perturbations]
+
+            else:
+                reference_loss = unperturbed_loss
+                previous_perturbations = perturbations
+
+            direction = tf.sign(x=(reference_loss - perturbed_loss))
+            deltas = [
+                delta + direction * perturbation
+                for delta, perturbation in zip(deltas, perturbations)
+            ]
 
-                return deltas, perturbations
+            return deltas, previous_perturbations, n + 1
 
+        # The unperturbed loss has to be evaluated before the first perturbation is applied.
+        dependencies = (() if self.antithetic else (unperturbed_loss,))
+        with tf.control_dependencies(control_inputs=dependencies):
+            deltas = [tf.zeros_like(input=variable) for variable in variables]
+        previous_perturbations = [tf.zeros_like(input=variable) for variable in variables]
+        zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='int'))
+
+        if self.unroll_loop or self.batched:
+            # Unrolled for loop
+            for n in range(self.num_samples):
+                deltas, previous_perturbations, _ = sample(
+                    deltas=deltas, previous_perturbations=previous_perturbations,
+                    n=tf.constant(value=n, dtype=util.tf_dtype(dtype='int'))
+                )
+            num_samples = tf.constant(value=self.num_samples, dtype=util.tf_dtype(dtype='int'))
+
+        else:
+            # TensorFlow while loop
             num_samples = self.num_samples.value()
-            deltas, perturbations = self.while_loop(
-                cond=util.tf_always_true, body=body, loop_vars=(deltas, previous_perturbations),
-                back_prop=False, maximum_iterations=num_samples
+            deltas, previous_perturbations, _ = self.while_loop(
+                cond=util.tf_always_true, body=sample,
+                loop_vars=(deltas, previous_perturbations, zero), back_prop=False,
+                maximum_iterations=num_samples
             )
 
         with tf.control_dependencies(control_inputs=deltas):
             num_samples = tf.dtypes.cast(x=num_samples, dtype=util.tf_dtype(dtype='float'))
             deltas = [delta / num_samples for delta in deltas]
-            perturbation_deltas = [delta - pert for delta, pert in zip(deltas, perturbations)]
+            perturbation_deltas = [
+                delta - pert for delta, pert in zip(deltas, previous_perturbations)
+            ]
             applied = self.apply_step(variables=variables, deltas=perturbation_deltas)
 
         with tf.control_dependencies(control_inputs=(applied,)):
             # Trivial operation to enforce control dependency
             return util.fmap(function=util.identity_operation, xs=deltas)
+
+    def batched_deltas(
+        self, variables, arguments, fn_loss, sample_perturbations, unperturbed_loss
+    ):
+        """
+        Evaluates the losses of all perturbations in one pass with the perturbed variables
+        substituted, and applies the resulting update, or returns None if some variables cannot
+        be substituted.
+        """
+        root = self
+        while root.parent is not None:
+            root = root.parent
+
+        def perturbed_loss(perturbations):
+            substitutes = OrderedDict(
+                (variable.name, variable + perturbation)
+                for variable, perturbation in zip(variables, perturbations)
+            )
+            substituted = root.substitute_variables(substitutes=substitutes)
+            if len(substituted) == len(substitutes):
+                loss = fn_loss(**arguments)
+            else:
+                loss = None
+            root.substitute_variables()
+            return loss
+
+        perturbations = list()
+        losses = list()
+        reference_losses = list()
+        for n in range(self.num_samples):
+            perturbations.append(sample_perturbations(
+                sample=tf.constant(value=n, dtype=util.tf_dtype(dtype='int'))
+            ))
+            loss = perturbed_loss(perturbations=perturbations[-1])
+            if loss is None:
+                return None
+            losses.append(loss)
+            if unperturbed_loss is None:
+                reference_losses.append(
+                    perturbed_loss(perturbations=[-pert for pert in perturbations[-1]])
+                )
+            else:
+                reference_losses.append(unperturbed_loss)
+
+        if self.num_samples == 0:
+            deltas = [tf.zeros_like(input=variable) for variable in variables]
+        else:
+            directions = tf.sign(x=(tf.stack(values=reference_losses) - tf.stack(values=losses)))
+            num_samples = tf.constant(value=self.num_samples, dtype=util.tf_dtype(dtype='float'))
+            deltas = list()
+            for n in range(len(variables)):
+                perturbation = tf.stack(values=[perts[n] for perts in perturbations])
+                directions_shape = (self.num_samples,) + (1,) * (perturbation.shape.ndims - 1)
+                direction = tf.reshape(tensor=directions, shape=directions_shape)
+                deltas.append(
+                    tf.math.reduce_sum(input_tensor=(direction * perturbation), axis=0) /
+                    num_samples
+                )
+
+        applied = self.apply_step(variables=variables, deltas=deltas)
+
+        with tf.control_dependencies(control_inputs=(applied,)):
+            # Trivial operation to enforce control dependency
+            return util.fmap(function=util.identity_operation, xs=deltas)
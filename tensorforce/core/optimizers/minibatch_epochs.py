@@ -0,0 +1,171 @@
+# Copyright 2018 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import tensorflow as tf
+
+from tensorforce import TensorforceError, util
+from tensorforce.core import Module, parameter_modules
+from tensorforce.core.optimizers import MetaOptimizer
+
+
+class MinibatchEpochs(MetaOptimizer):
+    """
+    Minibatch-epochs meta optimizer, which shuffles the batch once per epoch and applies the given
+    optimizer to each consecutive minibatch of the permutation, so every batch instance is used
+    exactly once per epoch (specification key: `minibatch_epochs`).
+
+    Args:
+        name (string): Module name
+            (<span style="color:#0000C0"><b>internal use</b></span>).
+        optimizer (specification): Optimizer configuration
+            (<span style="color:#C00000"><b>required</b></span>).
+        num_epochs (parameter, int >= 0): Number of passes over the batch
+            (<span style="color:#C00000"><b>required</b></span>).
+        minibatch_size (parameter, int > 0): Number of batch timesteps per minibatch, the last
+            minibatch of an epoch may be smaller
+            (<span style="color:#C00000"><b>required</b></span>).
+        early_stopping_kl (parameter, float > 0.0): Stop the remaining optimization once the mean
+            KL-divergence between the policy before the update and the current policy exceeds this
+            threshold on a minibatch
+            (<span style="color:#00C000"><b>default</b></span>: no early stopping).
+        summary_labels ('all' | iter[string]): Labels of summaries to record
+            (<span style="color:#00C000"><b>default</b></span>: inherit value of parent module).
+    """
+
+    def __init__(
+        self, name, optimizer, num_epochs, minibatch_size, early_stopping_kl=None,
+        summary_labels=None
+    ):
+        super().__init__(name=name, optimizer=optimizer, summary_labels=summary_labels)
+
+        self.num_epochs = self.add_module(
+            name='num-epochs', module=num_epochs, modules=parameter_modules, dtype='int',
+            min_value=0
+        )
+        self.minibatch_size = self.add_module(
+            name='minibatch-size', module=minibatch_size, modules=parameter_modules, dtype='int',
+            min_value=1
+        )
+
+        if early_stopping_kl is None:
+            self.early_stopping_kl = None
+        else:
+            self.early_stopping_kl = self.add_module(
+                name='early-stopping-kl', module=early_stopping_kl, modules=parameter_modules,
+                dtype='float', min_value=0.0
+            )
+
+    def tf_step(
+        self, variables, arguments, fn_reference=None, fn_kl_divergence=None,
+        fn_kldiv_reference=None, **kwargs
+    ):
+        # Policy distribution parameters before the update, in case of early stopping.
+        if self.early_stopping_kl is not None:
+            if fn_kl_divergence is None or fn_kldiv_reference is None:
+                raise TensorforceError.required(
+                    name='minibatch_epochs', argument='fn_kldiv_reference',
+                    condition='early_stopping_kl'
+                )
+            kldiv_reference = fn_kldiv_reference(**arguments)
+            kldiv_reference = util.fmap(function=tf.stop_gradient, xs=kldiv_reference)
+
+        # Set reference to compare with at each optimization step, in case of a comparative loss.
+        if fn_reference is not None:
+            assert 'reference' not in arguments
+            arguments = dict(arguments)
+            arguments['reference'] = fn_reference(**arguments)
+
+        some_argument = arguments['reward']
+
+        if util.tf_dtype(dtype='long') in (tf.int32, tf.int64):
+            batch_size = tf.shape(input=some_argument, out_type=util.tf_dtype(dtype='long'))[0]
+        else:
+            batch_size = tf.dtypes.cast(
+                x=tf.shape(input=some_argument)[0], dtype=util.tf_dtype(dtype='long')
+            )
+        zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='long'))
+        one = tf.constant(value=1, dtype=util.tf_dtype(dtype='long'))
+        minibatch_size = tf.dtypes.cast(
+            x=self.minibatch_size.value(), dtype=util.tf_dtype(dtype='long')
+        )
+        # At least one to avoid division by zero for an empty batch, which performs no minibatch.
+        minibatch_size = tf.math.minimum(x=minibatch_size, y=tf.math.maximum(x=batch_size, y=one))
+        num_minibatches = tf.math.floordiv(x=(batch_size + minibatch_size - one), y=minibatch_size)
+
+        dependency_starts = Module.retrieve_tensor(name='dependency_starts')
+        dependency_lengths = Module.retrieve_tensor(name='dependency_lengths')
+
+        def stop_condition(deltas, *args):
+            is_stopped = args[-1]
+            return tf.math.logical_not(x=is_stopped)
+
+        def epoch_body(deltas, is_stopped):
+            # One random permutation per epoch, consecutive slices of which form the minibatches.
+            permutation = tf.random.shuffle(value=tf.range(batch_size))
+
+            def minibatch_body(deltas, minibatch, is_stopped):
+                start = minibatch * minibatch_size
+                end = tf.math.minimum(x=(start + minibatch_size), y=batch_size)
+                indices = permutation[start: end]
+
+                subsampled_arguments, subsampled_starts, subsampled_lengths = \
+                    self.subsample_arguments(arguments=arguments, indices=indices)
+                Module.update_tensors(
+                    dependency_starts=subsampled_starts, dependency_lengths=subsampled_lengths
+                )
+
+                with tf.control_dependencies(control_inputs=deltas):
+                    step_deltas = self.optimizer.step(
+                        variables=variables, arguments=subsampled_arguments,
+                        fn_kl_divergence=fn_kl_divergence, fn_kldiv_reference=fn_kldiv_reference,
+                        **kwargs
+                    )
+                    deltas = [delta1 + delta2 for delta1, delta2 in zip(deltas, step_deltas)]
+
+                if self.early_stopping_kl is not None:
+                    with tf.control_dependencies(control_inputs=step_deltas):
+                        function = (lambda x: tf.gather(params=x, indices=indices))
+                        other = util.fmap(function=function, xs=kldiv_reference)
+                        kl_arguments = dict(subsampled_arguments)
+                        kl_arguments.pop('reference', None)
+                        kl_divergence = fn_kl_divergence(other=other, **kl_arguments)
+                        kl_divergence = tf.math.reduce_mean(input_tensor=kl_divergence, axis=0)
+                        is_stopped = tf.math.greater(
+                            x=kl_divergence, y=self.early_stopping_kl.value()
+                        )
+
+                Module.update_tensors(
+                    dependency_starts=dependency_starts, dependency_lengths=dependency_lengths
+                )
+
+                return deltas, minibatch + one, is_stopped
+
+            deltas, _, is_stopped = self.while_loop(
+                cond=stop_condition, body=minibatch_body, loop_vars=(deltas, zero, is_stopped),
+                back_prop=False, maximum_iterations=num_minibatches
+            )
+
+            return deltas, is_stopped
+
+        deltas = [tf.zeros_like(input=variable) for variable in variables]
+        is_stopped = tf.constant(value=False, dtype=util.tf_dtype(dtype='bool'))
+
+        num_epochs = self.num_epochs.value()
+        deltas, is_stopped = self.while_loop(
+            cond=stop_condition, body=epoch_body, loop_vars=(deltas, is_stopped),
+            back_prop=False, maximum_iterations=num_epochs
+        )
+
+        return deltas
@@ -16,7 +16,7 @@
 import tensorflow as tf
 
 from tensorforce import util
-from tensorforce.core import parameter_modules
+from tensorforce.core import Module, parameter_modules
 from tensorforce.core.optimizers import Optimizer
 from tensorforce.core.optimizers.solvers import solver_modules
 
@@ -36,13 +36,21 @@ class NaturalGradient(Optimizer):
             (<span style="color:#00C000"><b>default</b></span>: 1e-3).
         cg_unroll_loop (bool): Whether to unroll the conjugate gradient loop
             (<span style="color:#00C000"><b>default</b></span>: false).
+        cg_preconditioner_probes (int >= 0): Number of random probe vectors for estimating the
+            diagonal of the Fisher matrix, which is used as Jacobi preconditioner of the conjugate
+            gradient solver, each probe costs one Fisher-vector product
+            (<span style="color:#00C000"><b>default</b></span>: 0, no preconditioning).
+        subsampling_fraction (parameter, 0.0 < float <= 1.0): Fraction of batch timesteps to
+            randomly subsample once per step for computing Fisher-vector products, whereas the loss
+            gradient is always computed on the full batch
+            (<span style="color:#00C000"><b>default</b></span>: no subsampling).
         summary_labels ('all' | iter[string]): Labels of summaries to record
             (<span style="color:#00C000"><b>default</b></span>: inherit value of parent module).
     """
 
     def __init__(
         self, name, learning_rate, cg_max_iterations=10, cg_damping=1e-3, cg_unroll_loop=False,
-        summary_labels=None
+        cg_preconditioner_probes=0, subsampling_fraction=1.0, summary_labels=None
     ):
         super().__init__(name=name, summary_labels=summary_labels)
 
@@ -56,6 +64,17 @@ class NaturalGradient(Optimizer):
             max_iterations=cg_max_iterations, damping=cg_damping, unroll_loop=cg_unroll_loop
         )
 
+        assert isinstance(cg_preconditioner_probes, int) and cg_preconditioner_probes >= 0
+        self.cg_preconditioner_probes = cg_preconditioner_probes
+
+        if subsampling_fraction == 1.0:
+            self.subsampling_fraction = None
+        else:
+            self.subsampling_fraction = self.add_module(
+                name='subsampling-fraction', module=subsampling_fraction,
+                modules=parameter_modules, dtype='float', min_value=0.0, max_value=1.0
+            )
+
     def tf_step(
         self, variables, arguments, fn_loss, fn_kl_divergence, return_estimated_improvement=False,
         **kwargs
@@ -71,7 +90,7 @@ class NaturalGradient(Optimizer):
             deltas = [tf.stop_gradient(input=delta) for delta in deltas]
 
             # kldiv
-            kldiv = fn_kl_divergence(**arguments)
+            kldiv = fn_kl_divergence(**fisher_arguments)
 
             # grad(kldiv)
             kldiv_grads = tf.gradients(ys=kldiv, xs=variables)
@@ -103,16 +122,76 @@ class NaturalGradient(Optimizer):
         # grad(loss)
         loss_gradients = tf.gradients(ys=loss, xs=variables)
 
+        # Fixed random subsample of the batch for all Fisher-vector products of this step.
+        if self.subsampling_fraction is None:
+            fisher_arguments = arguments
+
+        else:
+            some_argument = arguments['reward']
+
+            if util.tf_dtype(dtype='long') in (tf.int32, tf.int64):
+                batch_size = tf.shape(input=some_argument, out_type=util.tf_dtype(dtype='long'))[0]
+            else:
+                batch_size = tf.dtypes.cast(
+                    x=tf.shape(input=some_argument)[0], dtype=util.tf_dtype(dtype='long')
+                )
+            fraction = self.subsampling_fraction.value()
+            num_samples = fraction * tf.dtypes.cast(x=batch_size, dtype=util.tf_dtype('float'))
+            num_samples = tf.dtypes.cast(x=num_samples, dtype=util.tf_dtype('long'))
+            one = tf.constant(value=1, dtype=util.tf_dtype('long'))
+            num_samples = tf.maximum(x=num_samples, y=one)
+            indices = tf.random.shuffle(value=tf.range(batch_size))[:num_samples]
+
+            dependency_starts = Module.retrieve_tensor(name='dependency_starts')
+            dependency_lengths = Module.retrieve_tensor(name='dependency_lengths')
+            fisher_arguments, subsampled_starts, subsampled_lengths = self.subsample_arguments(
+                arguments=arguments, indices=indices
+            )
+            Module.update_tensors(
+                dependency_starts=subsampled_starts, dependency_lengths=subsampled_lengths
+            )
+
+        # Hutchinson estimate of diag(F) as E[z * (z * F)] for Rademacher-distributed z.
+        if self.cg_preconditioner_probes > 0:
+            fisher_diagonal = [tf.zeros_like(input=variable) for variable in variables]
+            for _ in range(self.cg_preconditioner_probes):
+                probes = [
+                    tf.math.sign(x=tf.random.uniform(
+                        shape=util.shape(x=variable), minval=-1.0, maxval=1.0,
+                        dtype=util.tf_dtype(dtype='float')
+                    )) for variable in variables
+                ]
+                probes_fisher_matrix_product = fisher_matrix_product(deltas=probes)
+                fisher_diagonal = [
+                    diag + probe * probe_F
+                    for diag, probe, probe_F in zip(
+                        fisher_diagonal, probes, probes_fisher_matrix_product
+                    )
+                ]
+            num_probes = tf.constant(
+                value=self.cg_preconditioner_probes, dtype=util.tf_dtype(dtype='float')
+            )
+            preconditioner = [diag / num_probes for diag in fisher_diagonal]
+
+        else:
+            preconditioner = None
+
         # Solve the following system for delta' via the conjugate gradient solver.
         # [delta' * F] * delta' = -grad(loss)
         # --> delta'  (= lambda * delta)
         deltas = self.solver.solve(
-            fn_x=fisher_matrix_product, x_init=None, b=[-grad for grad in loss_gradients]
+            fn_x=fisher_matrix_product, x_init=None, b=[-grad for grad in loss_gradients],
+            preconditioner=preconditioner
         )
 
         # delta' * F
         delta_fisher_matrix_product = fisher_matrix_product(deltas=deltas)
 
+        if self.subsampling_fraction is not None:
+            Module.update_tensors(
+                dependency_starts=dependency_starts, dependency_lengths=dependency_lengths
+            )
+
         # c' = 0.5 * delta' * F * delta'  (= lambda * c)
         # TODO: Why constant and hence KL-divergence sometimes negative?
         half = tf.constant(value=0.5, dtype=util.tf_dtype(dtype='float'))
@@ -47,6 +47,46 @@ class Optimizer(Module):
         with tf.control_dependencies(control_inputs=assignments):
             return util.no_operation()
 
+    def tf_subsample_arguments(self, arguments, indices):
+        """
+        Gathers the batch instances given by indices from the optimizer arguments, including the
+        sequence of preceding states each instance depends on.
+
+        Returns:
+            Subsampled arguments, and corresponding dependency starts and lengths.
+        """
+        one = tf.constant(value=1, dtype=util.tf_dtype(dtype='long'))
+
+        function = (lambda x: tf.gather(params=x, indices=indices))
+        subsampled_arguments = util.fmap(function=function, xs=arguments)
+
+        dependency_starts = Module.retrieve_tensor(name='dependency_starts')
+        dependency_lengths = Module.retrieve_tensor(name='dependency_lengths')
+        subsampled_starts = tf.gather(params=dependency_starts, indices=indices)
+        subsampled_lengths = tf.gather(params=dependency_lengths, indices=indices)
+        trivial_dependencies = tf.reduce_all(
+            input_tensor=tf.math.equal(x=dependency_lengths, y=one), axis=0
+        )
+
+        def dependency_state_indices():
+            fold = (lambda acc, args: tf.concat(
+                values=(acc, tf.range(start=args[0], limit=(args[0] + args[1]))), axis=0
+            ))
+            return tf.foldl(
+                fn=fold, elems=(subsampled_starts, subsampled_lengths), initializer=indices[:0],
+                parallel_iterations=10, back_prop=False, swap_memory=False
+            )
+
+        states_indices = self.cond(
+            pred=trivial_dependencies, true_fn=(lambda: indices), false_fn=dependency_state_indices
+        )
+        function = (lambda x: tf.gather(params=x, indices=states_indices))
+        subsampled_arguments['states'] = util.fmap(function=function, xs=arguments['states'])
+
+        subsampled_starts = tf.math.cumsum(x=subsampled_lengths, exclusive=True)
+
+        return subsampled_arguments, subsampled_starts, subsampled_lengths
+
     def tf_minimize(self, variables, **kwargs):
         if any(variable.dtype != util.tf_dtype(dtype='float') for variable in variables):
             raise TensorforceError.unexpected()
@@ -13,9 +13,11 @@
 # limitations under the License.
 # ==============================================================================
 
+from collections import OrderedDict
+
 import tensorflow as tf
 
-from tensorforce import TensorforceError
+from tensorforce import TensorforceError, util
 from tensorforce.core.optimizers import MetaOptimizer
 from tensorforce.core.optimizers.solvers import solver_modules
 
@@ -40,20 +42,26 @@ class OptimizingStep(MetaOptimizer):
             (<span style="color:#00C000"><b>default</b></span>: 0.5).
         ls_unroll_loop (bool): Whether to unroll the line search loop
             (<span style="color:#00C000"><b>default</b></span>: false).
+        ls_parallel (bool): Whether to evaluate all line search candidates in a single pass by
+            substituting the perturbed variables instead of assigning them one after another,
+            requires <code>ls_max_iterations</code> to be an int constant; falls back to sequential
+            assignment if some variables cannot be substituted, for instance for RNN or Keras
+            layers
+            (<span style="color:#00C000"><b>default</b></span>: false).
         summary_labels ('all' | iter[string]): Labels of summaries to record
             (<span style="color:#00C000"><b>default</b></span>: inherit value of parent module).
     """
 
     def __init__(
         self, name, optimizer, ls_max_iterations=10, ls_accept_ratio=0.9, ls_mode='exponential',
-        ls_parameter=0.5, ls_unroll_loop=False, summary_labels=None
+        ls_parameter=0.5, ls_unroll_loop=False, ls_parallel=False, summary_labels=None
     ):
         super().__init__(name=name, optimizer=optimizer)
 
         self.solver = self.add_module(
             name='line-search', module='line_search', modules=solver_modules,
             max_iterations=ls_max_iterations, accept_ratio=ls_accept_ratio, mode=ls_mode,
-            parameter=ls_parameter, unroll_loop=ls_unroll_loop
+            parameter=ls_parameter, unroll_loop=ls_unroll_loop, parallel=ls_parallel
         )
 
     def tf_step(self, variables, arguments, fn_loss, fn_reference=None, **kwargs):
@@ -91,6 +99,63 @@ class OptimizingStep(MetaOptimizer):
 
         with tf.control_dependencies(control_inputs=(loss_step,)):
 
+            if self.solver.parallel:
+
+                def evaluate_candidates(candidates):
+                    root = self
+                    while root.parent is not None:
+                        root = root.parent
+
+                    # Substitute perturbed variables, which avoids assignments between evaluations.
+                    values = list()
+                    for candidate in candidates:
+                        substitutes = OrderedDict(
+                            (variable.name, variable + delta)
+                            for variable, delta in zip(variables, candidate)
+                        )
+                        substituted = root.substitute_variables(substitutes=substitutes)
+                        if len(substituted) == len(substitutes):
+                            # Negative value since line search maximizes.
+                            values.append(-fn_loss(**augmented_arguments))
+                        root.substitute_variables()
+                        if len(substituted) < len(substitutes):
+                            break
+                    else:
+                        return tf.stack(values=values, axis=0)
+
+                    # Otherwise assign candidates one after another, and revert afterwards.
+                    values = list()
+                    previous = [tf.zeros_like(input=variable) for variable in variables]
+                    for candidate in candidates:
+                        with tf.control_dependencies(control_inputs=values[-1:]):
+                            applied = self.apply_step(
+                                variables=variables,
+                                deltas=[delta - prev for delta, prev in zip(candidate, previous)]
+                            )
+                        with tf.control_dependencies(control_inputs=(applied,)):
+                            # Negative value since line search maximizes.
+                            values.append(-fn_loss(**augmented_arguments))
+                        previous = candidate
+                    with tf.control_dependencies(control_inputs=values[-1:]):
+                        applied = self.apply_step(
+                            variables=variables, deltas=[-prev for prev in previous]
+                        )
+                    with tf.control_dependencies(control_inputs=(applied,)):
+                        return tf.stack(values=values, axis=0)
+
+                solution = self.solver.solve(
+                    fn_x=evaluate_candidates, x_init=deltas, base_value=loss_before,
+                    target_value=loss_step, estimated_improvement=estimated_improvement
+                )
+
+                # Apply chosen solution relative to the current step.
+                applied = self.apply_step(
+                    variables=variables,
+                    deltas=[delta1 - delta2 for delta1, delta2 in zip(solution, deltas)]
+                )
+                with tf.control_dependencies(control_inputs=(applied,)):
+                    return util.fmap(function=util.identity_operation, xs=solution)
+
             def evaluate_step(deltas):
                 with tf.control_dependencies(control_inputs=deltas):
                     applied = self.apply_step(variables=variables, deltas=deltas)
@@ -50,6 +50,10 @@ class ConjugateGradient(Iterative):
         return x_{t+1}
     ```
 
+    If a diagonal approximation $D$ of $A$ is given, the residual is additionally preconditioned
+    via $z_t := (D + damping)^{-1} r_t$ (Jacobi preconditioner), and $z_t$ replaces $r_t$
+    in the conjugate and the squared-residual computations.
+
     """
 
     def __init__(self, name, max_iterations, damping, unroll_loop=False):
@@ -68,7 +72,7 @@ class ConjugateGradient(Iterative):
             max_value=1.0
         )
 
-    def tf_solve(self, fn_x, x_init, b):
+    def tf_solve(self, fn_x, x_init, b, preconditioner=None):
         """
         Iteratively solves the system of linear equations $A x = b$.
 
@@ -76,12 +80,43 @@ class ConjugateGradient(Iterative):
             fn_x: A callable returning the left-hand side $A x$ of the system of linear equations.
             x_init: Initial solution guess $x_0$, zero vector if None.
             b: The right-hand side $b$ of the system of linear equations.
+            preconditioner: Diagonal approximation $D$ of $A$ for Jacobi preconditioning, no
+                preconditioning if None.
 
         Returns:
             A solution $x$ to the problem as given by the solver.
         """
+        if preconditioner is None:
+            self.inverse_preconditioner = None
+
+        else:
+            # (D + damping)^-1
+            damping = self.damping.value()
+            epsilon = tf.constant(value=util.epsilon, dtype=util.tf_dtype(dtype='float'))
+            self.inverse_preconditioner = [
+                tf.math.reciprocal(x=tf.maximum(x=(tf.abs(x=diag) + damping), y=epsilon))
+                for diag in preconditioner
+            ]
+
         return super().tf_solve(fn_x, x_init, b)
 
+    def precondition(self, residual):
+        """
+        Applies the inverse Jacobi preconditioner to the residual, if given.
+
+        Args:
+            residual: Residual $r_t$.
+
+        Returns:
+            Preconditioned residual $z_t$.
+        """
+        if self.inverse_preconditioner is None:
+            return residual
+        else:
+            return [
+                inv_pre * res for inv_pre, res in zip(self.inverse_preconditioner, residual)
+            ]
+
     def tf_step(self, x, conjugate, residual, squared_residual):
         """
         Iteration loop body of the conjugate gradient algorithm.
@@ -90,7 +125,7 @@ class ConjugateGradient(Iterative):
             x: Current solution estimate $x_t$.
             conjugate: Current conjugate $c_t$.
             residual: Current residual $r_t$.
-            squared_residual: Current squared residual $r_t^2$.
+            squared_residual: Current (preconditioned) squared residual $r_t^T z_t$.
 
         Returns:
             Updated arguments for next iteration.
@@ -130,16 +165,22 @@ class ConjugateGradient(Iterative):
         # r_{t+1} := r_t - \alpha * Ac
         next_residual = [res - alpha * A_conj for res, A_conj in zip(residual, A_conjugate)]
 
-        # r_{t+1}^2 := r_{t+1}^T * r_{t+1}
+        # z_{t+1} := (D + damping)^-1 * r_{t+1}  (z_{t+1} = r_{t+1} if no preconditioner)
+        next_preconditioned = self.precondition(residual=next_residual)
+
+        # r_{t+1}^2 := r_{t+1}^T * z_{t+1}
         next_squared_residual = tf.add_n(
-            inputs=[tf.reduce_sum(input_tensor=(res * res)) for res in next_residual]
+            inputs=[
+                tf.reduce_sum(input_tensor=(res * pre))
+                for res, pre in zip(next_residual, next_preconditioned)
+            ]
         )
 
         # \beta = r_{t+1}^2 / r_t^2
         beta = next_squared_residual / tf.maximum(x=squared_residual, y=epsilon)
 
-        # c_{t+1} := r_{t+1} + \beta * c_t
-        next_conjugate = [res + beta * conj for res, conj in zip(next_residual, conjugate)]
+        # c_{t+1} := z_{t+1} + \beta * c_t
+        next_conjugate = [pre + beta * conj for pre, conj in zip(next_preconditioned, conjugate)]
 
         return next_x, next_conjugate, next_residual, next_squared_residual
 
@@ -151,7 +192,7 @@ class ConjugateGradient(Iterative):
             x: Current solution estimate $x_t$.
             conjugate: Current conjugate $c_t$.
             residual: Current residual $r_t$.
-            squared_residual: Current squared residual $r_t^2$.
+            squared_residual: Current (preconditioned) squared residual $r_t^T z_t$.
 
         Returns:
             True if another iteration should be performed.
@@ -177,12 +218,17 @@ class ConjugateGradient(Iterative):
             x_init = [tf.zeros_like(input=t, dtype=util.tf_dtype(dtype='float')) for t in b]
 
         # r_0 := b - A * x_0
-        # c_0 := r_0
-        conjugate = residual = [t - fx for t, fx in zip(b, self.fn_x(x_init))]
+        residual = [t - fx for t, fx in zip(b, self.fn_x(x_init))]
+
+        # c_0 := z_0 := (D + damping)^-1 * r_0  (z_0 = r_0 if no preconditioner)
+        conjugate = self.precondition(residual=residual)
 
-        # r_0^2 := r^T * r
+        # r_0^2 := r_0^T * z_0
         squared_residual = tf.add_n(
-            inputs=[tf.reduce_sum(input_tensor=(res * res)) for res in residual]
+            inputs=[
+                tf.reduce_sum(input_tensor=(res * conj))
+                for res, conj in zip(residual, conjugate)
+            ]
         )
 
         return x_init, conjugate, residual, squared_residual
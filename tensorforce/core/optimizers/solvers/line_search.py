@@ -25,10 +25,15 @@ class LineSearch(Iterative):
     Line search algorithm which iteratively optimizes the value $f(x)$ for $x$ on the line between  
     $x'$ and $x_0$ by optimistically taking the first acceptable $x$ starting from $x_0$ and  
     moving towards $x'$.
+
+    Alternatively, all candidate solutions $x_1, ..., x_n$ are evaluated in a single pass, and  
+    the first acceptable one is chosen, or the one with best improvement ratio if none is  
+    acceptable.
     """
 
     def __init__(
-        self, name, max_iterations, accept_ratio, mode, parameter, unroll_loop=False
+        self, name, max_iterations, accept_ratio, mode, parameter, unroll_loop=False,
+        parallel=False
     ):
         """
         Creates a new line search solver instance.
@@ -42,8 +47,17 @@ class LineSearch(Iterative):
             parameter (parameter, 0.0 <= float <= 1.0): Movement mode parameter, additive or
                 multiplicative, respectively.
             unroll_loop: Unrolls the TensorFlow while loop if true.
+            parallel: Evaluates all candidate solutions in a single pass if true, in which case
+                fn_x maps a list of candidate deltas to the vector of their values without
+                applying them, and the returned solution is not applied either.
         """
-        super().__init__(name=name, max_iterations=max_iterations, unroll_loop=unroll_loop)
+        # Parallel evaluation requires a fixed number of candidates, as for unrolled loops.
+        assert isinstance(parallel, bool)
+        self.parallel = parallel
+
+        super().__init__(
+            name=name, max_iterations=max_iterations, unroll_loop=(unroll_loop or parallel)
+        )
 
         assert accept_ratio >= 0.0
         self.accept_ratio = self.add_module(
@@ -77,8 +91,71 @@ class LineSearch(Iterative):
         Returns:
             A solution $x$ to the problem as given by the solver.
         """
+        if self.parallel:
+            return self.parallel_solve(
+                fn_x, x_init, base_value, target_value, estimated_improvement
+            )
+
         return super().tf_solve(fn_x, x_init, base_value, target_value, estimated_improvement)
 
+    def tf_parallel_solve(self, fn_x, x_init, base_value, target_value, estimated_improvement):
+        """
+        Evaluates all candidate solutions $x_t$ on the line between $x'$ and $x_0$ in a single pass.
+
+        Args:
+            fn_x: A callable returning the vector of values $f(x_t)$ given a list of candidate
+                deltas $x_t - x_0$.
+            x_init: Initial solution guess $x_0$.
+            base_value: Value $f(x')$ at $x = x'$.
+            target_value: Value $f(x_0)$ at $x = x_0$.
+            estimated_improvement: Estimated improvement for $x = x_0$, $f(x')$ if None.
+
+        Returns:
+            A solution $x$ to the problem as given by the solver, which is not yet applied.
+        """
+        if self.max_iterations == 0:
+            return x_init
+
+        if estimated_improvement is None:
+            estimated_improvement = tf.abs(x=base_value)
+
+        # Ladder of step size scales, $x_t = scale_t * x_0$
+        zero = tf.constant(value=0.0, dtype=util.tf_dtype(dtype='float'))
+        one = tf.constant(value=1.0, dtype=util.tf_dtype(dtype='float'))
+        parameter = self.parameter.value()
+        scales = [one]
+        for _ in range(self.max_iterations):
+            if self.mode == 'linear':
+                scales.append(tf.maximum(x=(scales[-1] - parameter), y=zero))
+            elif self.mode == 'exponential':
+                scales.append(scales[-1] * parameter)
+
+        candidates = [[(scale - one) * t for t in x_init] for scale in scales[1:]]
+        values = fn_x(candidates)
+        values = tf.concat(values=(tf.expand_dims(input=target_value, axis=0), values), axis=0)
+        scales = tf.stack(values=scales, axis=0)
+
+        epsilon = tf.constant(value=util.epsilon, dtype=util.tf_dtype(dtype='float'))
+        estimated_improvements = tf.maximum(x=(estimated_improvement * scales), y=epsilon)
+        improvements = (values - base_value) / estimated_improvements
+
+        # Largest acceptable step, otherwise step with best improvement ratio, or initial solution
+        # if estimated value not positive
+        accept_ratio = self.accept_ratio.value()
+        is_acceptable = tf.math.greater_equal(x=improvements, y=accept_ratio)
+        acceptable_scales = tf.where(condition=is_acceptable, x=scales, y=(scales - 2.0))
+        index = tf.where(
+            condition=tf.math.reduce_any(input_tensor=is_acceptable, axis=0),
+            x=tf.math.argmax(input=acceptable_scales, axis=0),
+            y=tf.math.argmax(input=improvements, axis=0)
+        )
+        index = tf.where(
+            condition=(estimated_improvement > epsilon), x=index, y=tf.zeros_like(input=index)
+        )
+        scale = tf.gather(params=scales, indices=index)
+
+        return [scale * t for t in x_init]
+
     def tf_start(self, x_init, base_value, target_value, estimated_improvement):
         """
         Initialization step preparing the arguments for the first iteration of the loop body.
@@ -15,7 +15,7 @@
 
 import tensorflow as tf
 
-from tensorforce import TensorforceError, util
+from tensorforce import util
 from tensorforce.core import Module, parameter_modules
 from tensorforce.core.optimizers import MetaOptimizer
 
@@ -83,33 +83,13 @@ class SubsamplingStep(MetaOptimizer):
         indices = tf.random.uniform(
             shape=(num_samples,), maxval=batch_size, dtype=util.tf_dtype(dtype='long')
         )
-        function = (lambda x: tf.gather(params=x, indices=indices))
-        subsampled_arguments = util.fmap(function=function, xs=arguments)
 
         dependency_starts = Module.retrieve_tensor(name='dependency_starts')
         dependency_lengths = Module.retrieve_tensor(name='dependency_lengths')
-        subsampled_starts = tf.gather(params=dependency_starts, indices=indices)
-        subsampled_lengths = tf.gather(params=dependency_lengths, indices=indices)
-        trivial_dependencies = tf.reduce_all(
-            input_tensor=tf.math.equal(x=dependency_lengths, y=one), axis=0
+        subsampled_arguments, subsampled_starts, subsampled_lengths = self.subsample_arguments(
+            arguments=arguments, indices=indices
         )
 
-        def dependency_state_indices():
-            fold = (lambda acc, args: tf.concat(
-                values=(acc, tf.range(start=args[0], limit=(args[0] + args[1]))), axis=0
-            ))
-            return tf.foldl(
-                fn=fold, elems=(subsampled_starts, subsampled_lengths), initializer=indices[:0],
-                parallel_iterations=10, back_prop=False, swap_memory=False
-            )
-
-        states_indices = self.cond(
-            pred=trivial_dependencies, true_fn=(lambda: indices), false_fn=dependency_state_indices
-        )
-        function = (lambda x: tf.gather(params=x, indices=states_indices))
-        subsampled_arguments['states'] = util.fmap(function=function, xs=arguments['states'])
-
-        subsampled_starts = tf.math.cumsum(x=subsampled_lengths, exclusive=True)
         Module.update_tensors(
             dependency_starts=subsampled_starts, dependency_lengths=subsampled_lengths
         )
@@ -18,7 +18,7 @@ from functools import partial
 import tensorflow as tf
 
 from tensorforce import util
-from tensorforce.core import parameter_modules
+from tensorforce.core import Module, parameter_modules
 from tensorforce.core.optimizers import Optimizer
 
 
@@ -66,6 +66,10 @@ class TFOptimizer(Optimizer):
             (<span style="color:#00C000"><b>default</b></span>: 3e-4).
         gradient_norm_clipping (parameter, float >= 0.0): Clip gradients by the ratio of the sum
             of their norms (<span style="color:#00C000"><b>default</b></span>: 1.0).
+        accumulate_steps (int > 0): Number of micro-batches the batch is split into, whose
+            gradients are accumulated before a single optimizer step, to bound the memory
+            required per gradient computation
+            (<span style="color:#00C000"><b>default</b></span>: 1, no accumulation).
         summary_labels ('all' | iter[string]): Labels of summaries to record
             (<span style="color:#00C000"><b>default</b></span>: inherit value of parent module).
         kwargs: Arguments for the TensorFlow optimizer, special values "decoupled_weight_decay",
@@ -76,8 +80,8 @@ class TFOptimizer(Optimizer):
     """
 
     def __init__(
-        self, name, optimizer, learning_rate=3e-4, gradient_norm_clipping=1.0, summary_labels=None,
-        **kwargs
+        self, name, optimizer, learning_rate=3e-4, gradient_norm_clipping=1.0, accumulate_steps=1,
+        summary_labels=None, **kwargs
     ):
         super().__init__(name=name, summary_labels=summary_labels)
 
@@ -91,6 +95,10 @@ class TFOptimizer(Optimizer):
             name='gradient-norm-clipping', module=gradient_norm_clipping,
             modules=parameter_modules, dtype='float', min_value=0.0
         )
+
+        assert isinstance(accumulate_steps, int) and accumulate_steps >= 1
+        self.accumulate_steps = accumulate_steps
+
         self.optimizer_kwargs = kwargs
 
         if 'decoupled_weight_decay' in self.optimizer_kwargs:
@@ -127,29 +135,45 @@ class TFOptimizer(Optimizer):
 
     def tf_step(self, variables, arguments, fn_loss, fn_initial_gradients=None, **kwargs):
         arguments = util.fmap(function=tf.stop_gradient, xs=arguments)
-        loss = fn_loss(**arguments)
 
-        # Force loss value and attached control flow to be computed.
-        with tf.control_dependencies(control_inputs=(loss,)):
-            # Trivial operation to enforce control dependency
+        if self.accumulate_steps > 1:
+            # Get variables before update.
             previous_variables = util.fmap(function=util.identity_operation, xs=variables)
 
-        # Get variables before update.
-        with tf.control_dependencies(control_inputs=previous_variables):
-            # applied = self.optimizer.minimize(loss=loss, var_list=variables)
-            # grads_and_vars = self.optimizer.compute_gradients(loss=loss, var_list=variables)
-            # gradients, variables = zip(*grads_and_vars)
-            if fn_initial_gradients is None:
-                initial_gradients = None
-            else:
-                initial_gradients = fn_initial_gradients(**arguments)
-                initial_gradients = tf.stop_gradient(input=initial_gradients)
+            with tf.control_dependencies(control_inputs=previous_variables):
+                gradients = self.accumulated_gradients(
+                    variables=variables, arguments=arguments, fn_loss=fn_loss,
+                    fn_initial_gradients=fn_initial_gradients
+                )
+                assertions = [
+                    tf.debugging.assert_all_finite(x=gradient, message="Finite gradients check.")
+                    for gradient in gradients
+                ]
 
-            gradients = tf.gradients(ys=loss, xs=variables, grad_ys=initial_gradients)
-            assertions = [
-                tf.debugging.assert_all_finite(x=gradient, message="Finite gradients check.")
-                for gradient in gradients
-            ]
+        else:
+            loss = fn_loss(**arguments)
+
+            # Force loss value and attached control flow to be computed.
+            with tf.control_dependencies(control_inputs=(loss,)):
+                # Trivial operation to enforce control dependency
+                previous_variables = util.fmap(function=util.identity_operation, xs=variables)
+
+            # Get variables before update.
+            with tf.control_dependencies(control_inputs=previous_variables):
+                # applied = self.optimizer.minimize(loss=loss, var_list=variables)
+                # grads_and_vars = self.optimizer.compute_gradients(loss=loss, var_list=variables)
+                # gradients, variables = zip(*grads_and_vars)
+                if fn_initial_gradients is None:
+                    initial_gradients = None
+                else:
+                    initial_gradients = fn_initial_gradients(**arguments)
+                    initial_gradients = tf.stop_gradient(input=initial_gradients)
+
+                gradients = tf.gradients(ys=loss, xs=variables, grad_ys=initial_gradients)
+                assertions = [
+                    tf.debugging.assert_all_finite(x=gradient, message="Finite gradients check.")
+                    for gradient in gradients
+                ]
 
         with tf.control_dependencies(control_inputs=assertions):
             gradient_norm_clipping = self.gradient_norm_clipping.value()
@@ -170,6 +194,78 @@ class TFOptimizer(Optimizer):
                 for variable, previous_variable in zip(variables, previous_variables)
             ]
 
+    def tf_accumulated_gradients(self, variables, arguments, fn_loss, fn_initial_gradients=None):
+        """
+        Computes the batch gradients as sum of the gradients of consecutive micro-batches, each
+        weighted by its fraction of the batch, so only one micro-batch is processed at a time.
+        """
+        some_argument = arguments['reward']
+
+        if util.tf_dtype(dtype='long') in (tf.int32, tf.int64):
+            batch_size = tf.shape(input=some_argument, out_type=util.tf_dtype(dtype='long'))[0]
+        else:
+            batch_size = tf.dtypes.cast(
+                x=tf.shape(input=some_argument)[0], dtype=util.tf_dtype(dtype='long')
+            )
+        zero = tf.constant(value=0, dtype=util.tf_dtype(dtype='long'))
+        one = tf.constant(value=1, dtype=util.tf_dtype(dtype='long'))
+        accumulate_steps = tf.constant(
+            value=self.accumulate_steps, dtype=util.tf_dtype(dtype='long')
+        )
+        microbatch_size = tf.math.floordiv(
+            x=(batch_size + accumulate_steps - one), y=accumulate_steps
+        )
+        # At least one to avoid division by zero for an empty batch, which performs no micro-batch.
+        microbatch_size = tf.math.maximum(x=microbatch_size, y=one)
+        num_microbatches = tf.math.floordiv(
+            x=(batch_size + microbatch_size - one), y=microbatch_size
+        )
+        float_batch_size = tf.dtypes.cast(x=batch_size, dtype=util.tf_dtype(dtype='float'))
+
+        dependency_starts = Module.retrieve_tensor(name='dependency_starts')
+        dependency_lengths = Module.retrieve_tensor(name='dependency_lengths')
+
+        def body(microbatch, gradients):
+            start = microbatch * microbatch_size
+            end = tf.math.minimum(x=(start + microbatch_size), y=batch_size)
+            indices = tf.range(start=start, limit=end)
+
+            microbatch_arguments, microbatch_starts, microbatch_lengths = \
+                self.subsample_arguments(arguments=arguments, indices=indices)
+            Module.update_tensors(
+                dependency_starts=microbatch_starts, dependency_lengths=microbatch_lengths
+            )
+
+            loss = fn_loss(**microbatch_arguments)
+            if fn_initial_gradients is None:
+                initial_gradients = None
+            else:
+                initial_gradients = fn_initial_gradients(**microbatch_arguments)
+                initial_gradients = tf.stop_gradient(input=initial_gradients)
+
+            microbatch_gradients = tf.gradients(ys=loss, xs=variables, grad_ys=initial_gradients)
+            weight = tf.dtypes.cast(x=(end - start), dtype=util.tf_dtype(dtype='float')) / \
+                float_batch_size
+            gradients = [
+                gradient if microbatch_gradient is None else
+                gradient + weight * tf.convert_to_tensor(value=microbatch_gradient)
+                for gradient, microbatch_gradient in zip(gradients, microbatch_gradients)
+            ]
+
+            Module.update_tensors(
+                dependency_starts=dependency_starts, dependency_lengths=dependency_lengths
+            )
+
+            return microbatch + one, gradients
+
+        gradients = [tf.zeros_like(input=variable) for variable in variables]
+        _, gradients = self.while_loop(
+            cond=util.tf_always_true, body=body, loop_vars=(zero, gradients), back_prop=False,
+            maximum_iterations=num_microbatches
+        )
+
+        return gradients
+
     def get_variables(self, only_trainable=False, only_saved=False):
         optimizer = self.optimizer
         while True:
@@ -13,7 +13,11 @@
 # limitations under the License.
 # ==============================================================================
 
+from tensorforce.execution.inference_server import InferenceClient, InferenceServer
 from tensorforce.execution.runner import Runner
+from tensorforce.execution.weight_channel import WeightPublisher, WeightSubscriber
 
 
-__all__ = ['Runner']
+__all__ = [
+    'InferenceClient', 'InferenceServer', 'Runner', 'WeightPublisher', 'WeightSubscriber'
+]
@@ -0,0 +1,443 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from collections import deque, OrderedDict
+import os
+from queue import Empty, Queue
+from socket import AF_INET, SHUT_RD, SHUT_RDWR, socket as Socket
+from threading import Event, Lock, Thread
+import time
+
+import msgpack
+import msgpack_numpy
+import numpy as np
+
+from tensorforce import TensorforceError, util
+
+
+msgpack_numpy.patch()
+
+
+class InferenceServer(object):
+    """
+    Local inference server around an act-only agent, which serves concurrent clients connected via
+    TCP or Unix socket, see `InferenceClient`. Concurrent act requests are collected into
+    micro-batches and processed by a single act call per batch, and the recurrent internals of
+    each client are kept server-side.
+
+    Args:
+        directory (string): Checkpoint directory of an agent saved in "tensorflow" format, see
+            `Agent.load(format="pb-actonly")`
+            (<span style="color:#C00000"><b>required</b></span>).
+        filename (string): Checkpoint filename
+            (<span style="color:#00C000"><b>default</b></span>: "agent").
+        host (string): Host address for TCP socket
+            (<span style="color:#00C000"><b>default</b></span>: all interfaces if port is given).
+        port (int > 0): Port for TCP socket
+            (<span style="color:#C00000"><b>required</b></span> unless path is given).
+        path (string): Path for Unix socket
+            (<span style="color:#C00000"><b>required</b></span> unless port is given).
+        max_batch_size (int > 0): Maximum number of act requests per micro-batch
+            (<span style="color:#00C000"><b>default</b></span>: 64).
+        max_wait (float >= 0.0): Maximum time in seconds to wait for further act requests after
+            the first request of a micro-batch
+            (<span style="color:#00C000"><b>default</b></span>: 0.001).
+        num_latencies (int > 0): Number of most recent request latencies used for latency
+            percentiles
+            (<span style="color:#00C000"><b>default</b></span>: 10000).
+    """
+
+    MAX_BYTES = 4096
+
+    @classmethod
+    def send(cls, connection, message):
+        str_message = msgpack.packb(o=message)
+        num_bytes = len(str_message)
+        str_num_bytes = '{:08d}'.format(num_bytes).encode()
+        connection.sendall(str_num_bytes + str_message)
+
+    @classmethod
+    def receive(cls, connection):
+        """
+        Receives a message, or returns None if the connection was closed.
+        """
+        str_num_bytes = cls.receive_bytes(connection=connection, num_bytes=8)
+        if str_num_bytes is None:
+            return None
+        num_bytes = int(str_num_bytes.decode())
+        str_message = cls.receive_bytes(connection=connection, num_bytes=num_bytes)
+        if str_message is None:
+            raise TensorforceError.unexpected()
+        message = msgpack.unpackb(packed=str_message)
+        decode = (lambda x: x.decode() if isinstance(x, bytes) else x)
+        return util.fmap(function=decode, xs=message, map_keys=True)
+
+    @classmethod
+    def receive_bytes(cls, connection, num_bytes):
+        str_bytes = b''
+        while len(str_bytes) < num_bytes:
+            str_received = connection.recv(min(num_bytes - len(str_bytes), cls.MAX_BYTES))
+            if len(str_received) == 0:
+                if len(str_bytes) == 0:
+                    return None
+                raise TensorforceError.unexpected()
+            str_bytes += str_received
+        return str_bytes
+
+    def __init__(
+        self, directory, filename=None, host=None, port=None, path=None, max_batch_size=64,
+        max_wait=0.001, num_latencies=10000
+    ):
+        from tensorforce import Agent
+
+        if (port is None) == (path is None):
+            raise TensorforceError.required(
+                name='InferenceServer', argument='port or path', condition='not both'
+            )
+        if host is not None and port is None:
+            raise TensorforceError.invalid(
+                name='InferenceServer', argument='host', condition='no port'
+            )
+        if not isinstance(max_batch_size, int) or max_batch_size <= 0:
+            raise TensorforceError.value(
+                name='InferenceServer', argument='max_batch_size', value=max_batch_size
+            )
+        if max_wait < 0.0:
+            raise TensorforceError.value(
+                name='InferenceServer', argument='max_wait', value=max_wait
+            )
+
+        self.agent = Agent.load(directory=directory, filename=filename, format='pb-actonly')
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.requests = Queue()
+        self.stopped = Event()
+        self.socket = None
+        self.threads = list()
+        self.connections = list()
+        self.connection_threads = list()
+
+        # Counters
+        self.counters_lock = Lock()
+        self.start_time = None
+        self.num_requests = 0
+        self.num_batches = 0
+        self.num_errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_act_time = 0.0
+        self.latencies = deque(maxlen=num_latencies)
+
+    def start(self):
+        """
+        Starts serving clients in background threads.
+        """
+        if self.socket is not None:
+            raise TensorforceError(message="Inference server is already running.")
+
+        if self.path is None:
+            self.socket = Socket(AF_INET)
+            self.socket.bind(('' if self.host is None else self.host, self.port))
+        else:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            from socket import AF_UNIX  # not available on Windows
+
+            self.socket = Socket(AF_UNIX)
+            self.socket.bind(self.path)
+        self.socket.listen()
+
+        self.start_time = time.time()
+        self.stopped.clear()
+        self.threads = [
+            Thread(target=self.accept_loop, daemon=True),
+            Thread(target=self.batch_loop, daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def close(self):
+        """
+        Stops the server, closes all client connections and the agent.
+        """
+        if self.socket is not None:
+            self.stopped.set()
+            try:
+                self.socket.shutdown(SHUT_RDWR)
+            except OSError:
+                pass
+            self.socket.close()
+            for thread in self.threads:
+                thread.join()
+            # Answer requests which were not processed anymore
+            self.fail_requests()
+            # Only stop receiving, so answers of processed requests are still sent
+            for connection in list(self.connections):
+                try:
+                    connection.shutdown(SHUT_RD)
+                except OSError:
+                    pass
+            for thread in self.connection_threads:
+                thread.join()
+            self.socket = None
+            self.threads = list()
+            self.connection_threads = list()
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+        self.agent.close()
+
+    def statistics(self):
+        """
+        Returns latency and throughput counters, where latency is measured from receiving an act
+        request until its actions are available, and act time is the time spent in batched act
+        calls.
+
+        Returns:
+            dict: Counters, see keys.
+        """
+        with self.counters_lock:
+            elapsed = (0.0 if self.start_time is None else time.time() - self.start_time)
+            latencies = np.asarray(self.latencies)
+            num_requests = max(self.num_requests, 1)
+            num_batches = max(self.num_batches, 1)
+            return OrderedDict(
+                requests=self.num_requests, batches=self.num_batches, errors=self.num_errors,
+                mean_batch_size=(self.num_requests / num_batches),
+                mean_latency=(self.total_latency / num_requests), max_latency=self.max_latency,
+                latency_p50=(float(np.percentile(latencies, 50)) if len(latencies) > 0 else 0.0),
+                latency_p99=(float(np.percentile(latencies, 99)) if len(latencies) > 0 else 0.0),
+                mean_act_time=(self.total_act_time / num_batches),
+                throughput=(self.num_requests / max(elapsed, util.epsilon))
+            )
+
+    def accept_loop(self):
+        while not self.stopped.is_set():
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                break
+            self.connections.append(connection)
+            self.connection_threads = [
+                thread for thread in self.connection_threads if thread.is_alive()
+            ]
+            thread = Thread(target=self.connection_loop, args=(connection,), daemon=True)
+            thread.start()
+            self.connection_threads.append(thread)
+
+    def connection_loop(self, connection):
+        # Per-client recurrent internals
+        internals = self.agent.initial_internals()
+
+        try:
+            while not self.stopped.is_set():
+                message = self.__class__.receive(connection=connection)
+                if message is None or message['function'] == 'close':
+                    break
+
+                elif message['function'] == 'act':
+                    request = dict(
+                        states=message['states'], internals=internals, event=Event(),
+                        start=time.time()
+                    )
+                    self.requests.put(request)
+                    while not request['event'].wait(timeout=0.1):
+                        if self.stopped.is_set():
+                            self.fail_requests()
+                    if 'error' in request:
+                        result = dict(success=False, error=request['error'])
+                    else:
+                        internals = request['internals']
+                        result = dict(success=True, actions=request['actions'])
+
+                elif message['function'] == 'reset':
+                    internals = self.agent.initial_internals()
+                    result = dict(success=True)
+
+                elif message['function'] == 'statistics':
+                    result = dict(success=True, statistics=self.statistics())
+
+                else:
+                    result = dict(
+                        success=False,
+                        error='Invalid inference server function: {}'.format(message['function'])
+                    )
+
+                self.__class__.send(connection=connection, message=result)
+
+        except (OSError, TensorforceError):
+            pass
+
+        finally:
+            self.connections.remove(connection)
+            connection.close()
+
+    def batch_loop(self):
+        while not self.stopped.is_set():
+            try:
+                request = self.requests.get(timeout=0.1)
+            except Empty:
+                continue
+
+            # Collect micro-batch until maximum size or maximum waiting time
+            batch = [request]
+            deadline = time.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.time()
+                try:
+                    if timeout > 0.0:
+                        batch.append(self.requests.get(timeout=timeout))
+                    else:
+                        batch.append(self.requests.get_nowait())
+                except Empty:
+                    break
+
+            self.process_batch(batch=batch)
+
+    def fail_requests(self):
+        """
+        Answers all queued act requests with an error, once the server is stopped.
+        """
+        batch = list()
+        while True:
+            try:
+                batch.append(self.requests.get_nowait())
+            except Empty:
+                break
+
+        with self.counters_lock:
+            self.num_errors += len(batch)
+
+        for request in batch:
+            request['error'] = 'Inference server stopped.'
+            request['event'].set()
+
+    def process_batch(self, batch):
+        start = time.time()
+        try:
+            parallel = list(range(len(batch)))
+            states = [request['states'] for request in batch]
+            if len(self.agent.internals_spec) == 0:
+                actions = self.agent.act(states=states, parallel=parallel)
+            else:
+                internals = [request['internals'] for request in batch]
+                actions, internals = self.agent.act(
+                    states=states, internals=internals, parallel=parallel
+                )
+                for n, request in enumerate(batch):
+                    request['internals'] = OrderedDict(
+                        (name, internal[n]) for name, internal in internals.items()
+                    )
+            for n, request in enumerate(batch):
+                request['actions'] = actions[n]
+            num_errors = 0
+
+        except Exception as exception:
+            for request in batch:
+                request['error'] = str(exception)
+            num_errors = len(batch)
+
+        end = time.time()
+        with self.counters_lock:
+            self.num_requests += len(batch)
+            self.num_batches += 1
+            self.num_errors += num_errors
+            self.total_act_time += end - start
+            for request in batch:
+                latency = end - request['start']
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+                self.latencies.append(latency)
+
+        for request in batch:
+            request['event'].set()
+
+
+class InferenceClient(object):
+    """
+    Client of an `InferenceServer`, corresponding to one sequence of act calls, for instance one
+    environment, with its own recurrent internals.
+
+    Args:
+        host (string): Host address of TCP socket
+            (<span style="color:#00C000"><b>default</b></span>: "localhost" if port is given).
+        port (int > 0): Port of TCP socket
+            (<span style="color:#C00000"><b>required</b></span> unless path is given).
+        path (string): Path of Unix socket
+            (<span style="color:#C00000"><b>required</b></span> unless port is given).
+    """
+
+    def __init__(self, host=None, port=None, path=None):
+        if (port is None) == (path is None):
+            raise TensorforceError.required(
+                name='InferenceClient', argument='port or path', condition='not both'
+            )
+
+        if path is None:
+            self.connection = Socket(AF_INET)
+            self.connection.connect(('localhost' if host is None else host, port))
+        else:
+            from socket import AF_UNIX  # not available on Windows
+
+            self.connection = Socket(AF_UNIX)
+            self.connection.connect(path)
+
+    def close(self):
+        """
+        Closes the connection to the server.
+        """
+        if self.connection is not None:
+            InferenceServer.send(connection=self.connection, message=dict(function='close'))
+            self.connection.close()
+            self.connection = None
+
+    def call(self, function, **kwargs):
+        InferenceServer.send(connection=self.connection, message=dict(function=function, **kwargs))
+        result = InferenceServer.receive(connection=self.connection)
+        if result is None:
+            raise TensorforceError(message="Inference server closed the connection.")
+        elif not result['success']:
+            raise TensorforceError(message=result['error'])
+        return result
+
+    def act(self, states):
+        """
+        Returns the deterministic actions for the given states, and updates the client's internals
+        on the server.
+
+        Args:
+            states (dict[state] | state): Environment state(s), not batched
+                (<span style="color:#C00000"><b>required</b></span>).
+
+        Returns:
+            dict[action] | action: Actions.
+        """
+        return self.call(function='act', states=states)['actions']
+
+    def reset(self):
+        """
+        Resets the client's internals on the server to the initial internals, to be called at the
+        start of each episode for agents with recurrent internals.
+        """
+        self.call(function='reset')
+
+    def statistics(self):
+        """
+        Returns the server's latency and throughput counters, see `InferenceServer.statistics()`.
+        """
+        return self.call(function='statistics')['statistics']
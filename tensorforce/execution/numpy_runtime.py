@@ -0,0 +1,661 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+NumPy-only runtime for policies exported via `agent.save(format='numpy-runtime')`.
+
+This module deliberately depends on nothing but NumPy and the Python standard library, and is
+copied next to the exported runtime file, so that it can be imported on machines without
+TensorFlow or Tensorforce:
+
+    from numpy_runtime import NumpyActonlyAgent
+    agent = NumpyActonlyAgent(path='agent.runtime')
+    actions, internals = agent.act(states=states, internals=agent.initial_internals())
+
+Dense and convolution weights can subsequently be quantized to int8 with per-output-channel
+scales, and the action agreement with the float model measured on recorded traces:
+
+    python numpy_runtime.py agent.runtime --traces data/traces
+"""
+
+import argparse
+from collections import OrderedDict
+import json
+import os
+import time
+
+import numpy as np
+
+
+epsilon = 1e-6
+
+np_dtype_mapping = dict(bool=np.bool_, int=np.int32, long=np.int64, float=np.float32)
+
+
+def activation(x, nonlinearity):
+    if nonlinearity == 'crelu':
+        return np.concatenate([np.maximum(x, 0.0), np.maximum(-x, 0.0)], axis=-1)
+    elif nonlinearity == 'elu':
+        return np.where(x > 0.0, x, np.expm1(np.minimum(x, 0.0)))
+    elif nonlinearity == 'leaky-relu':
+        return np.where(x > 0.0, x, 0.2 * x)
+    elif nonlinearity in ('none', 'linear'):
+        return x
+    elif nonlinearity == 'relu':
+        return np.maximum(x, 0.0)
+    elif nonlinearity == 'selu':
+        alpha = 1.6732632423543772
+        scale = 1.0507009873554805
+        return scale * np.where(x > 0.0, x, alpha * np.expm1(np.minimum(x, 0.0)))
+    elif nonlinearity == 'sigmoid':
+        return 0.5 * (np.tanh(0.5 * x) + 1.0)
+    elif nonlinearity == 'softmax':
+        x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return x / np.sum(x, axis=-1, keepdims=True)
+    elif nonlinearity == 'softplus':
+        return np.logaddexp(0.0, x)
+    elif nonlinearity == 'softsign':
+        return x / (1.0 + np.abs(x))
+    elif nonlinearity == 'swish':
+        return activation(x=x, nonlinearity='sigmoid') * x
+    elif nonlinearity == 'tanh':
+        return np.tanh(x)
+    else:
+        raise ValueError("Invalid nonlinearity: {}.".format(nonlinearity))
+
+
+def padding(size, window, stride, dilation, padding):
+    # TensorFlow padding semantics: output size and padding before/after
+    window = (window - 1) * dilation + 1
+    if padding == 'same':
+        output = -(-size // stride)
+        total = max((output - 1) * stride + window - size, 0)
+        return output, total // 2, total - total // 2
+    elif padding == 'valid':
+        output = -(-(size - window + 1) // stride)
+        return output, 0, 0
+    else:
+        raise ValueError("Invalid padding: {}.".format(padding))
+
+
+def conv2d(x, weights, stride, padding_type, dilation):
+    height, before_height, after_height = padding(
+        size=x.shape[1], window=weights.shape[0], stride=stride[0], dilation=dilation[0],
+        padding=padding_type
+    )
+    width, before_width, after_width = padding(
+        size=x.shape[2], window=weights.shape[1], stride=stride[1], dilation=dilation[1],
+        padding=padding_type
+    )
+    x = np.pad(x, ((0, 0), (before_height, after_height), (before_width, after_width), (0, 0)))
+    y = np.zeros(shape=(x.shape[0], height, width, weights.shape[3]), dtype=x.dtype)
+    for i in range(weights.shape[0]):
+        start_height = i * dilation[0]
+        end_height = start_height + (height - 1) * stride[0] + 1
+        for j in range(weights.shape[1]):
+            start_width = j * dilation[1]
+            end_width = start_width + (width - 1) * stride[1] + 1
+            patch = x[:, start_height: end_height: stride[0], start_width: end_width: stride[1]]
+            y += np.matmul(patch, weights[i, j])
+    return y
+
+
+def pool2d(x, reduction, window, stride, padding_type):
+    height, before_height, after_height = padding(
+        size=x.shape[1], window=window[0], stride=stride[0], dilation=1, padding=padding_type
+    )
+    width, before_width, after_width = padding(
+        size=x.shape[2], window=window[1], stride=stride[1], dilation=1, padding=padding_type
+    )
+    pad = ((0, 0), (before_height, after_height), (before_width, after_width), (0, 0))
+    if reduction == 'max':
+        x = np.pad(x, pad, constant_values=-np.inf)
+        y = np.full(shape=(x.shape[0], height, width, x.shape[3]), fill_value=-np.inf)
+    elif reduction == 'average':
+        # Average over valid entries only, as TensorFlow does for 'same' padding
+        count = np.pad(np.ones(shape=((1,) + x.shape[1:3] + (1,))), pad)
+        x = np.pad(x, pad)
+        y = np.zeros(shape=(x.shape[0], height, width, x.shape[3]))
+        total = np.zeros(shape=(1, height, width, 1))
+    else:
+        raise ValueError("Invalid reduction: {}.".format(reduction))
+    for i in range(window[0]):
+        end_height = i + (height - 1) * stride[0] + 1
+        for j in range(window[1]):
+            end_width = j + (width - 1) * stride[1] + 1
+            patch = x[:, i: end_height: stride[0], j: end_width: stride[1]]
+            if reduction == 'max':
+                y = np.maximum(y, patch)
+            else:
+                y += patch
+                total += count[:, i: end_height: stride[0], j: end_width: stride[1]]
+    if reduction == 'average':
+        y /= total
+    return y.astype(x.dtype)
+
+
+def expand_rank(x, rank):
+    for axis in range(x.ndim, rank):
+        x = np.expand_dims(x, axis=axis)
+    return x
+
+
+def quantize_runtime(path, quantized_path=None):
+    """
+    Post-training quantization of the dense and convolution weights of a runtime file to int8,
+    with one symmetric scale per output channel. Weights are dequantized when loaded.
+
+    Args:
+        path (str): Path of runtime file
+            (<span style="color:#C00000"><b>required</b></span>).
+        quantized_path (str): Path of quantized runtime file
+            (<span style="color:#00C000"><b>default</b></span>: path with "-int8" appended to
+            the filename).
+
+    Returns:
+        str: Path of quantized runtime file.
+    """
+    with np.load(path) as filehandle:
+        arrays = OrderedDict((name, filehandle[name]) for name in filehandle.files)
+    graph = json.loads(str(arrays['graph']))
+
+    for operation in graph['operations']:
+        if operation['type'] not in ('dense', 'conv1d', 'conv2d'):
+            continue
+        name = operation['weights']
+        weights = arrays[name]
+        if weights.dtype == np.int8:
+            # Weights shared by multiple operations
+            continue
+        scale = np.max(np.abs(weights), axis=tuple(range(weights.ndim - 1))) / 127.0
+        scale = np.where(scale > 0.0, scale, 1.0).astype(np.float32)
+        arrays[name] = np.clip(np.round(weights / scale), -127.0, 127.0).astype(np.int8)
+        arrays[name + '-scale'] = scale
+
+    if quantized_path is None:
+        quantized_path = os.path.splitext(path)[0] + '-int8' + os.path.splitext(path)[1]
+    with open(quantized_path, 'wb') as filehandle:
+        np.savez(filehandle, **arrays)
+
+    return quantized_path
+
+
+def agreement_rate(agent, reference, directory, atol=1e-2):
+    """
+    Replays the states of recorded traces through two act-only agents and measures how often
+    their actions agree, bool/int actions exactly and float actions up to an absolute tolerance.
+
+    Args:
+        agent (act-only agent): Agent to evaluate, for instance a quantized runtime
+            (<span style="color:#C00000"><b>required</b></span>).
+        reference (act-only agent): Reference agent, for instance the float runtime
+            (<span style="color:#C00000"><b>required</b></span>).
+        directory (str): Directory with traces written by the agent recorder
+            (<span style="color:#C00000"><b>required</b></span>).
+        atol (float >= 0.0): Absolute tolerance for float actions
+            (<span style="color:#00C000"><b>default</b></span>: 0.01).
+
+    Returns:
+        dict[float]: Agreement rate per action, and for all actions as "*".
+    """
+    # Segments listed in "traces.json", otherwise compressed trace archives
+    if os.path.isfile(os.path.join(directory, 'traces.json')):
+        with open(os.path.join(directory, 'traces.json'), 'r') as filehandle:
+            index = json.load(fp=filehandle, object_pairs_hook=OrderedDict)
+        files = [os.path.join(directory, segment['name']) for segment in index['segments']]
+    else:
+        index = None
+        files = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.startswith('trace-') and f.endswith('.npz')
+        )
+    if len(files) == 0:
+        raise ValueError("No traces in directory: {}.".format(directory))
+
+    names = list(agent.actions_spec)
+    agreements = OrderedDict((name, 0) for name in names + ['*'])
+    num_timesteps = 0
+    for filename in files:
+        if index is None:
+            with np.load(filename) as trace:
+                trace = OrderedDict((name, trace[name]) for name in trace.files)
+        else:
+            trace = OrderedDict(
+                (name, np.load(os.path.join(filename, name.replace('/', '.') + '.npy')))
+                for name in index['spec']
+            )
+        states = OrderedDict(
+            (name, value) for name, value in trace.items()
+            if name in agent.states_spec or
+            (name.endswith('_mask') and name[:-5] in agent.actions_spec)
+        )
+        terminal = trace['terminal']
+
+        internals = agent.initial_internals()
+        reference_internals = reference.initial_internals()
+        for timestep in range(terminal.shape[0]):
+            x = OrderedDict((name, state[timestep]) for name, state in states.items())
+            actions, internals = agent.act(states=x, internals=internals)
+            reference_actions, reference_internals = reference.act(
+                states=x, internals=reference_internals
+            )
+            if len(names) == 1 and not isinstance(actions, dict):
+                actions = {names[0]: actions}
+                reference_actions = {names[0]: reference_actions}
+
+            all_agree = True
+            for name in names:
+                action = actions
+                reference_action = reference_actions
+                for key in name.split('/'):
+                    action = action[key]
+                    reference_action = reference_action[key]
+                if agent.actions_spec[name]['type'] == 'float':
+                    agree = np.allclose(action, reference_action, rtol=0.0, atol=atol)
+                else:
+                    agree = np.array_equal(action, reference_action)
+                agreements[name] += int(agree)
+                all_agree = all_agree and agree
+            agreements['*'] += int(all_agree)
+            num_timesteps += 1
+
+            if terminal[timestep] > 0:
+                internals = agent.initial_internals()
+                reference_internals = reference.initial_internals()
+
+    return OrderedDict((name, count / num_timesteps) for name, count in agreements.items())
+
+
+class NumpyActonlyAgent(object):
+    """
+    NumPy-only act-only agent, interface-compatible with the Protobuf-based act-only agent
+    returned by `Agent.load(format='pb-actonly')`. Always acts deterministically, exploration
+    and variable noise are not applied.
+
+    Args:
+        path (str): Path of runtime file written by `agent.save(format='numpy-runtime')`
+            (<span style="color:#C00000"><b>required</b></span>).
+    """
+
+    def __init__(self, path):
+        with np.load(path) as filehandle:
+            self.weights = {name: filehandle[name] for name in filehandle.files}
+        graph = json.loads(str(self.weights.pop('graph')), object_pairs_hook=OrderedDict)
+
+        self.states_spec = graph['states']
+        self.actions_spec = graph['actions']
+        self.internals_spec = graph['internals']
+        self.operations = graph['operations']
+        self._initial_internals = OrderedDict(
+            (name, self.weights['internals/' + name]) for name in self.internals_spec
+        )
+
+        # Dequantize int8 weights
+        for name in list(self.weights):
+            if name + '-scale' in self.weights:
+                scale = self.weights.pop(name + '-scale')
+                self.weights[name] = self.weights[name].astype(np.float32) * scale
+
+        self.functions = dict(
+            activation=self.apply_activation, bernoulli=self.apply_bernoulli,
+            beta=self.apply_beta, bias_add=self.apply_bias_add,
+            categorical=self.apply_categorical, conv1d=self.apply_conv1d,
+            conv2d=self.apply_conv2d, dense=self.apply_dense, embedding=self.apply_embedding,
+            flatten=self.apply_flatten, gaussian=self.apply_gaussian, gru=self.apply_gru,
+            lstm=self.apply_lstm, pool1d=self.apply_pool1d, pool2d=self.apply_pool2d,
+            pooling=self.apply_pooling, reshape=self.apply_reshape,
+            retrieve=self.apply_retrieve, squeeze=self.apply_squeeze
+        )
+
+    def close(self):
+        self.weights = None
+
+    def initial_internals(self):
+        return OrderedDict(**self._initial_internals)
+
+    def act(
+        self, states, internals=None, parallel=0, independent=True, deterministic=True,
+        evaluation=True, query=None, **kwargs
+    ):
+        # Invalid arguments, batched act via list of parallel indices (only used for batch size)
+        assert (not isinstance(parallel, int) or parallel == 0) and independent and \
+            deterministic and evaluation and query is None and len(kwargs) == 0
+
+        internals_is_none = (internals is None)
+        if internals_is_none:
+            if len(self.internals_spec) > 0:
+                raise ValueError("Required agent.act argument internals.")
+            internals = OrderedDict()
+
+        # Batch states
+        batched = (not isinstance(parallel, int))
+        if batched:
+            if len(parallel) == 0:
+                raise ValueError("Invalid agent.act argument parallel: zero-length.")
+            if isinstance(states[0], dict):
+                states = OrderedDict(
+                    (name, np.asarray([states[n][name] for n in range(len(parallel))]))
+                    for name in states[0]
+                )
+            else:
+                states = np.asarray(states)
+            if not internals_is_none:
+                internals = OrderedDict(
+                    (name, np.asarray([internals[n][name] for n in range(len(parallel))]))
+                    for name in internals[0]
+                )
+        else:
+            if isinstance(states, dict):
+                states = OrderedDict((name, np.asarray([x])) for name, x in states.items())
+            else:
+                states = np.asarray([states])
+            internals = OrderedDict((name, np.asarray([x])) for name, x in internals.items())
+
+        # Tensors: states, action masks, internals
+        tensors = dict()
+        if isinstance(states, dict):
+            states = dict(states)
+            for name, spec in self.actions_spec.items():
+                if spec['type'] == 'int' and name + '_mask' in states:
+                    tensors['auxiliaries/' + name + '_mask'] = states.pop(name + '_mask')
+        if len(self.states_spec) == 1 and next(iter(self.states_spec)) == 'state':
+            if isinstance(states, dict):
+                states = states['state']
+            tensors['states/state'] = states
+        else:
+            for name in self.states_spec:
+                if name in states:
+                    value = states[name]
+                else:
+                    value = states
+                    for key in name.split('/'):
+                        value = value[key]
+                tensors['states/' + name] = value
+        for name, spec in self.states_spec.items():
+            tensors['states/' + name] = np.asarray(
+                tensors['states/' + name], dtype=np_dtype_mapping[spec['type']]
+            )
+        for name, internal in internals.items():
+            tensors['internals/' + name] = np.asarray(internal, dtype=np.float32)
+
+        # Apply operations
+        for operation in self.operations:
+            self.functions[operation['type']](tensors=tensors, **operation)
+
+        actions = OrderedDict(
+            (name, tensors['actions/' + name].astype(np_dtype_mapping[spec['type']]))
+            for name, spec in self.actions_spec.items()
+        )
+        internals = OrderedDict(
+            (name, tensors['next-internals/' + name]) for name in self.internals_spec
+        )
+
+        # Unbatch actions and internals
+        if batched:
+            actions = [
+                OrderedDict((name, actions[name][n]) for name in actions)
+                for n in range(len(parallel))
+            ]
+        else:
+            actions = OrderedDict((name, action[0]) for name, action in actions.items())
+            internals = OrderedDict((name, internal[0]) for name, internal in internals.items())
+
+        # Reverse normalized actions dictionary
+        if len(self.actions_spec) == 1 and next(iter(self.actions_spec)) == 'action':
+            if batched:
+                actions = [x['action'] for x in actions]
+            else:
+                actions = actions['action']
+        elif any('/' in name for name in self.actions_spec):
+            if batched:
+                actions = [self.unpack_actions(actions=x) for x in actions]
+            else:
+                actions = self.unpack_actions(actions=actions)
+
+        if internals_is_none:
+            return actions
+        else:
+            return actions, internals
+
+    def unpack_actions(self, actions):
+        unpacked = OrderedDict()
+        for name, action in actions.items():
+            scope = unpacked
+            names = name.split('/')
+            for key in names[:-1]:
+                scope = scope.setdefault(key, OrderedDict())
+            scope[names[-1]] = action
+        return unpacked
+
+    def apply_dense(self, tensors, x, y, weights, **kwargs):
+        tensors[y] = np.matmul(tensors[x], self.weights[weights])
+
+    def apply_conv1d(self, tensors, x, y, weights, stride, padding, dilation, **kwargs):
+        tensors[y] = conv2d(
+            x=np.expand_dims(tensors[x], axis=1),
+            weights=np.expand_dims(self.weights[weights], axis=0), stride=(1, stride),
+            padding_type=padding, dilation=(1, dilation)
+        )[:, 0]
+
+    def apply_conv2d(self, tensors, x, y, weights, stride, padding, dilation, **kwargs):
+        tensors[y] = conv2d(
+            x=tensors[x], weights=self.weights[weights], stride=stride, padding_type=padding,
+            dilation=dilation
+        )
+
+    def apply_embedding(self, tensors, x, y, weights, max_norm, **kwargs):
+        embeddings = self.weights[weights][tensors[x].astype(np.int64)]
+        if max_norm is not None:
+            norm = np.sqrt(np.sum(np.square(embeddings), axis=-1, keepdims=True))
+            embeddings = embeddings * (max_norm / np.maximum(norm, max_norm))
+        tensors[y] = embeddings
+
+    def apply_bias_add(self, tensors, x, y, bias, **kwargs):
+        tensors[y] = tensors[x] + self.weights[bias]
+
+    def apply_squeeze(self, tensors, x, y, **kwargs):
+        tensors[y] = np.squeeze(tensors[x], axis=-1)
+
+    def apply_activation(self, tensors, x, y, nonlinearity, **kwargs):
+        tensors[y] = activation(x=tensors[x], nonlinearity=nonlinearity)
+
+    def apply_pooling(self, tensors, x, y, reduction, **kwargs):
+        x = tensors[x]
+        if reduction == 'concat':
+            tensors[y] = np.reshape(x, (x.shape[0], -1))
+            return
+        axes = tuple(range(1, x.ndim - 1))
+        if reduction == 'max':
+            tensors[y] = np.max(x, axis=axes)
+        elif reduction == 'mean':
+            tensors[y] = np.mean(x, axis=axes)
+        elif reduction == 'product':
+            tensors[y] = np.prod(x, axis=axes)
+        elif reduction == 'sum':
+            tensors[y] = np.sum(x, axis=axes)
+        else:
+            raise ValueError("Invalid reduction: {}.".format(reduction))
+
+    def apply_flatten(self, tensors, x, y, **kwargs):
+        x = tensors[x]
+        if x.ndim == 1:
+            tensors[y] = np.expand_dims(x, axis=1)
+        else:
+            tensors[y] = np.reshape(x, (x.shape[0], -1))
+
+    def apply_pool1d(self, tensors, x, y, reduction, window, stride, padding, **kwargs):
+        tensors[y] = pool2d(
+            x=np.expand_dims(tensors[x], axis=1), reduction=reduction, window=(1, window),
+            stride=(1, stride), padding_type=padding
+        )[:, 0]
+
+    def apply_pool2d(self, tensors, x, y, reduction, window, stride, padding, **kwargs):
+        tensors[y] = pool2d(
+            x=tensors[x], reduction=reduction, window=window, stride=stride, padding_type=padding
+        )
+
+    def apply_reshape(self, tensors, x, y, shape, **kwargs):
+        tensors[y] = np.reshape(tensors[x], ([-1] + shape))
+
+    def apply_retrieve(self, tensors, xs, y, aggregation, axis, rank, **kwargs):
+        xs = [expand_rank(x=tensors[x], rank=rank) for x in xs]
+        if aggregation == 'concat':
+            tensors[y] = np.concatenate(xs, axis=(axis + 1))
+        elif aggregation == 'product':
+            tensors[y] = np.prod(np.stack(xs, axis=(axis + 1)), axis=(axis + 1))
+        elif aggregation == 'stack':
+            tensors[y] = np.stack(xs, axis=(axis + 1))
+        elif aggregation == 'sum':
+            tensors[y] = np.sum(np.stack(xs, axis=(axis + 1)), axis=(axis + 1))
+        else:
+            raise ValueError("Invalid aggregation: {}.".format(aggregation))
+
+    def apply_lstm(
+        self, tensors, x, y, state, next_state, kernel, recurrent_kernel, bias, activation_type,
+        recurrent_activation, **kwargs
+    ):
+        h, c = tensors[state][:, 0], tensors[state][:, 1]
+        size = h.shape[1]
+        z = np.matmul(tensors[x], self.weights[kernel]) + \
+            np.matmul(h, self.weights[recurrent_kernel])
+        if bias is not None:
+            z += self.weights[bias]
+        i = activation(x=z[:, :size], nonlinearity=recurrent_activation)
+        f = activation(x=z[:, size: 2 * size], nonlinearity=recurrent_activation)
+        c = f * c + i * activation(x=z[:, 2 * size: 3 * size], nonlinearity=activation_type)
+        o = activation(x=z[:, 3 * size:], nonlinearity=recurrent_activation)
+        h = o * activation(x=c, nonlinearity=activation_type)
+        tensors[y] = h
+        tensors[next_state] = np.stack([h, c], axis=1)
+
+    def apply_gru(
+        self, tensors, x, y, state, next_state, kernel, recurrent_kernel, bias, activation_type,
+        recurrent_activation, reset_after, **kwargs
+    ):
+        h = tensors[state]
+        size = h.shape[1]
+        kernel = self.weights[kernel]
+        recurrent_kernel = self.weights[recurrent_kernel]
+        if bias is None:
+            input_bias = recurrent_bias = 0.0
+        elif reset_after:
+            input_bias, recurrent_bias = self.weights[bias][0], self.weights[bias][1]
+        else:
+            input_bias, recurrent_bias = self.weights[bias], 0.0
+        inputs = np.matmul(tensors[x], kernel) + input_bias
+        if reset_after:
+            recurrent = np.matmul(h, recurrent_kernel) + recurrent_bias
+        else:
+            recurrent = np.matmul(h, recurrent_kernel[:, :2 * size])
+        z = activation(
+            x=(inputs[:, :size] + recurrent[:, :size]), nonlinearity=recurrent_activation
+        )
+        r = activation(
+            x=(inputs[:, size: 2 * size] + recurrent[:, size: 2 * size]),
+            nonlinearity=recurrent_activation
+        )
+        if reset_after:
+            hh = inputs[:, 2 * size:] + r * recurrent[:, 2 * size:]
+        else:
+            hh = inputs[:, 2 * size:] + np.matmul(r * h, recurrent_kernel[:, 2 * size:])
+        h = z * h + (1.0 - z) * activation(x=hh, nonlinearity=activation_type)
+        tensors[y] = h
+        tensors[next_state] = h
+
+    def apply_categorical(
+        self, tensors, action_values, states_value, y, shape, num_values, mask, **kwargs
+    ):
+        action_values = np.reshape(tensors[action_values], ([-1] + shape + [num_values]))
+        if states_value is not None:
+            states_value = np.reshape(tensors[states_value], ([-1] + shape))
+            action_values = np.expand_dims(states_value, axis=-1) + action_values
+            action_values = action_values - np.mean(action_values, axis=-1, keepdims=True)
+        if mask in tensors:
+            min_float = np.finfo(action_values.dtype).min
+            action_values = np.where(tensors[mask], action_values, min_float)
+        tensors[y] = np.argmax(action_values, axis=-1)
+
+    def apply_gaussian(self, tensors, mean, y, shape, min_value, max_value, **kwargs):
+        action = tensors[mean]
+        if shape is not None:
+            action = np.reshape(action, ([-1] + shape))
+        if min_value is not None:
+            action = np.clip(action, min_value, max_value)
+        tensors[y] = action
+
+    def apply_beta(self, tensors, alpha, beta, y, shape, min_value, max_value, **kwargs):
+        log_epsilon = np.log(epsilon)
+        alpha = np.logaddexp(0.0, np.clip(tensors[alpha], log_epsilon, -log_epsilon)) + 1.0
+        beta = np.logaddexp(0.0, np.clip(tensors[beta], log_epsilon, -log_epsilon)) + 1.0
+        if shape is not None:
+            alpha = np.reshape(alpha, ([-1] + shape))
+            beta = np.reshape(beta, ([-1] + shape))
+        action = beta / np.maximum(alpha + beta, epsilon)
+        tensors[y] = min_value + (max_value - min_value) * action
+
+    def apply_bernoulli(self, tensors, logit, y, shape, **kwargs):
+        logit = tensors[logit]
+        if shape is not None:
+            logit = np.reshape(logit, ([-1] + shape))
+        probability = np.clip(
+            activation(x=logit, nonlinearity='sigmoid'), epsilon, 1.0 - epsilon
+        )
+        tensors[y] = (probability >= 0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Int8 post-training quantization of a NumPy runtime file'
+    )
+    parser.add_argument('path', type=str, help='Runtime file')
+    parser.add_argument('-o', '--output', type=str, default=None, help='Quantized runtime file')
+    parser.add_argument(
+        '-t', '--traces', type=str, default=None,
+        help='Directory with recorded traces to measure action agreement on'
+    )
+    parser.add_argument(
+        '--atol', type=float, default=1e-2, help='Absolute tolerance for float actions'
+    )
+    args = parser.parse_args()
+
+    quantized_path = quantize_runtime(path=args.path, quantized_path=args.output)
+
+    start = time.time()
+    agent = NumpyActonlyAgent(path=args.path)
+    load_time = time.time() - start
+    start = time.time()
+    quantized_agent = NumpyActonlyAgent(path=quantized_path)
+    quantized_load_time = time.time() - start
+
+    print('           file size [bytes]  load time [s]')
+    print('float32  {:>19}  {:>13.4f}'.format(os.path.getsize(args.path), load_time))
+    print('int8     {:>19}  {:>13.4f}'.format(
+        os.path.getsize(quantized_path), quantized_load_time
+    ))
+
+    if args.traces is not None:
+        rates = agreement_rate(
+            agent=quantized_agent, reference=agent, directory=args.traces, atol=args.atol
+        )
+        print('action agreement rate:')
+        for name, rate in rates.items():
+            print('  {}: {:.4f}'.format(name, rate))
+
+    agent.close()
+    quantized_agent.close()
+
+
+if __name__ == '__main__':
+    main()
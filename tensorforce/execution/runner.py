@@ -416,6 +416,7 @@ class Runner(object):
         self.rewards = [None for _ in self.environments]
         if self.evaluation_run:
             self.evaluation_internals = self.agent.initial_internals()
+            self.evaluation_reset = True
 
         # Required if agent was previously stopped mid-episode
         self.agent.reset()
@@ -569,10 +570,21 @@ class Runner(object):
 
         if self.evaluation_run and self.terminals[-1] <= 0:
             agent_start = time.time()
-            self.actions[-1], self.evaluation_internals = self.agent.act(
+            self.actions[-1] = self.act_evaluation()
+            self.episode_agent_second[-1] += time.time() - agent_start
+
+    def act_evaluation(self):
+        if self.agent.model.internals_slots_size > 0:
+            # Internal states remain in agent internals slot 0
+            actions = self.agent.act(
+                states=self.states[-1], evaluation=True, slot=0, reset=self.evaluation_reset
+            )
+        else:
+            actions, self.evaluation_internals = self.agent.act(
                 states=self.states[-1], internals=self.evaluation_internals, evaluation=True
             )
-            self.episode_agent_second[-1] += time.time() - agent_start
+        self.evaluation_reset = False
+        return actions
 
     def handle_act_evaluation(self):
         if self.batch_agent_calls:
@@ -580,9 +592,7 @@ class Runner(object):
 
         else:
             agent_start = time.time()
-            actions, self.evaluation_internals = self.agent.act(
-                states=self.states[-1], internals=self.evaluation_internals, evaluation=True
-            )
+            actions = self.act_evaluation()
             self.evaluation_agent_second += time.time() - agent_start
 
         self.environments[-1].start_execute(actions=actions)
@@ -716,3 +726,4 @@ class Runner(object):
             self.terminals[-1] = 0
             self.environments[-1].start_reset()
             self.evaluation_internals = self.agent.initial_internals()
+            self.evaluation_reset = True
@@ -0,0 +1,468 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from collections import OrderedDict
+import json
+import os
+from queue import Empty, Full, Queue
+from socket import AF_INET, SHUT_RDWR, socket as Socket
+import struct
+import sys
+from threading import Condition, Event, Lock, Thread
+import time
+
+import numpy as np
+
+from tensorforce import TensorforceError
+
+
+class WeightPublisher(object):
+    """
+    Publisher of agent weights to `WeightSubscriber`s in other processes, as versioned, flat
+    contiguous blob of all published variables, written into a shared memory block or sent to
+    subscribers connected via TCP or Unix socket.
+
+    The shared memory block consists of a header with sequence number, version, manifest and blob
+    size, followed by the JSON manifest of variable names, types, shapes and offsets, and the
+    blob. The sequence number is odd while the blob is written, so subscribers can detect and
+    retry torn reads. Socket subscribers receive the manifest when connecting and afterwards only
+    the latest version, stale versions queued for slow subscribers are dropped. Shared memory
+    requires Python 3.8 or later, Unix sockets are not available on Windows.
+
+    Args:
+        agent (Agent): Agent whose variables are published
+            (<span style="color:#C00000"><b>required</b></span>).
+        variables (list[str]): Names of published variables
+            (<span style="color:#00C000"><b>default</b></span>: all saved variables).
+        name (str): Shared memory block name
+            (<span style="color:#00C000"><b>default</b></span>: generated name if neither port
+            nor path is given, see `publisher.name`).
+        host (string): Host address for TCP socket
+            (<span style="color:#00C000"><b>default</b></span>: all interfaces if port is given).
+        port (int > 0): Port for TCP socket
+            (<span style="color:#00C000"><b>default</b></span>: shared memory).
+        path (string): Path for Unix socket
+            (<span style="color:#00C000"><b>default</b></span>: shared memory).
+    """
+
+    # Sequence number, version, manifest size, blob size
+    HEADER = struct.Struct('<QQQQ')
+
+    # Version, payload size
+    MESSAGE_HEADER = struct.Struct('<QQ')
+
+    @classmethod
+    def send(cls, connection, version, payload):
+        connection.sendall(cls.MESSAGE_HEADER.pack(version, len(payload)))
+        connection.sendall(payload)
+
+    @classmethod
+    def receive(cls, connection):
+        """
+        Receives a message, or returns None if the connection was closed.
+        """
+        header = cls.receive_bytes(connection=connection, num_bytes=cls.MESSAGE_HEADER.size)
+        if header is None:
+            return None
+        version, num_bytes = cls.MESSAGE_HEADER.unpack(header)
+        payload = cls.receive_bytes(connection=connection, num_bytes=num_bytes)
+        if payload is None:
+            raise TensorforceError.unexpected()
+        return version, payload
+
+    @classmethod
+    def receive_bytes(cls, connection, num_bytes):
+        payload = bytearray(num_bytes)
+        view = memoryview(payload)
+        index = 0
+        while index < num_bytes:
+            num_received = connection.recv_into(view[index:])
+            if num_received == 0:
+                if index == 0 and num_bytes > 0:
+                    return None
+                raise TensorforceError.unexpected()
+            index += num_received
+        return payload
+
+    def __init__(self, agent, variables=None, name=None, host=None, port=None, path=None):
+        if port is not None and path is not None:
+            raise TensorforceError.invalid(
+                name='WeightPublisher', argument='path', condition='port'
+            )
+        if name is not None and (port is not None or path is not None):
+            raise TensorforceError.invalid(
+                name='WeightPublisher', argument='name', condition='port or path'
+            )
+        if host is not None and port is None:
+            raise TensorforceError.invalid(
+                name='WeightPublisher', argument='host', condition='no port'
+            )
+
+        self.agent = agent
+        if variables is None:
+            variables = list(self.agent.model.saved_variable_names)
+        self.variables = list(variables)
+        self.version = 0
+
+        # Manifest of flat blob layout, offsets aligned to 8 bytes
+        values = self.agent.get_variables_values(variables=self.variables)
+        self.manifest = list()
+        offset = 0
+        for variable, value in values.items():
+            value = np.asarray(value)
+            self.manifest.append(OrderedDict(
+                name=variable, dtype=value.dtype.str, shape=list(value.shape), offset=offset
+            ))
+            offset += -(-value.nbytes // 8) * 8
+        self.blob_size = offset
+        manifest = json.dumps(obj=self.manifest).encode()
+        self.manifest_bytes = manifest + b' ' * (-len(manifest) % 8)
+
+        self.host = host
+        self.port = port
+        self.path = path
+        if port is None and path is None:
+            # Shared memory block with header, manifest and blob
+            from multiprocessing.shared_memory import SharedMemory  # Python >= 3.8
+
+            size = self.__class__.HEADER.size + len(self.manifest_bytes) + self.blob_size
+            self.shared_memory = SharedMemory(name=name, create=True, size=size)
+            self.name = self.shared_memory.name
+            self.header = np.ndarray(shape=(4,), dtype=np.uint64, buffer=self.shared_memory.buf)
+            start = self.__class__.HEADER.size
+            self.shared_memory.buf[start: start + len(self.manifest_bytes)] = self.manifest_bytes
+            start += len(self.manifest_bytes)
+            self.blob = np.ndarray(
+                shape=(self.blob_size,), dtype=np.uint8, buffer=self.shared_memory.buf,
+                offset=start
+            )
+            self.header[:] = (0, 0, len(self.manifest_bytes), self.blob_size)
+            self.socket = None
+
+        else:
+            self.shared_memory = None
+            self.name = None
+            self.blob = np.zeros(shape=(self.blob_size,), dtype=np.uint8)
+            if path is None:
+                self.socket = Socket(AF_INET)
+                self.socket.bind(('' if host is None else host, port))
+            else:
+                if os.path.exists(path):
+                    os.remove(path)
+                from socket import AF_UNIX  # not available on Windows
+
+                self.socket = Socket(AF_UNIX)
+                self.socket.bind(path)
+            self.socket.listen()
+
+            # Per-subscriber queues holding at most the latest version
+            self.stopped = Event()
+            self.subscribers_lock = Lock()
+            self.subscribers = OrderedDict()
+            self.threads = [Thread(target=self.accept_loop, daemon=True)]
+            self.threads[0].start()
+
+    def close(self):
+        """
+        Closes all subscriber connections, or releases the shared memory block.
+        """
+        if self.shared_memory is not None:
+            self.header = None
+            self.blob = None
+            self.shared_memory.close()
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+        elif self.socket is not None:
+            self.stopped.set()
+            try:
+                self.socket.shutdown(SHUT_RDWR)
+            except OSError:
+                pass
+            self.socket.close()
+            with self.subscribers_lock:
+                for connection, queue in self.subscribers.items():
+                    try:
+                        queue.put_nowait(None)
+                    except Full:
+                        pass
+                    try:
+                        connection.shutdown(SHUT_RDWR)
+                    except OSError:
+                        pass
+            for thread in self.threads:
+                thread.join()
+            self.socket = None
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def publish(self):
+        """
+        Retrieves the current values of the published variables in one call and publishes them
+        as new version.
+
+        Returns:
+            int: Published version.
+        """
+        values = self.agent.get_variables_values(variables=self.variables)
+        self.version += 1
+
+        if self.shared_memory is not None:
+            # Odd sequence number while writing
+            self.header[0] += 1
+            self.write_blob(values=values)
+            self.header[1] = self.version
+            self.header[0] += 1
+
+        else:
+            self.write_blob(values=values)
+            payload = self.blob.tobytes()
+            with self.subscribers_lock:
+                for queue in self.subscribers.values():
+                    # Replace stale version not yet sent
+                    try:
+                        queue.get_nowait()
+                    except Empty:
+                        pass
+                    queue.put_nowait((self.version, payload))
+
+        return self.version
+
+    def write_blob(self, values):
+        for spec in self.manifest:
+            value = np.require(values[spec['name']], dtype=spec['dtype'], requirements='C')
+            offset = spec['offset']
+            self.blob[offset: offset + value.nbytes] = value.reshape(-1).view(np.uint8)
+
+    def accept_loop(self):
+        while not self.stopped.is_set():
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                break
+            queue = Queue(maxsize=1)
+            try:
+                self.__class__.send(connection=connection, version=0, payload=self.manifest_bytes)
+            except OSError:
+                connection.close()
+                continue
+            with self.subscribers_lock:
+                self.subscribers[connection] = queue
+                if self.version > 0:
+                    queue.put_nowait((self.version, self.blob.tobytes()))
+            thread = Thread(target=self.send_loop, args=(connection, queue), daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def send_loop(self, connection, queue):
+        try:
+            while not self.stopped.is_set():
+                message = queue.get()
+                if message is None:
+                    break
+                version, payload = message
+                self.__class__.send(connection=connection, version=version, payload=payload)
+
+        except OSError:
+            pass
+
+        finally:
+            with self.subscribers_lock:
+                self.subscribers.pop(connection, None)
+            connection.close()
+
+
+class WeightSubscriber(object):
+    """
+    Subscriber of agent weights published by a `WeightPublisher`, which assigns newer versions to
+    the agent in one bulk assignment when polled and skips stale versions.
+
+    Args:
+        agent (Agent): Agent to assign the published variables to, for instance an
+            inference-only agent
+            (<span style="color:#C00000"><b>required</b></span>).
+        name (str): Shared memory block name
+            (<span style="color:#C00000"><b>required</b></span> unless port or path is given).
+        host (string): Host address of TCP socket
+            (<span style="color:#00C000"><b>default</b></span>: "localhost" if port is given).
+        port (int > 0): Port of TCP socket
+            (<span style="color:#C00000"><b>required</b></span> unless name or path is given).
+        path (string): Path of Unix socket
+            (<span style="color:#C00000"><b>required</b></span> unless name or port is given).
+        max_retries (int > 0): Maximum number of attempts to read a consistent shared memory blob
+            per poll
+            (<span style="color:#00C000"><b>default</b></span>: 100).
+    """
+
+    @classmethod
+    def attach_shared_memory(cls, name):
+        """
+        Attaches to an existing shared memory block without tracking it, since the block is owned
+        and unlinked by the publisher.
+        """
+        from multiprocessing.shared_memory import SharedMemory  # Python >= 3.8
+
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name=name, track=False)
+
+        shared_memory = SharedMemory(name=name)
+        if os.name == 'posix':
+            # Attaching registers the block with the resource tracker of this process, which would
+            # otherwise unlink it on exit, using the internal name with leading slash on POSIX
+            # (Windows has no resource tracker and frees the block with its last handle)
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister('/' + shared_memory.name, 'shared_memory')
+        return shared_memory
+
+    def __init__(self, agent, name=None, host=None, port=None, path=None, max_retries=100):
+        if sum(x is not None for x in (name, port, path)) != 1:
+            raise TensorforceError.required(
+                name='WeightSubscriber', argument='name, port or path', condition='only one'
+            )
+
+        self.agent = agent
+        self.max_retries = max_retries
+        self.version = 0
+
+        if name is not None:
+            self.shared_memory = self.__class__.attach_shared_memory(name=name)
+            self.header = np.ndarray(shape=(4,), dtype=np.uint64, buffer=self.shared_memory.buf)
+            start = WeightPublisher.HEADER.size
+            manifest_size = int(self.header[2])
+            self.manifest = json.loads(
+                bytes(self.shared_memory.buf[start: start + manifest_size]).decode()
+            )
+            self.blob = np.ndarray(
+                shape=(int(self.header[3]),), dtype=np.uint8, buffer=self.shared_memory.buf,
+                offset=(start + manifest_size)
+            )
+            self.connection = None
+
+        else:
+            self.shared_memory = None
+            if path is None:
+                self.connection = Socket(AF_INET)
+                self.connection.connect(('localhost' if host is None else host, port))
+            else:
+                from socket import AF_UNIX  # not available on Windows
+
+                self.connection = Socket(AF_UNIX)
+                self.connection.connect(path)
+            message = WeightPublisher.receive(connection=self.connection)
+            if message is None:
+                raise TensorforceError(message="Weight publisher closed the connection.")
+            self.manifest = json.loads(bytes(message[1]).decode())
+
+            # Latest received version, newer versions replace unassigned ones
+            self.received = Condition()
+            self.latest = None
+            self.thread = Thread(target=self.receive_loop, daemon=True)
+            self.thread.start()
+
+    def close(self):
+        """
+        Closes the connection to the publisher, or detaches from the shared memory block.
+        """
+        if self.shared_memory is not None:
+            self.header = None
+            self.blob = None
+            self.shared_memory.close()
+            self.shared_memory = None
+
+        elif self.connection is not None:
+            try:
+                self.connection.shutdown(SHUT_RDWR)
+            except OSError:
+                pass
+            self.connection.close()
+            self.thread.join()
+            self.connection = None
+
+    def poll(self, timeout=None):
+        """
+        Assigns the latest published version to the agent if it is newer than the current
+        version.
+
+        Args:
+            timeout (float >= 0.0): Maximum time in seconds to wait for a newer version
+                (<span style="color:#00C000"><b>default</b></span>: no waiting).
+
+        Returns:
+            bool: Whether a newer version was assigned, see `subscriber.version`.
+        """
+        deadline = time.time() + (0.0 if timeout is None else timeout)
+
+        if self.shared_memory is not None:
+            while True:
+                message = self.read_blob()
+                if message is not None or time.time() >= deadline:
+                    break
+                time.sleep(0.001)
+
+        else:
+            with self.received:
+                self.received.wait_for(
+                    predicate=(
+                        lambda: self.latest is not None and self.latest[0] > self.version
+                    ), timeout=max(deadline - time.time(), 0.0)
+                )
+                message = self.latest
+                self.latest = None
+            if message is not None and message[0] <= self.version:
+                message = None
+
+        if message is None:
+            return False
+
+        version, blob = message
+        values = OrderedDict()
+        for spec in self.manifest:
+            dtype = np.dtype(spec['dtype'])
+            size = int(np.prod(spec['shape'], dtype=np.int64)) * dtype.itemsize
+            values[spec['name']] = np.frombuffer(
+                blob, dtype=dtype, count=(size // dtype.itemsize), offset=spec['offset']
+            ).reshape(spec['shape'])
+        self.agent.assign_variables(values=values)
+        self.version = version
+        return True
+
+    def read_blob(self):
+        # Consistent copy of a newer blob, retried while the publisher writes
+        for _ in range(self.max_retries):
+            sequence = int(self.header[0])
+            if sequence % 2 == 1:
+                time.sleep(0.0001)
+                continue
+            version = int(self.header[1])
+            if version <= self.version:
+                return None
+            blob = self.blob.copy()
+            if int(self.header[0]) == sequence:
+                return version, blob
+        return None
+
+    def receive_loop(self):
+        try:
+            while True:
+                message = WeightPublisher.receive(connection=self.connection)
+                if message is None:
+                    break
+                with self.received:
+                    self.latest = message
+                    self.received.notify_all()
+
+        except (OSError, TensorforceError):
+            pass
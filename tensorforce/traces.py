@@ -0,0 +1,632 @@
+# Copyright 2020 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Experience traces as written by the agent recorder: a directory of append-only segments, each
+consisting of one uncompressed, memory-mappable NumPy file per value, and an index "traces.json"
+with the values specification and the list of retained segments.
+
+Compressed trace archives of previous recorder versions can be converted to segments in parallel:
+
+    python -m tensorforce.traces convert data/archives data/traces --agent agent.json
+"""
+
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+from queue import Empty, Queue
+import shutil
+import struct
+from threading import Event, Thread
+
+import numpy as np
+
+from tensorforce import util
+from tensorforce.exception import TensorforceError
+
+
+# Fixed NumPy file header size, so that headers can be rewritten in-place once the number of
+# appended rows is known
+HEADER_SIZE = 256
+
+
+def npy_header(dtype, shape):
+    """
+    Returns a NumPy format version 1.0 header of fixed size for the given dtype and shape.
+    """
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+        np.lib.format.dtype_to_descr(np.dtype(dtype)), tuple(shape)
+    )
+    preamble_size = len(np.lib.format.MAGIC_PREFIX) + 4
+    if len(header) + 1 > HEADER_SIZE - preamble_size:
+        raise TensorforceError.value(
+            name='traces', argument='shape', value=shape, hint='header exceeds size'
+        )
+    header = header.ljust(HEADER_SIZE - preamble_size - 1) + '\n'
+    return np.lib.format.MAGIC_PREFIX + bytes((1, 0)) + struct.pack('<H', len(header)) + \
+        header.encode('latin1')
+
+
+def read_index(directory):
+    """
+    Returns the traces index of the given directory, or None if there is no index.
+    """
+    path = os.path.join(directory, 'traces.json')
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r') as filehandle:
+        return json.load(fp=filehandle, object_pairs_hook=OrderedDict)
+
+
+def write_index(directory, index):
+    """
+    Atomically replaces the traces index of the given directory.
+    """
+    temp_path = os.path.join(directory, '.traces.json.tmp')
+    with open(temp_path, 'w') as filehandle:
+        json.dump(obj=index, fp=filehandle)
+        filehandle.flush()
+        os.fsync(filehandle.fileno())
+    os.replace(temp_path, os.path.join(directory, 'traces.json'))
+
+
+def load_segment(path, spec, mmap_mode=None):
+    """
+    Returns the values of the trace segment at the given path, optionally memory-mapped.
+    """
+    return OrderedDict(
+        (name, np.load(
+            file=os.path.join(path, name.replace('/', '.') + '.npy'), mmap_mode=mmap_mode,
+            allow_pickle=False
+        )) for name in spec
+    )
+
+
+def values_spec(states_spec, actions_spec):
+    """
+    Returns the traces values specification for the given states and actions specification, in
+    the order written by the recorder.
+    """
+    spec = OrderedDict()
+    for name, state_spec in states_spec.items():
+        spec[name] = OrderedDict(
+            dtype=np.dtype(util.np_dtype(dtype=state_spec['type'])).str,
+            shape=list(state_spec['shape'])
+        )
+    for name, action_spec in actions_spec.items():
+        spec[name] = OrderedDict(
+            dtype=np.dtype(util.np_dtype(dtype=action_spec['type'])).str,
+            shape=list(action_spec['shape'])
+        )
+        if action_spec['type'] == 'int':
+            spec[name + '_mask'] = OrderedDict(
+                dtype=np.dtype(util.np_dtype(dtype='bool')).str,
+                shape=(list(action_spec['shape']) + [action_spec['num_values']])
+            )
+    spec['terminal'] = OrderedDict(dtype=np.dtype(util.np_dtype(dtype='long')).str, shape=[])
+    spec['reward'] = OrderedDict(dtype=np.dtype(util.np_dtype(dtype='float')).str, shape=[])
+    return spec
+
+
+def load_archive(path, states_spec, actions_spec):
+    """
+    Returns the values of the compressed trace archive at the given path, as written by previous
+    recorder versions, validated against and converted to the states and actions specification.
+    """
+    spec = values_spec(states_spec=states_spec, actions_spec=actions_spec)
+
+    with np.load(file=path, allow_pickle=False) as archive:
+        if sorted(archive.files) != sorted(spec):
+            raise TensorforceError.value(
+                name='traces', argument='archive', value=path,
+                hint=('values ' + ','.join(sorted(archive.files)))
+            )
+        values = OrderedDict()
+        for name, value_spec in spec.items():
+            value = archive[name]
+            if list(value.shape[1:]) != value_spec['shape']:
+                raise TensorforceError.value(
+                    name='traces', argument='archive', value=path,
+                    hint='invalid shape for {} value'.format(name)
+                )
+            dtype = np.dtype(value_spec['dtype'])
+            if not np.can_cast(from_=value.dtype, to=dtype, casting='same_kind'):
+                raise TensorforceError.value(
+                    name='traces', argument='archive', value=path,
+                    hint='invalid type for {} value'.format(name)
+                )
+            values[name] = value.astype(dtype=dtype, copy=False)
+
+    terminal = values['terminal']
+    if any(value.shape[0] != terminal.shape[0] for value in values.values()):
+        raise TensorforceError.value(
+            name='traces', argument='archive', value=path, hint='incompatible number of timesteps'
+        )
+    if terminal.shape[0] > 0 and terminal[-1] == 0:
+        raise TensorforceError.value(
+            name='traces', argument='archive', value=path, hint='incomplete episode'
+        )
+
+    for name, value_spec in list(states_spec.items()) + list(actions_spec.items()):
+        value = values[name]
+        if value_spec['type'] == 'int':
+            if (value < 0).any() or (value >= value_spec['num_values']).any():
+                raise TensorforceError.value(
+                    name='traces', argument='archive', value=path,
+                    hint='{} value not in [0, {})'.format(name, value_spec['num_values'])
+                )
+        elif value_spec['type'] == 'float':
+            if ('min_value' in value_spec and (value < value_spec['min_value']).any()) or \
+                    ('max_value' in value_spec and (value > value_spec['max_value']).any()):
+                raise TensorforceError.value(
+                    name='traces', argument='archive', value=path,
+                    hint='{} value out of bounds'.format(name)
+                )
+
+    return values
+
+
+def load_archives(paths, states_spec, actions_spec, num_workers=None):
+    """
+    Yields the validated values of the given compressed trace archives in order, decompressed by
+    a process pool.
+
+    Args:
+        paths (iter[str]): Trace archive paths
+            (<span style="color:#C00000"><b>required</b></span>).
+        states_spec (specification): States specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        actions_spec (specification): Actions specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        num_workers (int > 0): Number of worker processes
+            (<span style="color:#00C000"><b>default</b></span>: number of processors).
+    """
+    states_spec = util.valid_values_spec(
+        values_spec=states_spec, value_type='state', return_normalized=True
+    )
+    actions_spec = util.valid_values_spec(
+        values_spec=actions_spec, value_type='action', return_normalized=True
+    )
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        yield from executor.map(
+            load_archive, paths, [states_spec] * len(paths), [actions_spec] * len(paths)
+        )
+
+
+def convert_archive(path, segment_path, states_spec, actions_spec):
+    # Decompress, validate and write as uncompressed segment, in a worker process
+    values = load_archive(path=path, states_spec=states_spec, actions_spec=actions_spec)
+    os.makedirs(segment_path)
+    for name, value in values.items():
+        np.save(
+            file=os.path.join(segment_path, name.replace('/', '.') + '.npy'), arr=value,
+            allow_pickle=False
+        )
+    terminal = values['terminal']
+    return int(np.count_nonzero(terminal)), terminal.shape[0]
+
+
+def convert(source, directory, states_spec, actions_spec, num_workers=None):
+    """
+    Converts the compressed trace archives "trace-*.npz" of a source directory, as written by
+    previous recorder versions, to segments of a traces directory, decompressed, validated and
+    re-encoded by a process pool, and appended to the index of the traces directory if it exists.
+
+    Args:
+        source (str): Trace archives directory
+            (<span style="color:#C00000"><b>required</b></span>).
+        directory (str): Traces directory
+            (<span style="color:#C00000"><b>required</b></span>).
+        states_spec (specification): States specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        actions_spec (specification): Actions specification
+            (<span style="color:#C00000"><b>required</b></span>).
+        num_workers (int > 0): Number of worker processes
+            (<span style="color:#00C000"><b>default</b></span>: number of processors).
+
+    Returns:
+        int: Number of converted episodes.
+    """
+    states_spec = util.valid_values_spec(
+        values_spec=states_spec, value_type='state', return_normalized=True
+    )
+    actions_spec = util.valid_values_spec(
+        values_spec=actions_spec, value_type='action', return_normalized=True
+    )
+    spec = values_spec(states_spec=states_spec, actions_spec=actions_spec)
+
+    # Archives named "trace-[EPISODES]-[TIME].npz", in recording order
+    paths = [
+        os.path.join(source, f) for f in os.listdir(source)
+        if f.startswith('trace-') and f.endswith('.npz')
+    ]
+    paths.sort(key=(lambda path: int(os.path.basename(path).split('-')[1])))
+    if len(paths) == 0:
+        raise TensorforceError.value(
+            name='traces', argument='source', value=source, hint='no trace archives'
+        )
+
+    os.makedirs(directory, exist_ok=True)
+    index = read_index(directory=directory)
+    if index is None:
+        index = OrderedDict(next=0, spec=spec, segments=list())
+    elif len(index['segments']) > 0 and index['spec'] != spec:
+        raise TensorforceError.value(
+            name='traces', argument='directory', value=directory, hint='incompatible traces'
+        )
+    index['spec'] = spec
+
+    # Temporary segment directories, renamed once all archives are converted
+    segments = ['segment-{:06d}'.format(index['next'] + n) for n in range(len(paths))]
+    temp_paths = [os.path.join(directory, '.' + segment + '.tmp') for segment in segments]
+    try:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(
+                convert_archive, paths, temp_paths, [states_spec] * len(paths),
+                [actions_spec] * len(paths)
+            ))
+    except BaseException:
+        for temp_path in temp_paths:
+            if os.path.isdir(temp_path):
+                shutil.rmtree(temp_path)
+        raise
+
+    num_episodes = 0
+    for segment, temp_path, (episodes, timesteps) in zip(segments, temp_paths, results):
+        os.replace(temp_path, os.path.join(directory, segment))
+        index['segments'].append(OrderedDict(name=segment, episodes=episodes, timesteps=timesteps))
+        num_episodes += episodes
+    index['next'] += len(segments)
+    write_index(directory=directory, index=index)
+
+    return num_episodes
+
+
+class TraceWriter(object):
+    """
+    Writes experience traces on a background thread, appending timestep chunks to the files of
+    the current segment, which is completed after the given number of episodes, and tracking
+    retained segments in the index.
+
+    Args:
+        directory (str): Traces directory
+            (<span style="color:#C00000"><b>required</b></span>).
+        frequency (int > 0): Number of episodes per segment
+            (<span style="color:#00C000"><b>default</b></span>: 1).
+        max_traces (int > 0): Maximum number of segments to keep
+            (<span style="color:#00C000"><b>default</b></span>: all).
+        max_pending (int > 0): Maximum number of chunks queued for writing, after which appending
+            blocks
+            (<span style="color:#00C000"><b>default</b></span>: 64).
+    """
+
+    def __init__(self, directory, frequency=1, max_traces=None, max_pending=64):
+        self.directory = directory
+        self.frequency = frequency
+        self.max_traces = max_traces
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.index = read_index(directory=self.directory)
+        if self.index is None:
+            self.index = OrderedDict(next=0, spec=None, segments=list())
+
+        # Current segment
+        self.segment = None
+        self.files = None
+        self.num_rows = 0
+        self.num_episode_rows = 0
+        self.num_episodes = 0
+
+        self.exceptions = list()
+        self.chunks = Queue(maxsize=max_pending)
+        self.thread = Thread(target=self.run, name=('recorder-' + self.directory), daemon=True)
+        self.thread.start()
+
+    def append(self, values):
+        """
+        Enqueues a chunk of consecutive timesteps of one episode, blocks if the queue is full.
+
+        Args:
+            values (dict[array]): Values including "terminal" and "reward", batched over
+                timesteps
+                (<span style="color:#C00000"><b>required</b></span>).
+        """
+        if len(self.exceptions) > 0:
+            raise self.exceptions.pop(0)
+        self.chunks.put(values)
+
+    def close(self):
+        """
+        Writes all pending chunks, completes the current segment if it contains complete episodes,
+        and stops the writer thread.
+        """
+        self.chunks.put(None)
+        self.thread.join()
+        if len(self.exceptions) > 0:
+            raise self.exceptions.pop(0)
+
+    def run(self):
+        while True:
+            values = self.chunks.get()
+            try:
+                if values is None:
+                    self.complete_segment()
+                    break
+                self.write(values=values)
+            except BaseException as exc:
+                self.exceptions.append(exc)
+                if values is None:
+                    break
+
+    def write(self, values):
+        spec = OrderedDict(
+            (name, OrderedDict(dtype=value.dtype.str, shape=list(value.shape[1:])))
+            for name, value in values.items()
+        )
+        if self.index['spec'] is None or len(self.index['segments']) == 0:
+            self.index['spec'] = spec
+        elif self.index['spec'] != spec:
+            raise TensorforceError.value(
+                name='recorder', argument='directory', value=self.directory,
+                hint='incompatible traces'
+            )
+
+        if self.segment is None:
+            # Temporary segment directory, renamed once completed
+            self.segment = 'segment-{:06d}'.format(self.index['next'])
+            path = os.path.join(self.directory, '.' + self.segment + '.tmp')
+            os.makedirs(path, exist_ok=True)
+            self.files = OrderedDict()
+            for name, value in values.items():
+                filehandle = open(os.path.join(path, name.replace('/', '.') + '.npy'), 'wb')
+                filehandle.write(npy_header(dtype=value.dtype, shape=((0,) + value.shape[1:])))
+                self.files[name] = filehandle
+
+        for name, value in values.items():
+            self.files[name].write(np.require(value, requirements='C').tobytes())
+        terminal = values['terminal']
+        self.num_rows += terminal.shape[0]
+        if terminal[-1] > 0:
+            self.num_episodes += int(np.count_nonzero(terminal))
+            self.num_episode_rows = self.num_rows
+
+        if self.num_episodes >= self.frequency:
+            self.complete_segment()
+
+    def complete_segment(self):
+        if self.segment is None:
+            return
+        path = os.path.join(self.directory, '.' + self.segment + '.tmp')
+
+        # Rewrite headers with the number of rows of complete episodes
+        for name, filehandle in self.files.items():
+            spec = self.index['spec'][name]
+            size = int(np.prod(spec['shape'], dtype=np.int64)) * np.dtype(spec['dtype']).itemsize
+            filehandle.truncate(HEADER_SIZE + self.num_episode_rows * size)
+            filehandle.seek(0)
+            filehandle.write(npy_header(
+                dtype=spec['dtype'], shape=([self.num_episode_rows] + spec['shape'])
+            ))
+            filehandle.flush()
+            os.fsync(filehandle.fileno())
+            filehandle.close()
+
+        if self.num_episode_rows == 0:
+            shutil.rmtree(path)
+
+        else:
+            os.replace(path, os.path.join(self.directory, self.segment))
+            self.index['segments'].append(OrderedDict(
+                name=self.segment, episodes=self.num_episodes, timesteps=self.num_episode_rows
+            ))
+            self.index['next'] += 1
+
+            # Retention tracked by index, removed segments deleted after index is replaced
+            removed = list()
+            if self.max_traces is not None and len(self.index['segments']) > self.max_traces:
+                removed = self.index['segments'][:-self.max_traces]
+                self.index['segments'] = self.index['segments'][-self.max_traces:]
+            write_index(directory=self.directory, index=self.index)
+            for segment in removed:
+                shutil.rmtree(os.path.join(self.directory, segment['name']))
+
+        self.segment = None
+        self.files = None
+        self.num_rows = 0
+        self.num_episode_rows = 0
+        self.num_episodes = 0
+
+
+class TraceDataset(object):
+    """
+    Episodes of the trace segments of a directory, indexed once and memory-mapped, from which
+    batches of episodes are sampled without reloading, optionally prepared by a prefetch thread.
+
+    Args:
+        directory (str): Traces directory with index "traces.json"
+            (<span style="color:#C00000"><b>required</b></span>).
+    """
+
+    def __init__(self, directory):
+        index = read_index(directory=directory)
+        if index is None:
+            raise TensorforceError.value(
+                name='TraceDataset', argument='directory', value=directory,
+                hint='no traces index'
+            )
+        self.spec = index['spec']
+        self.segments = [
+            load_segment(
+                path=os.path.join(directory, segment['name']), spec=self.spec, mmap_mode='r'
+            ) for segment in index['segments']
+        ]
+
+        # Segment, start and end timestep of all episodes
+        episodes = list()
+        for n, segment in enumerate(self.segments):
+            ends = np.nonzero(segment['terminal'])[0] + 1
+            starts = np.concatenate([np.zeros(shape=(1,), dtype=ends.dtype), ends[:-1]])
+            episodes.append(np.stack([np.full_like(ends, fill_value=n), starts, ends], axis=1))
+        if len(episodes) == 0:
+            self.episodes = np.zeros(shape=(0, 3), dtype=np.int64)
+        else:
+            self.episodes = np.concatenate(episodes, axis=0)
+
+    @property
+    def num_episodes(self):
+        return self.episodes.shape[0]
+
+    @property
+    def num_timesteps(self):
+        return int(np.sum(self.episodes[:, 2] - self.episodes[:, 1]))
+
+    def batch(self, episodes):
+        """
+        Returns the values of the given episodes, concatenated over timesteps.
+
+        Args:
+            episodes (iter[int]): Episode indices
+                (<span style="color:#C00000"><b>required</b></span>).
+
+        Returns:
+            dict[array]: Values including "terminal" and "reward".
+        """
+        return OrderedDict(
+            (name, np.concatenate([
+                self.segments[segment][name][start: end]
+                for segment, start, end in self.episodes[episodes]
+            ])) for name in self.spec
+        )
+
+    def sample(self, num_episodes=None):
+        """
+        Returns the values of randomly sampled episodes, without replacement.
+
+        Args:
+            num_episodes (int > 0): Number of episodes
+                (<span style="color:#00C000"><b>default</b></span>: all episodes).
+
+        Returns:
+            dict[array]: Values including "terminal" and "reward".
+        """
+        if self.num_episodes == 0:
+            raise TensorforceError(message="TraceDataset contains no episodes.")
+        if num_episodes is None or num_episodes > self.num_episodes:
+            num_episodes = self.num_episodes
+        episodes = np.random.choice(self.num_episodes, size=num_episodes, replace=False)
+        return self.batch(episodes=np.sort(episodes))
+
+    def prefetch(self, num_batches, num_episodes=None):
+        """
+        Yields randomly sampled batches of episodes, with the next batch prepared by a background
+        thread while the current one is processed.
+
+        Args:
+            num_batches (int > 0): Number of batches
+                (<span style="color:#C00000"><b>required</b></span>).
+            num_episodes (int > 0): Number of episodes per batch
+                (<span style="color:#00C000"><b>default</b></span>: all episodes).
+        """
+        def prefetch():
+            try:
+                for _ in range(num_batches):
+                    batch = self.sample(num_episodes=num_episodes)
+                    if stopped.is_set():
+                        return
+                    batches.put(batch)
+                if not stopped.is_set():
+                    batches.put(None)
+            except BaseException as exc:
+                if not stopped.is_set():
+                    batches.put(exc)
+
+        batches = Queue(maxsize=1)
+        stopped = Event()
+        thread = Thread(target=prefetch, daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                elif isinstance(batch, BaseException):
+                    raise batch
+                yield batch
+
+        finally:
+            # Unblock and stop the prefetch thread, also if the consumer failed or stopped early
+            stopped.set()
+            while True:
+                try:
+                    batches.get_nowait()
+                except Empty:
+                    break
+            thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tensorforce traces')
+    subparsers = parser.add_subparsers(dest='command')
+    parser_convert = subparsers.add_parser(
+        'convert', help='Convert compressed trace archives to memory-mappable segments'
+    )
+    parser_convert.add_argument('source', type=str, help='Trace archives directory')
+    parser_convert.add_argument('directory', type=str, help='Traces directory')
+    parser_convert.add_argument(
+        '-a', '--agent', type=str, default=None,
+        help='Agent configuration JSON file with states and actions specification'
+    )
+    parser_convert.add_argument(
+        '-e', '--environment', type=str, default=None,
+        help='Environment (name or module), alternatively to agent'
+    )
+    parser_convert.add_argument('-l', '--level', type=str, default=None, help='Level')
+    parser_convert.add_argument(
+        '-w', '--workers', type=int, default=None,
+        help='Number of worker processes (default: number of processors)'
+    )
+    args = parser.parse_args()
+
+    if args.command != 'convert':
+        parser.print_help()
+        return
+
+    if args.agent is not None:
+        with open(args.agent, 'r') as filehandle:
+            agent = json.load(fp=filehandle)
+        states_spec = agent['states']
+        actions_spec = agent['actions']
+    elif args.environment is not None:
+        from tensorforce import Environment
+        environment = Environment.create(environment=args.environment, level=args.level)
+        states_spec = environment.states()
+        actions_spec = environment.actions()
+        environment.close()
+    else:
+        raise TensorforceError.required(name='traces', argument='agent or environment')
+
+    num_episodes = convert(
+        source=args.source, directory=args.directory, states_spec=states_spec,
+        actions_spec=actions_spec, num_workers=args.workers
+    )
+    print('Converted {} episodes to {}'.format(num_episodes, args.directory))
+
+
+if __name__ == '__main__':
+    main()
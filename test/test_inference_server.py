@@ -0,0 +1,200 @@
+# Copyright 2018 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+from threading import Event, Thread
+import time
+import unittest
+
+import numpy as np
+
+from tensorforce import Agent, Environment, TensorforceError
+from tensorforce.execution import InferenceClient, InferenceServer
+from test.unittest_base import UnittestBase
+
+
+class TestInferenceServer(UnittestBase, unittest.TestCase):
+
+    min_timesteps = 3
+    require_observe = True
+
+    directory = 'test/test-inference-server'
+
+    def record_episodes(self, environment, num_episodes=3):
+        agent = Agent.load(directory=self.__class__.directory, format='pb-actonly')
+        episodes = list()
+        for _ in range(num_episodes):
+            states = environment.reset()
+            internals = agent.initial_internals()
+            episode = list()
+            terminal = False
+            while not terminal:
+                actions, internals = agent.act(states=states, internals=internals)
+                episode.append((states, actions))
+                states, terminal, _ = environment.execute(actions=actions)
+            episodes.append(episode)
+        agent.close()
+        environment.close()
+        return episodes
+
+    def assert_actions(self, episodes, results):
+        self.assertEqual(len(results), len(episodes))
+        for episode, result in zip(episodes, results):
+            self.assertEqual(len(result), len(episode))
+            for (_, actions), server_actions in zip(episode, result):
+                for name, action in actions.items():
+                    self.assertTrue(np.allclose(server_actions[name], action))
+
+    def test_inference_server(self):
+        self.start_tests(name='inference-server')
+
+        # Policy without internals
+        agent, environment = self.prepare(
+            policy=dict(network=dict(type='auto', size=8, depth=1, internal_rnn=False))
+        )
+        agent.save(directory=self.__class__.directory, format='tensorflow')
+        agent.close()
+
+        # Record episodes and reference actions of act-only agent
+        episodes = self.record_episodes(environment=environment)
+
+        path = os.path.join(self.__class__.directory, 'agent.sock')
+        server = InferenceServer(
+            directory=self.__class__.directory, path=path, max_batch_size=2, max_wait=0.01
+        )
+        server.start()
+
+        # Concurrent clients
+        results = [None for _ in episodes]
+
+        def run_client(n):
+            client = InferenceClient(path=path)
+            client.reset()
+            results[n] = [client.act(states=states) for states, _ in episodes[n]]
+            client.close()
+
+        threads = [Thread(target=run_client, args=(n,)) for n in range(len(episodes))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assert_actions(episodes=episodes, results=results)
+
+        client = InferenceClient(path=path)
+        statistics = client.statistics()
+        client.close()
+        self.assertEqual(statistics['requests'], sum(len(episode) for episode in episodes))
+        self.assertEqual(statistics['errors'], 0)
+        self.assertLessEqual(statistics['mean_batch_size'], 2.0)
+
+        # Requests still queued when stopping are answered with an error
+        entered = Event()
+        process_batch = server.process_batch
+
+        def blocking_process_batch(batch):
+            entered.set()
+            server.stopped.wait()
+            process_batch(batch=batch)
+
+        server.max_batch_size = 1
+        server.process_batch = blocking_process_batch
+        results = [None, None]
+
+        def run_blocked_client(n):
+            client = InferenceClient(path=path)
+            try:
+                results[n] = client.act(states=episodes[n][0][0])
+            except TensorforceError as exception:
+                results[n] = exception
+            client.connection.close()
+
+        threads = [Thread(target=run_blocked_client, args=(n,)) for n in range(2)]
+        # First request is processed once the server is stopped, second request remains queued
+        threads[0].start()
+        entered.wait()
+        threads[1].start()
+        while server.requests.qsize() == 0:
+            time.sleep(0.01)
+        connection_threads = list(server.connection_threads)
+        server.close()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsInstance(results[0], dict)
+        self.assertIsInstance(results[1], TensorforceError)
+        self.assertEqual(str(results[1]), 'Inference server stopped.')
+        self.assertTrue(all(not thread.is_alive() for thread in connection_threads))
+        self.assertFalse(os.path.exists(path))
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_recurrent(self):
+        self.start_tests(name='recurrent')
+
+        # Default policy with internal RNN
+        agent, environment = self.prepare()
+        agent.save(directory=self.__class__.directory, format='tensorflow')
+        agent.close()
+
+        episodes = self.record_episodes(environment=environment)
+
+        path = os.path.join(self.__class__.directory, 'agent.sock')
+        server = InferenceServer(
+            directory=self.__class__.directory, path=path, max_batch_size=3, max_wait=0.01
+        )
+        self.assertGreater(len(server.agent.internals_spec), 0)
+        server.start()
+
+        # Concurrent clients with server-side internals batched together, each client resets its
+        # internals and continues with the episode of the next client
+        results = [None for _ in episodes]
+        next_results = [None for _ in episodes]
+
+        def run_client(n):
+            client = InferenceClient(path=path)
+            client.reset()
+            results[n] = [client.act(states=states) for states, _ in episodes[n]]
+            client.reset()
+            next_episode = episodes[(n + 1) % len(episodes)]
+            next_results[n] = [client.act(states=states) for states, _ in next_episode]
+            client.close()
+
+        threads = [Thread(target=run_client, args=(n,)) for n in range(len(episodes))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assert_actions(episodes=episodes, results=results)
+        self.assert_actions(episodes=(episodes[1:] + episodes[:1]), results=next_results)
+
+        client = InferenceClient(path=path)
+        statistics = client.statistics()
+        client.close()
+        self.assertEqual(statistics['requests'], 2 * sum(len(episode) for episode in episodes))
+        self.assertEqual(statistics['errors'], 0)
+
+        server.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
@@ -0,0 +1,194 @@
+# Copyright 2018 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import importlib.util
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from test.unittest_base import UnittestBase
+
+
+class DeterministicAgent(object):
+    """
+    Deterministic independent act of an agent, with the interface of act-only agents.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.states_spec = agent.states_spec
+        self.actions_spec = agent.actions_spec
+
+    def initial_internals(self):
+        return self.agent.initial_internals()
+
+    def act(self, states, internals):
+        return self.agent.act(
+            states=states, internals=internals, independent=True, deterministic=True
+        )
+
+
+class TestNumpyRuntime(UnittestBase, unittest.TestCase):
+
+    min_timesteps = 3
+
+    directory = 'test/test-numpy-runtime'
+
+    def numpy_runtime(self):
+        # Runtime module copied next to the runtime file, loaded without Tensorforce
+        module = importlib.util.spec_from_file_location(
+            name='numpy_runtime',
+            location=os.path.join(self.__class__.directory, 'numpy_runtime.py')
+        )
+        numpy_runtime = importlib.util.module_from_spec(spec=module)
+        module.loader.exec_module(module=numpy_runtime)
+        return numpy_runtime
+
+    def remove_directory(self, directory):
+        for filename in os.listdir(path=directory):
+            os.remove(path=os.path.join(directory, filename))
+        os.rmdir(path=directory)
+
+    def parity(self, agent, environment):
+        path = agent.save(directory=self.__class__.directory, format='numpy-runtime')
+        self.assertEqual(path, os.path.join(self.__class__.directory, 'agent.runtime'))
+
+        runtime = self.numpy_runtime().NumpyActonlyAgent(path=path)
+
+        for _ in range(2):
+            states = environment.reset()
+            internals = agent.initial_internals()
+            runtime_internals = runtime.initial_internals()
+            self.assertEqual(list(runtime_internals), list(internals))
+            for name, internal in internals.items():
+                self.assertTrue(np.allclose(runtime_internals[name], internal))
+
+            terminal = False
+            while not terminal:
+                actions, internals = agent.act(
+                    states=states, internals=internals, independent=True, deterministic=True
+                )
+                runtime_actions, runtime_internals = runtime.act(
+                    states=states, internals=runtime_internals
+                )
+                for name, action in actions.items():
+                    self.assertEqual(runtime_actions[name].dtype, action.dtype)
+                    self.assertTrue(np.allclose(runtime_actions[name], action, atol=1e-5))
+                for name, internal in internals.items():
+                    self.assertTrue(np.allclose(runtime_internals[name], internal, atol=1e-5))
+                states, terminal, _ = environment.execute(actions=actions)
+
+        # Batched act
+        batch = [environment.reset() for _ in range(3)]
+        actions = agent.act(
+            states=batch, internals=[agent.initial_internals() for _ in batch],
+            parallel=list(range(len(batch))), independent=True, deterministic=True
+        )[0]
+        runtime_actions = runtime.act(
+            states=batch, internals=[runtime.initial_internals() for _ in batch],
+            parallel=list(range(len(batch)))
+        )[0]
+        for action, runtime_action in zip(actions, runtime_actions):
+            for name in action:
+                self.assertTrue(np.allclose(runtime_action[name], action[name], atol=1e-5))
+
+        runtime.close()
+        agent.close()
+        environment.close()
+
+        self.remove_directory(directory=self.__class__.directory)
+
+    def test_auto(self):
+        self.start_tests(name='auto')
+
+        # Embedding, dense, conv2d, flatten, pooling, internal_lstm, all distributions
+        agent, environment = self.prepare()
+        self.parity(agent=agent, environment=environment)
+
+        self.finished_test()
+
+    def test_layered(self):
+        self.start_tests(name='layered')
+
+        states = dict(type='float', shape=(6, 3))
+        network = [
+            dict(type='conv1d', size=4, window=3, stride=2, activation='tanh'),
+            dict(type='pool1d', reduction='average'),
+            dict(type='flatten'),
+            dict(type='dense', size=8, activation='leaky-relu'),
+            dict(type='internal_gru', size=8, length=2),
+            dict(type='linear', size=6)
+        ]
+        agent, environment = self.prepare(states=states, policy=dict(network=network))
+        self.parity(agent=agent, environment=environment)
+
+        self.finished_test()
+
+    def test_quantization(self):
+        self.start_tests(name='quantization')
+
+        traces = os.path.join(self.__class__.directory, 'traces')
+        agent, environment = self.prepare(recorder=dict(directory=traces), require_observe=True)
+        for _ in range(10):
+            states = environment.reset()
+            terminal = False
+            while not terminal:
+                actions = agent.act(states=states)
+                states, terminal, reward = environment.execute(actions=actions)
+                agent.observe(terminal=terminal, reward=reward)
+
+        path = agent.save(directory=self.__class__.directory, format='numpy-runtime')
+
+        numpy_runtime = self.numpy_runtime()
+        quantized_path = numpy_runtime.quantize_runtime(path=path)
+        self.assertEqual(
+            quantized_path, os.path.join(self.__class__.directory, 'agent-int8.runtime')
+        )
+
+        runtime = numpy_runtime.NumpyActonlyAgent(path=path)
+        quantized_runtime = numpy_runtime.NumpyActonlyAgent(path=quantized_path)
+        with np.load(quantized_path) as quantized:
+            num_quantized = 0
+            for name in quantized.files:
+                if name.endswith('-scale'):
+                    weights = quantized[name[:-6]]
+                    self.assertEqual(weights.dtype, np.int8)
+                    # Dequantization error at most half a quantization step
+                    error = quantized_runtime.weights[name[:-6]] - runtime.weights[name[:-6]]
+                    self.assertTrue((np.abs(error) <= quantized[name] / 2.0 + 1e-6).all())
+                    num_quantized += 1
+            self.assertGreater(num_quantized, 0)
+
+        # Float runtime agrees with the deterministic TensorFlow agent
+        reference = DeterministicAgent(agent=agent)
+        rates = numpy_runtime.agreement_rate(agent=runtime, reference=reference, directory=traces)
+        self.assertEqual(list(rates), list(runtime.actions_spec) + ['*'])
+        self.assertTrue(all(rate == 1.0 for rate in rates.values()), msg=rates)
+        rates = numpy_runtime.agreement_rate(
+            agent=quantized_runtime, reference=reference, directory=traces
+        )
+        # Quantization error may flip close decisions, like argmax of similar int action logits
+        self.assertGreaterEqual(rates['*'], 0.8, msg=rates)
+
+        runtime.close()
+        quantized_runtime.close()
+        agent.close()
+        environment.close()
+        shutil.rmtree(path=traces)
+        self.remove_directory(directory=self.__class__.directory)
+
+        self.finished_test()
@@ -13,8 +13,12 @@
 # limitations under the License.
 # ==============================================================================
 
+from collections import OrderedDict
 import unittest
 
+import numpy as np
+
+from tensorforce import Agent, TensorforceError
 from test.unittest_base import UnittestBase
 
 
@@ -28,6 +32,66 @@ class TestOptimizers(UnittestBase, unittest.TestCase):
         optimizer = dict(type='evolutionary', learning_rate=1e-3)
         self.unittest(optimizer=optimizer)
 
+        optimizer = dict(
+            type='evolutionary', learning_rate=1e-3, num_samples=2, antithetic=True,
+            unroll_loop=True
+        )
+        self.unittest(optimizer=optimizer)
+
+        # Falls back to assignments for internal RNN cell weights
+        optimizer = dict(type='evolutionary', learning_rate=1e-3, num_samples=2, batched=True)
+        self.unittest(optimizer=optimizer)
+
+        # Batched evaluation is limited, since each perturbation adds a copy of the loss graph
+        optimizer = dict(type='evolutionary', learning_rate=1e-3, num_samples=17, batched=True)
+        with self.assertRaises(TensorforceError):
+            self.prepare(optimizer=optimizer)
+
+        # Batched evaluation matches sequential evaluation for a fixed seed
+        policy = dict(network=dict(type='auto', size=8, depth=1, internal_rnn=False))
+        for antithetic in (False, True):
+            optimizer = dict(
+                type='evolutionary', learning_rate=1e-3, num_samples=3, antithetic=antithetic,
+                unroll_loop=True
+            )
+            agent, environment = self.prepare(
+                require_all=True, policy=policy, optimizer=optimizer, seed=0
+            )
+            optimizer['batched'] = True
+            batched_agent = Agent.create(agent=self.agent_spec(
+                require_all=True, policy=policy, optimizer=optimizer, seed=0
+            ), environment=environment)
+
+            batch = OrderedDict(states=list(), actions=list(), terminal=list(), reward=list())
+            for _ in range(2):
+                states = environment.reset()
+                terminal = False
+                while not terminal:
+                    actions = agent.act(states=states, independent=True)
+                    batch['states'].append(states)
+                    batch['actions'].append(actions)
+                    states, terminal, reward = environment.execute(actions=actions)
+                    batch['terminal'].append(terminal)
+                    batch['reward'].append(reward)
+            for name in ('states', 'actions'):
+                batch[name] = OrderedDict(
+                    (key, np.stack([x[key] for x in batch[name]])) for key in batch[name][0]
+                )
+
+            values = list()
+            for x in (agent, batched_agent):
+                x.experience(**batch)
+                x.update()
+                values.append(x.get_variables_values())
+            for name, value in values[0].items():
+                self.assertTrue(np.allclose(value, values[1][name]), msg=name)
+
+            batched_agent.close()
+            agent.close()
+            environment.close()
+
+        self.finished_test()
+
     def test_meta_optimizer_wrapper(self):
         self.start_tests(name='meta-optimizer-wrapper')
 
@@ -39,12 +103,51 @@ class TestOptimizers(UnittestBase, unittest.TestCase):
         # agent.close()
         # environment.close()
 
+    def test_minibatch_epochs(self):
+        self.start_tests(name='minibatch-epochs')
+
+        optimizer = dict(
+            type='minibatch_epochs', optimizer=dict(type='adam', learning_rate=1e-3),
+            num_epochs=3, minibatch_size=4
+        )
+        self.unittest(optimizer=optimizer)
+
+        optimizer = dict(
+            type='minibatch_epochs', optimizer=dict(type='adam', learning_rate=1e-3),
+            num_epochs=3, minibatch_size=4, early_stopping_kl=1e-3
+        )
+        self.unittest(optimizer=optimizer)
+
     def test_natural_gradient(self):
         self.start_tests(name='natural-gradient')
 
         optimizer = dict(type='natural_gradient', learning_rate=1e-3)
         self.unittest(optimizer=optimizer)
 
+        optimizer = dict(
+            type='natural_gradient', learning_rate=1e-3, subsampling_fraction=0.5,
+            cg_preconditioner_probes=2
+        )
+        self.unittest(optimizer=optimizer)
+
+    def test_optimizing_step(self):
+        self.start_tests(name='optimizing-step')
+
+        optimizer = dict(
+            type='optimizing_step', optimizer=dict(type='adam', learning_rate=1e-3),
+            ls_max_iterations=3
+        )
+        self.unittest(optimizer=optimizer)
+
+        optimizer = dict(
+            type='optimizing_step', optimizer=dict(type='adam', learning_rate=1e-3),
+            ls_max_iterations=3, ls_parallel=True
+        )
+        self.unittest(optimizer=optimizer)
+
+        policy = dict(network=dict(type='auto', size=8, depth=1, internal_rnn=False))
+        self.unittest(optimizer=optimizer, policy=policy)
+
     def test_plus(self):
         self.start_tests(name='plus')
 
@@ -69,6 +172,11 @@ class TestOptimizers(UnittestBase, unittest.TestCase):
         optimizer = dict(type='adam', learning_rate=1e-3)
         self.unittest(optimizer=optimizer)
 
+        optimizer = dict(
+            optimizer='adam', learning_rate=1e-3, accumulate_steps=3, clipping_threshold=1e-2
+        )
+        self.unittest(optimizer=optimizer)
+
         try:
             import tensorflow_addons as tfa
 
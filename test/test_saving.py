@@ -13,11 +13,16 @@
 # limitations under the License.
 # ==============================================================================
 
+from collections import OrderedDict
+import json
 import os
 import time
 import unittest
 
-from tensorforce import Agent, Environment
+import h5py
+import numpy as np
+
+from tensorforce import Agent, Environment, TensorforceError
 from test.unittest_base import UnittestBase
 
 
@@ -28,6 +33,11 @@ class TestSaving(UnittestBase, unittest.TestCase):
 
     directory = 'test/test-saving'
 
+    def restorable_policy(self):
+        # Internal RNN cell weights are not restored from TensorFlow checkpoints, so tests which
+        # compare an agent restored from such a checkpoint with the original use no internal RNN
+        return dict(network=dict(type='auto', size=8, depth=1, internal_rnn=False))
+
     def test_config(self):
         # FEATURES.MD
         self.start_tests(name='config')
@@ -241,6 +251,403 @@ class TestSaving(UnittestBase, unittest.TestCase):
 
         self.finished_test()
 
+    def test_pb_inference(self):
+        self.start_tests(name='pb-inference')
+
+        # TODO: currently Protobuf saving is not compatible with internal state RNNs
+        agent, environment = self.prepare(
+            policy=dict(
+                network=dict(type='auto', size=8, depth=1, internal_rnn=False), temperature=dict(
+                    type='decaying', decay='exponential', unit='timesteps', decay_steps=5,
+                    initial_value=1.0, decay_rate=0.5
+                )
+            )
+        )
+        agent.save(directory=self.__class__.directory)
+        path = agent.save(directory=self.__class__.directory, format='pb-inference')
+        self.assertEqual(path, os.path.join(self.__class__.directory, 'agent-inference.pb'))
+        agent.close()
+
+        # Record episodes and reference actions of act-only agent
+        agent = Agent.load(directory=self.__class__.directory, format='pb-actonly')
+        num_operations = len(agent.session.graph.get_operations())
+        episodes = list()
+        for _ in range(2):
+            states = environment.reset()
+            episode = list()
+            terminal = False
+            while not terminal:
+                actions = agent.act(states=states)
+                episode.append((states, actions))
+                states, terminal, _ = environment.execute(actions=actions)
+            episodes.append(episode)
+        agent.close()
+        environment.close()
+
+        agent = Agent.load(directory=self.__class__.directory, format='pb-inference')
+        operations = [operation.type for operation in agent.session.graph.get_operations()]
+        self.assertNotIn('Assert', operations)
+        self.assertLess(len(operations), num_operations)
+        for episode in episodes:
+            for states, actions in episode:
+                inference_actions = agent.act(states=states)
+                for name, action in actions.items():
+                    self.assertTrue(np.allclose(inference_actions[name], action, atol=1e-5))
+        agent.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_tflite(self):
+        self.start_tests(name='tflite')
+
+        agent, environment = self.prepare()
+        path = agent.save(directory=self.__class__.directory, format='tflite')
+        self.assertEqual(path, os.path.join(self.__class__.directory, 'agent.tflite'))
+
+        # Dynamic and fixed batch size
+        for kwargs in (dict(), dict(batch_size=4)):
+            tflite_agent = Agent.load(
+                directory=self.__class__.directory, format='tflite', **kwargs
+            )
+
+            states = environment.reset()
+            internals = agent.initial_internals()
+            tflite_internals = tflite_agent.initial_internals()
+            terminal = False
+            while not terminal:
+                actions, internals = agent.act(
+                    states=states, internals=internals, independent=True, deterministic=True
+                )
+                tflite_actions, tflite_internals = tflite_agent.act(
+                    states=states, internals=tflite_internals
+                )
+                for name, action in actions.items():
+                    self.assertTrue(np.allclose(tflite_actions[name], action, atol=1e-5))
+                for name, internal in internals.items():
+                    self.assertTrue(np.allclose(tflite_internals[name], internal, atol=1e-5))
+                states, terminal, _ = environment.execute(actions=actions)
+
+            # Batched act
+            batch = [environment.reset() for _ in range(3)]
+            actions = agent.act(
+                states=batch, internals=[agent.initial_internals() for _ in batch],
+                parallel=list(range(len(batch))), independent=True, deterministic=True
+            )[0]
+            tflite_actions = tflite_agent.act(
+                states=batch, internals=[tflite_agent.initial_internals() for _ in batch],
+                parallel=list(range(len(batch)))
+            )[0]
+            for action, tflite_action in zip(actions, tflite_actions):
+                for name in action:
+                    self.assertTrue(np.allclose(tflite_action[name], action[name], atol=1e-5))
+
+            tflite_agent.close()
+
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_inference_only(self):
+        self.start_tests(name='inference-only')
+
+        agent, environment = self.prepare(policy=self.restorable_policy())
+        agent.save(directory=self.__class__.directory, format='tensorflow')
+
+        inference_agent = Agent.load(
+            directory=self.__class__.directory, format='tensorflow', inference_only=True
+        )
+        self.assertIsNone(inference_agent.model.memory)
+        self.assertIsNone(inference_agent.model.optimizer)
+        self.assertLess(
+            len(inference_agent.model.get_variables()), len(agent.model.get_variables())
+        )
+
+        states = environment.reset()
+        internals = agent.initial_internals()
+        inference_internals = inference_agent.initial_internals()
+        terminal = False
+        while not terminal:
+            actions, internals = agent.act(
+                states=states, internals=internals, independent=True, deterministic=True
+            )
+            inference_actions, inference_internals = inference_agent.act(
+                states=states, internals=inference_internals, independent=True,
+                deterministic=True
+            )
+            for name, action in actions.items():
+                self.assertTrue(np.allclose(inference_actions[name], action))
+            states, terminal, _ = environment.execute(actions=actions)
+
+        with self.assertRaises(TensorforceError):
+            inference_agent.act(states=states)
+        with self.assertRaises(TensorforceError):
+            inference_agent.observe(terminal=False, reward=0.0)
+
+        inference_agent.close()
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_meta_graph(self):
+        self.start_tests(name='meta-graph')
+
+        agent, environment = self.prepare(policy=self.restorable_policy())
+        agent.save(directory=self.__class__.directory, format='tensorflow')
+
+        meta_agent = Agent.load(directory=self.__class__.directory, format='meta-graph')
+        self.assertEqual(meta_agent.get_variables(), agent.get_variables())
+        values = agent.get_variables_values()
+        meta_values = meta_agent.get_variables_values()
+        for name, value in values.items():
+            self.assertTrue(np.array_equal(meta_values[name], value))
+
+        states = environment.reset()
+        internals = agent.initial_internals()
+        meta_internals = meta_agent.initial_internals()
+        terminal = False
+        while not terminal:
+            actions, internals = agent.act(
+                states=states, internals=internals, independent=True, deterministic=True
+            )
+            meta_actions, meta_internals = meta_agent.act(
+                states=states, internals=meta_internals, independent=True, deterministic=True
+            )
+            for name, action in actions.items():
+                self.assertTrue(np.allclose(meta_actions[name], action))
+            states, terminal, _ = environment.execute(actions=actions)
+
+        # Rebound act/observe/update functions
+        states = environment.reset()
+        terminal = False
+        while not terminal:
+            actions = meta_agent.act(states=states)
+            states, terminal, reward = environment.execute(actions=actions)
+            meta_agent.observe(terminal=terminal, reward=reward)
+        self.assertEqual(meta_agent.episodes, agent.episodes + 1)
+
+        with self.assertRaises(TensorforceError):
+            meta_agent.save(directory=self.__class__.directory, format='delta')
+
+        meta_agent.close()
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_bulk_variables(self):
+        self.start_tests(name='bulk-variables')
+
+        agent, environment = self.prepare()
+
+        values = agent.get_variables_values()
+        self.assertEqual(len(values), len(agent.model.get_variables(only_saved=True)))
+        name = next(iter(values))
+        self.assertTrue(np.array_equal(values[name], agent.get_variable(variable=name)))
+        self.assertEqual(list(agent.get_variables_values(variables=[name])), [name])
+
+        agent.assign_variables(values=OrderedDict(
+            (name, np.ones_like(value)) for name, value in values.items()
+        ))
+        for value in agent.get_variables_values().values():
+            self.assertTrue((value == 1).all())
+        agent.assign_variables(values=values)
+
+        path = agent.save(directory=self.__class__.directory, format='hdf5', compression='gzip')
+        with h5py.File(name=path, mode='r') as filehandle:
+            for name, value in values.items():
+                if value.ndim > 0:
+                    self.assertEqual(filehandle[name].compression, 'gzip')
+                    self.assertIsNotNone(filehandle[name].chunks)
+        with self.assertRaises(TensorforceError):
+            agent.save(directory=self.__class__.directory, format='numpy', compression='gzip')
+
+        for format in ('hdf5', 'numpy'):
+            if format == 'numpy':
+                agent.save(directory=self.__class__.directory, format=format)
+            agent.assign_variables(values=OrderedDict(
+                (name, np.zeros_like(value)) for name, value in values.items()
+            ))
+            agent.restore(directory=self.__class__.directory, format=format)
+            for name, value in agent.get_variables_values().items():
+                self.assertTrue(np.array_equal(value, values[name]))
+
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_delta(self):
+        self.start_tests(name='delta')
+
+        saver = dict(
+            directory=self.__class__.directory, format='delta', frequency=None, **{'max-deltas': 2}
+        )
+        agent, environment = self.prepare(saver=saver)
+        manifest_path = os.path.join(self.__class__.directory, 'agent-delta.json')
+
+        def manifest():
+            with open(manifest_path, 'r') as filehandle:
+                return json.load(fp=filehandle)
+
+        # Initial base snapshot
+        self.assertEqual(manifest(), dict(base='agent-delta-0.delta', deltas=list()))
+
+        for n in range(4):
+            states = environment.reset()
+            terminal = False
+            while not terminal:
+                actions = agent.act(states=states)
+                states, terminal, reward = environment.execute(actions=actions)
+                agent.observe(terminal=terminal, reward=reward)
+            agent.save(format='delta')
+            self.assertEqual(len(manifest()['deltas']), [1, 2, 0, 1][n])
+
+        # Unchanged variables and memory buffers are not part of delta
+        path = agent.save(format='delta')
+        with np.load(file=path) as delta:
+            self.assertFalse(any(name.endswith(':rows') for name in delta.files))
+            self.assertFalse(any('/policy/' in name for name in delta.files))
+        self.assertEqual(
+            sorted(os.listdir(path=self.__class__.directory)),
+            ['agent-delta-3.delta', 'agent-delta-4.delta', 'agent-delta-5.delta',
+             'agent-delta.json', 'agent.json']
+        )
+
+        values = agent.get_variables_values()
+        agent.close()
+
+        agent = Agent.load(directory=self.__class__.directory, environment=environment)
+        for name, value in agent.get_variables_values().items():
+            if name.endswith('terminal-indices'):
+                num_episodes = values[name[:-len('terminal-indices')] + 'episode-count'] + 1
+                self.assertTrue(np.array_equal(value[:num_episodes], values[name][:num_episodes]))
+            else:
+                self.assertTrue(np.array_equal(value, values[name]))
+
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_memory(self):
+        self.start_tests(name='memory')
+
+        agent, environment = self.prepare(memory=100)
+        for _ in range(3):
+            states = environment.reset()
+            terminal = False
+            while not terminal:
+                actions = agent.act(states=states)
+                states, terminal, reward = environment.execute(actions=actions)
+                agent.observe(terminal=terminal, reward=reward)
+
+        agent.save_memory(directory=self.__class__.directory)
+        names = list(agent.model.memory_variables())
+        self.assertTrue(any(name.endswith('buffer-index') for name in names))
+        self.assertTrue(any(name.endswith('episode-count') for name in names))
+        self.assertTrue(any(name.startswith('estimator/') for name in names))
+        values = agent.get_variables_values(variables=names)
+        agent.close()
+
+        agent, _ = self.prepare(memory=100)
+        agent.load_memory(directory=self.__class__.directory)
+        for name, value in agent.get_variables_values(variables=names).items():
+            self.assertTrue(np.array_equal(value, values[name]))
+        agent.close()
+
+        agent, _ = self.prepare(memory=50)
+        with self.assertRaises(TensorforceError):
+            agent.load_memory(directory=self.__class__.directory)
+        agent.close()
+
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_non_blocking(self):
+        self.start_tests(name='non-blocking')
+
+        agent, environment = self.prepare()
+
+        for format in ('numpy', 'hdf5'):
+            paths = list()
+            for _ in range(3):
+                states = environment.reset()
+                terminal = False
+                while not terminal:
+                    actions = agent.act(states=states)
+                    states, terminal, reward = environment.execute(actions=actions)
+                    agent.observe(terminal=terminal, reward=reward)
+                paths.append(agent.save(
+                    directory=self.__class__.directory, format=format, append='episodes',
+                    blocking=False, max_pending=2
+                ))
+                self.assertLessEqual(len(agent.pending_saves()), 2)
+                for progress in agent.pending_saves().values():
+                    self.assertTrue(0.0 <= progress <= 1.0)
+            agent.wait_saves()
+            self.assertEqual(len(agent.pending_saves()), 0)
+
+            # Last checkpoint matches current variables
+            loaded_agent = Agent.load(
+                directory=self.__class__.directory,
+                filename=os.path.splitext(os.path.split(paths[-1])[1])[0],
+                format=format
+            )
+            for variable in agent.model.get_variables(only_saved=True):
+                name = variable.name[len(agent.model.name) + 1: -2]
+                self.assertTrue(np.allclose(
+                    loaded_agent.model.get_variable(variable=name),
+                    agent.model.get_variable(variable=name)
+                ))
+            loaded_agent.close()
+
+        self.assertFalse(any(
+            filename.endswith('.tmp') for filename in os.listdir(path=self.__class__.directory)
+        ))
+
+        with self.assertRaises(TensorforceError):
+            agent.save(directory=self.__class__.directory, format='tensorflow', blocking=False)
+
+        agent.close()
+        environment.close()
+
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
     def test_explicit(self):
         # FEATURES.MD
         self.start_tests(name='explicit')
@@ -13,10 +13,16 @@
 # limitations under the License.
 # ==============================================================================
 
+from collections import OrderedDict
 import os
+import shutil
+from threading import active_count, Thread
 import unittest
 
-from tensorforce import Agent
+import numpy as np
+
+from tensorforce import Agent, Environment, TensorforceError, util
+from tensorforce.traces import convert, load_archives, load_segment, read_index, TraceDataset
 from test.unittest_agent import UnittestAgent
 
 
@@ -47,12 +53,284 @@ class TestTensorforceAgent(UnittestAgent, unittest.TestCase):
 
         self.finished_test()
 
+    def test_experience_episodes(self):
+        self.start_tests(name='experience-episodes')
+
+        # Complete episodes fed in bulk, versus episodes fed in chunks
+        agent, environment = self.prepare(
+            require_all=True, memory=20, reward_estimation=dict(horizon=3, discount=0.9)
+        )
+        chunked_agent = Agent.create(agent=self.agent_spec(
+            require_all=True, memory=20, reward_estimation=dict(horizon=3, discount=0.9)
+        ), environment=environment)
+        chunked_agent.experience_episodes_size = None
+
+        batch = OrderedDict(states=list(), internals=list(), actions=list())
+        terminal_batch = list()
+        reward_batch = list()
+        for _ in range(9):
+            states = environment.reset()
+            internals = agent.initial_internals()
+            terminal = False
+            while not terminal:
+                actions, next_internals = agent.act(
+                    states=states, internals=internals, independent=True
+                )
+                batch['states'].append(states)
+                batch['internals'].append(internals)
+                batch['actions'].append(actions)
+                states, terminal, reward = environment.execute(actions=actions)
+                terminal_batch.append(terminal)
+                reward_batch.append(reward)
+                internals = next_internals
+        for name, values in batch.items():
+            batch[name] = OrderedDict(
+                (key, np.stack([x[key] for x in values])) for key in values[0]
+            )
+        batch['terminal'] = np.asarray(terminal_batch)
+        batch['reward'] = np.asarray(reward_batch)
+
+        # Streamed as batches, split mid-episode
+        def batches():
+            for start, end in ((0, 7), (7, len(terminal_batch))):
+                yield util.fmap(function=(lambda x: x[start: end]), xs=batch)
+
+        agent.experience(**batch)
+        agent.experience(batches=batches())
+        for _ in range(2):
+            chunked_agent.experience(**batch)
+
+        values = list()
+        for x in (agent, chunked_agent):
+            variables = OrderedDict(
+                (name, variable) for name, variable in x.model.memory_variables().items()
+                if name.startswith('memory/')
+            )
+            values.append(OrderedDict(zip(variables, x.model.monitored_session.run(
+                fetches=list(variables.values())
+            ))))
+        num_episodes = values[0]['memory/episode-count'] + 1
+        for value in values:
+            value['memory/terminal-indices'] = value['memory/terminal-indices'][:num_episodes]
+        for name, value in values[0].items():
+            self.assertTrue(np.allclose(value, values[1][name]), msg=name)
+
+        agent.update()
+
+        agent.close()
+        chunked_agent.close()
+        environment.close()
+
+        self.finished_test()
+
+    def test_act_values_batch(self):
+        self.start_tests(name='act-values-batch')
+
+        agent, environment = self.prepare(require_all=True, exclude_bounded_action=True)
+
+        batch = [environment.reset() for _ in range(7)]
+        actions = agent.act(
+            states=batch, internals=[agent.initial_internals() for _ in batch],
+            parallel=list(range(len(batch))), independent=True, deterministic=True
+        )[0]
+
+        # Memory-mapped states
+        os.makedirs(self.__class__.directory, exist_ok=True)
+        states = OrderedDict()
+        for name in batch[0]:
+            value = np.stack([x[name] for x in batch])
+            states[name] = np.lib.format.open_memmap(
+                filename=os.path.join(self.__class__.directory, name + '.npy'), mode='w+',
+                dtype=value.dtype, shape=value.shape
+            )
+            states[name][:] = value
+
+        batch_actions = agent.act_batch(states=states, chunk_size=3)
+        for name in actions[0]:
+            self.assertEqual(batch_actions[name].shape[0], len(batch))
+            for n in range(len(batch)):
+                self.assertTrue(np.allclose(batch_actions[name][n], actions[n][name]))
+
+        states_values = agent.values_batch(states=states, chunk_size=3)
+        actions_values = agent.values_batch(states=states, actions=batch_actions, chunk_size=4)
+        for name in actions[0]:
+            self.assertEqual(states_values[name].shape[0], len(batch))
+            self.assertEqual(actions_values[name].shape[0], len(batch))
+
+        # Preallocated output arrays
+        values = OrderedDict((name, np.zeros_like(x)) for name, x in states_values.items())
+        agent.values_batch(states=states, chunk_size=5, values=values)
+        for name in values:
+            self.assertTrue(np.allclose(values[name], states_values[name]))
+
+        # Prefetch thread is stopped if a chunk fails
+        num_threads = active_count()
+
+        def failing_function(**kwargs):
+            raise TensorforceError(message='Failed chunk.')
+
+        with self.assertRaises(TensorforceError):
+            agent.chunked_call(
+                name='agent.act_batch', function=failing_function, states=states, internals=None,
+                chunk_size=1, outputs=OrderedDict()
+            )
+        self.assertEqual(active_count(), num_threads)
+        with self.assertRaisesRegex(TensorforceError, 'agent.values_batch'):
+            agent.values_batch(states=states, chunk_size=0)
+
+        agent.close()
+        environment.close()
+        del states
+        for filename in os.listdir(path=self.__class__.directory):
+            os.remove(path=os.path.join(self.__class__.directory, filename))
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_act_cache(self):
+        self.start_tests(name='act-cache')
+
+        environment = Environment.create(environment=self.environment_spec())
+        agent = self.agent_spec(require_all=True, update=dict(unit='episodes', batch_size=1))
+        agent['config'] = dict(act_cache_size=4)
+        agent = Agent.create(agent=agent, environment=environment)
+
+        states = environment.reset()
+        internals = agent.initial_internals()
+        actions, next_internals = agent.act(states=states, internals=internals, evaluation=True)
+        self.assertEqual((agent.act_cache_hits, agent.act_cache_misses), (0, 1))
+        cached_actions, cached_internals = agent.act(
+            states=states, internals=internals, evaluation=True
+        )
+        self.assertEqual((agent.act_cache_hits, agent.act_cache_misses), (1, 1))
+        for name, action in actions.items():
+            self.assertTrue((cached_actions[name] == action).all())
+        for name, internal in next_internals.items():
+            self.assertTrue((cached_internals[name] == internal).all())
+
+        # Batched act with repeated states, and bounded size
+        batch = [states] + [environment.reset() for _ in range(5)] + [states]
+        agent.act(
+            states=batch, internals=[internals for _ in batch], parallel=list(range(len(batch))),
+            evaluation=True
+        )
+        self.assertEqual((agent.act_cache_hits, agent.act_cache_misses), (3, 6))
+        self.assertEqual(len(agent.act_cache), 4)
+
+        # Invalidated by assign_variable
+        variable = agent.get_variables()[0]
+        agent.assign_variable(variable=variable, value=agent.get_variable(variable=variable))
+        self.assertEqual(len(agent.act_cache), 0)
+
+        # Invalidated by update
+        agent.act(states=batch[-2], internals=internals, evaluation=True)
+        self.assertEqual(len(agent.act_cache), 1)
+        for terminal in (False, False, False, True):
+            agent.experience(
+                states=states, internals=internals, actions=actions, terminal=terminal, reward=1.0
+            )
+        agent.update()
+        agent.act(states=batch[-2], internals=internals, evaluation=True)
+        self.assertEqual((agent.act_cache_hits, agent.act_cache_misses), (3, 8))
+        self.assertEqual(len(agent.act_cache), 1)
+
+        agent.close()
+        environment.close()
+
+        self.finished_test()
+
+    def test_concurrent_act(self):
+        self.start_tests(name='concurrent-act')
+
+        agent, environment = self.prepare(
+            require_observe=True, parallel_interactions=2,
+            update=dict(unit='episodes', batch_size=2)
+        )
+        environment.close()
+
+        exceptions = list()
+
+        def thread_loop():
+            try:
+                environment = Environment.create(environment=self.environment_spec())
+                for _ in range(2):
+                    parallel = agent.lease_parallel(timeout=60.0)
+                    states = environment.reset()
+                    terminal = False
+                    while not terminal:
+                        actions = agent.act(states=states, parallel=parallel)
+                        states, terminal, reward = environment.execute(actions=actions)
+                        agent.observe(terminal=terminal, reward=reward, parallel=parallel)
+                    agent.release_parallel(parallel=parallel)
+                environment.close()
+            except BaseException as exc:
+                exceptions.append(exc)
+
+        threads = [Thread(target=thread_loop) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(exceptions, list())
+        self.assertEqual(agent.episodes, 6)
+        self.assertEqual(sorted(agent.parallel_pool.queue), [0, 1])
+
+        agent.close()
+
+        self.finished_test()
+
+    def test_internals_slots(self):
+        self.start_tests(name='internals-slots')
+
+        environments = [
+            Environment.create(environment=self.environment_spec(min_timesteps=4)) for _ in range(2)
+        ]
+        agent = self.agent_spec(require_all=True)
+        agent['config'] = dict(internals_slots=2)
+        agent = Agent.create(agent=agent, environment=environments[0])
+        self.assertGreater(len(agent.model.internals_spec), 0)
+
+        # Two interleaved episodes in slots, compared to internals passed explicitly
+        states = [environment.reset() for environment in environments]
+        internals = [agent.initial_internals() for _ in range(2)]
+        for timestep in range(3):
+            for n in range(2):
+                actions, internals[n] = agent.act(
+                    states=states[n], internals=internals[n], evaluation=True
+                )
+                slot_actions = agent.act(
+                    states=states[n], evaluation=True, slot=n, reset=(timestep == 0)
+                )
+                for name, action in actions.items():
+                    self.assertTrue(np.allclose(slot_actions[name], action, atol=1e-5))
+                slot_internals = agent.slot_internals(slot=n)
+                for name, internal in internals[n].items():
+                    self.assertTrue(np.allclose(slot_internals[name], internal, atol=1e-5))
+                states[n], _, _ = environments[n].execute(actions=actions)
+
+        # Batched slot act with reset of one slot
+        batch_actions = agent.act(
+            states=states, parallel=[0, 1], evaluation=True, slot=[0, 1], reset=[False, True]
+        )
+        actions, _ = agent.act(
+            states=states[1], internals=agent.initial_internals(), evaluation=True
+        )
+        for name, action in actions.items():
+            self.assertTrue(np.allclose(batch_actions[1][name], action, atol=1e-5))
+        self.assertEqual(len(agent.slot_internals(slot=[0, 1])), 2)
+
+        agent.close()
+        for environment in environments:
+            environment.close()
+
+        self.finished_test()
+
     def test_pretrain(self):
         # FEATURES.MD
         self.start_tests(name='pretrain')
 
         agent, environment = self.prepare(
-            require_all=True, recorder=dict(directory=self.__class__.directory)
+            require_all=True, recorder=dict(directory=self.__class__.directory, **{'max-traces': 2})
         )
 
         for _ in range(3):
@@ -65,6 +343,39 @@ class TestTensorforceAgent(UnittestAgent, unittest.TestCase):
 
         agent.close()
 
+        # Retained segments tracked by index, values memory-mappable
+        index = read_index(directory=self.__class__.directory)
+        self.assertEqual([segment['name'] for segment in index['segments']], [
+            'segment-000001', 'segment-000002'
+        ])
+        for segment in index['segments']:
+            trace = load_segment(
+                path=os.path.join(self.__class__.directory, segment['name']),
+                spec=index['spec'], mmap_mode='r'
+            )
+            self.assertEqual(trace['terminal'].shape, (segment['timesteps'],))
+            self.assertEqual(np.count_nonzero(trace['terminal']), segment['episodes'])
+        self.assertEqual(
+            sorted(os.listdir(path=self.__class__.directory)),
+            ['segment-000001', 'segment-000002', 'traces.json']
+        )
+
+        # Episodes indexed across segments, sampled without replacement
+        dataset = TraceDataset(directory=self.__class__.directory)
+        self.assertEqual(dataset.num_episodes, 2)
+        self.assertEqual(
+            dataset.num_timesteps, sum(segment['timesteps'] for segment in index['segments'])
+        )
+        batch = dataset.sample(num_episodes=1)
+        self.assertEqual(np.count_nonzero(batch['terminal']), 1)
+        self.assertGreater(batch['terminal'][-1], 0)
+        self.assertEqual(len(list(dataset.prefetch(num_batches=3, num_episodes=2))), 3)
+        num_threads = active_count()
+        batches = dataset.prefetch(num_batches=5, num_episodes=1)
+        next(batches)
+        batches.close()  # prefetch thread stopped if consumer stops early
+        self.assertEqual(active_count(), num_threads)
+
         # recorder currently does not include internal states
         agent = Agent.create(agent=self.agent_spec(
             require_all=True,
@@ -78,9 +389,56 @@ class TestTensorforceAgent(UnittestAgent, unittest.TestCase):
         agent.close()
         environment.close()
 
-        for filename in os.listdir(path=self.__class__.directory):
-            os.remove(path=os.path.join(self.__class__.directory, filename))
-            assert filename.startswith('trace-')
-        os.rmdir(path=self.__class__.directory)
+        shutil.rmtree(path=self.__class__.directory)
+
+        self.finished_test()
+
+    def test_convert_traces(self):
+        self.start_tests(name='convert-traces')
+
+        # Compressed trace archives of previous recorder versions
+        states = dict(type='float', shape=(3,))
+        actions = dict(type='int', shape=(), num_values=2)
+        source = os.path.join(self.__class__.directory, 'archives')
+        os.makedirs(source)
+        for n in range(3):
+            np.savez_compressed(
+                os.path.join(source, 'trace-{}-20200101-000000.npz'.format(2 * (n + 1))),
+                state=np.random.random_sample(size=(5, 3)),
+                action=np.random.randint(2, size=(5,)),
+                action_mask=np.ones(shape=(5, 2), dtype=np.bool_),
+                terminal=np.asarray([0, 0, 1, 0, 1]), reward=np.random.random_sample(size=(5,))
+            )
+
+        directory = os.path.join(self.__class__.directory, 'traces')
+        num_episodes = convert(
+            source=source, directory=directory, states_spec=states, actions_spec=actions,
+            num_workers=2
+        )
+        self.assertEqual(num_episodes, 6)
+        index = read_index(directory=directory)
+        self.assertEqual([segment['name'] for segment in index['segments']], [
+            'segment-000000', 'segment-000001', 'segment-000002'
+        ])
+        dataset = TraceDataset(directory=directory)
+        self.assertEqual((dataset.num_episodes, dataset.num_timesteps), (6, 15))
+        self.assertEqual(dataset.segments[0]['state'].dtype, np.float32)
+
+        paths = [os.path.join(source, filename) for filename in sorted(os.listdir(source))]
+        for values in load_archives(
+            paths=paths, states_spec=states, actions_spec=actions, num_workers=2
+        ):
+            self.assertEqual(list(values), list(index['spec']))
+
+        # Validated against states and actions specification
+        invalid_directory = os.path.join(self.__class__.directory, 'invalid')
+        with self.assertRaises(TensorforceError):
+            convert(
+                source=source, directory=invalid_directory,
+                states_spec=dict(type='float', shape=(4,)), actions_spec=actions
+            )
+        self.assertEqual(os.listdir(path=invalid_directory), [])
+
+        shutil.rmtree(path=self.__class__.directory)
 
         self.finished_test()
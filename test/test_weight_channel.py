@@ -0,0 +1,115 @@
+# Copyright 2018 Tensorforce Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+import unittest
+
+import numpy as np
+
+from tensorforce import Agent
+from tensorforce.execution import WeightPublisher, WeightSubscriber
+from test.unittest_base import UnittestBase
+
+
+class TestWeightChannel(UnittestBase, unittest.TestCase):
+
+    require_all = True
+
+    directory = 'test/test-weight-channel'
+
+    def check_synced(self, agent, subscribed_agent):
+        values = agent.get_variables_values()
+        subscribed_values = subscribed_agent.get_variables_values()
+        for name, value in values.items():
+            self.assertTrue(np.allclose(subscribed_values[name], value), msg=name)
+
+    def update(self, agent, environment):
+        states = environment.reset()
+        terminal = False
+        while not terminal:
+            actions = agent.act(states=states)
+            states, terminal, reward = environment.execute(actions=actions)
+            agent.observe(terminal=terminal, reward=reward)
+        agent.update()
+
+    def test_shared_memory(self):
+        self.start_tests(name='shared-memory')
+
+        agent, environment = self.prepare(update=dict(unit='episodes', batch_size=1))
+        subscribed_agent = Agent.create(
+            agent=self.agent_spec(update=dict(unit='episodes', batch_size=1)),
+            environment=environment
+        )
+
+        publisher = WeightPublisher(agent=agent)
+        subscriber = WeightSubscriber(agent=subscribed_agent, name=publisher.name)
+        self.assertFalse(subscriber.poll())
+
+        self.assertEqual(publisher.publish(), 1)
+        self.assertTrue(subscriber.poll())
+        self.assertEqual(subscriber.version, 1)
+        self.check_synced(agent=agent, subscribed_agent=subscribed_agent)
+
+        # Stale versions skipped
+        self.update(agent=agent, environment=environment)
+        publisher.publish()
+        publisher.publish()
+        self.assertTrue(subscriber.poll())
+        self.assertEqual(subscriber.version, 3)
+        self.assertFalse(subscriber.poll())
+        self.check_synced(agent=agent, subscribed_agent=subscribed_agent)
+
+        subscriber.close()
+        publisher.close()
+        subscribed_agent.close()
+        agent.close()
+        environment.close()
+
+        self.finished_test()
+
+    def test_socket(self):
+        self.start_tests(name='socket')
+
+        agent, environment = self.prepare(update=dict(unit='episodes', batch_size=1))
+        subscribed_agent = Agent.create(
+            agent=self.agent_spec(update=dict(unit='episodes', batch_size=1)),
+            environment=environment
+        )
+
+        os.makedirs(self.__class__.directory, exist_ok=True)
+        path = os.path.join(self.__class__.directory, 'weights.sock')
+        publisher = WeightPublisher(agent=agent, path=path)
+        subscriber = WeightSubscriber(agent=subscribed_agent, path=path)
+        self.assertFalse(subscriber.poll())
+
+        publisher.publish()
+        self.assertTrue(subscriber.poll(timeout=10.0))
+        self.assertEqual(subscriber.version, 1)
+        self.check_synced(agent=agent, subscribed_agent=subscribed_agent)
+
+        self.update(agent=agent, environment=environment)
+        publisher.publish()
+        self.assertTrue(subscriber.poll(timeout=10.0))
+        self.assertEqual(subscriber.version, 2)
+        self.check_synced(agent=agent, subscribed_agent=subscribed_agent)
+
+        subscriber.close()
+        publisher.close()
+        subscribed_agent.close()
+        agent.close()
+        environment.close()
+        os.rmdir(path=self.__class__.directory)
+
+        self.finished_test()